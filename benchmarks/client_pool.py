@@ -0,0 +1,57 @@
+"""Compare boto3 client construction with and without the client pool.
+
+Usage: python -m benchmarks.client_pool [--rounds N]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from boto3 import Session
+
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.client_pool import ClientPool
+
+CONFIG_OPTIONS = {"region_name": "us-east-1"}
+
+
+def unpooled_client(session: Session) -> Callable[[], None]:
+    """What AWSApi.client did before pooling: a new client of its session on every access."""
+
+    def _run() -> None:
+        session.client("elasticache", region_name=CONFIG_OPTIONS["region_name"])
+
+    return _run
+
+
+def pooled_client(client_pool: ClientPool) -> Callable[[], None]:
+    aws_api = AWSApi(config_options=CONFIG_OPTIONS, client_pool=client_pool)
+
+    def _run() -> None:
+        _ = aws_api.client
+
+    return _run
+
+
+def measure(func: Callable[[], None], rounds: int) -> float:
+    """Return the mean duration of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    before = measure(unpooled_client(Session()), args.rounds)
+    after = measure(pooled_client(ClientPool()), args.rounds)
+    print(f"unpooled: {before:10.3f} ms/client")  # noqa: T201
+    print(f"pooled:   {after:10.3f} ms/client")  # noqa: T201
+    print(f"speedup:  {before / after:10.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
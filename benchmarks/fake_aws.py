@@ -0,0 +1,446 @@
+"""In-process stand-in for the ElastiCache and EC2 endpoints used by hooks_lib.aws_api.
+
+FakeAWS answers botocore requests from in-memory state. It hooks into botocore's
+before-send event, so request serialization, response parsing, pagination,
+error handling and retries all run the real client code; only the HTTP round
+trip is replaced. Latency and throttling errors can be injected per call.
+
+    fake = FakeAWS(FaultConfig(latency=0.05, throttle_rate=0.1))
+    fake.subnet_groups["default"] = [...]
+    aws_api = AWSApi({"region_name": "us-east-1"}, client_pool=fake.client_pool())
+"""
+
+import itertools
+import operator
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import cache
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs
+from xml.sax.saxutils import escape
+
+from boto3 import Session
+from botocore.awsrequest import AWSPreparedRequest, AWSResponse
+from botocore.compat import HTTPHeaders
+from botocore.session import get_session
+
+from hooks_lib.client_pool import ClientPool
+
+if TYPE_CHECKING:
+    from botocore.model import ServiceModel, Shape
+
+ACCOUNT_ID = "123456789012"
+REGION = "us-east-1"
+THROTTLING_ERRORS = {"elasticache": "Throttling", "ec2": "RequestLimitExceeded"}
+
+
+@dataclass(frozen=True)
+class FaultConfig:
+    """Injected faults.
+
+    Attributes:
+        latency: Seconds every call takes.
+        jitter: Random extra latency, up to this many seconds.
+        throttle_rate: Fraction of calls rejected with a throttling error.
+        page_size: Default page size of paginated ElastiCache operations.
+        seed: Seed of the random generator for jitter and throttling.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    throttle_rate: float = 0.0
+    page_size: int = 100
+    seed: int | None = None
+
+
+class FakeAWSError(Exception):
+    """An API error response"""
+
+    def __init__(self, code: str, message: str, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+
+
+class _RawResponse:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def stream(self, **_: object) -> Iterable[bytes]:
+        yield self._body
+
+
+def _xml(shape: "Shape", value: Any, protocol: str) -> str:  # noqa: ANN401
+    """Serialize value as the children of an element of the given shape."""
+    match shape.type_name:
+        case "structure":
+            return "".join(
+                f"<{tag}>{_xml(member, value[name], protocol)}</{tag}>"
+                for name, member in shape.members.items()  # type: ignore[attr-defined]
+                if value.get(name) is not None
+                and (tag := member.serialization.get("name", name))
+            )
+        case "list":
+            member = shape.member  # type: ignore[attr-defined]
+            tag = member.serialization.get(
+                "name", "item" if protocol == "ec2" else "member"
+            )
+            return "".join(f"<{tag}>{_xml(member, v, protocol)}</{tag}>" for v in value)
+        case "timestamp":
+            return (
+                value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+                if isinstance(value, datetime)
+                else str(value)
+            )
+        case "boolean":
+            return "true" if value else "false"
+        case _:
+            return escape(str(value))
+
+
+@cache
+def _service_model(service: str) -> "ServiceModel":
+    return get_session().get_service_model(service)
+
+
+def _list(params: Mapping[str, str], name: str) -> list[str]:
+    """Collect a serialized list parameter (Name.member.N or Name.N)"""
+    items: list[str] = []
+    for i in itertools.count(1):
+        if (
+            value := params.get(f"{name}.member.{i}", params.get(f"{name}.{i}"))
+        ) is None:
+            return items
+        items.append(value)
+    return items
+
+
+def _page(
+    items: Sequence[dict[str, Any]], params: Mapping[str, str], page_size: int
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Marker/MaxRecords pagination"""
+    start = int(params.get("Marker", 0))
+    size = int(params.get("MaxRecords", page_size))
+    marker = str(start + size) if start + size < len(items) else None
+    return list(items[start : start + size]), marker
+
+
+class FakeAWS:
+    """In-memory ElastiCache and EC2 endpoints.
+
+    State is plain dicts in the shape of the API responses and may be changed at
+    any time; all calls are counted in `calls` and throttled calls in `throttled`.
+    """
+
+    def __init__(self, faults: FaultConfig | None = None) -> None:
+        self.faults = faults or FaultConfig()
+        self._rng = random.Random(self.faults.seed)  # noqa: S311 - fault injection only
+        self._lock = threading.Lock()
+        self.calls: Counter[str] = Counter()
+        self.throttled: Counter[str] = Counter()
+
+        # elasticache
+        self.replication_groups: list[dict[str, Any]] = []
+        self.cache_parameter_groups: list[dict[str, Any]] = []
+        self.cache_engine_versions: list[dict[str, Any]] = []
+        # parameter group family -> Parameters
+        self.engine_default_parameters: dict[str, list[dict[str, Any]]] = {}
+        self.cache_subnet_groups: dict[str, dict[str, Any]] = {}
+        self.update_actions: list[dict[str, Any]] = []
+        self.events: list[dict[str, Any]] = []
+        # ec2
+        self.subnets: list[dict[str, Any]] = []
+        self.security_groups: list[dict[str, Any]] = []
+
+        self._operations: dict[str, Callable[[Mapping[str, str]], dict[str, Any]]] = {
+            "DescribeUpdateActions": self._describe_update_actions,
+            "BatchApplyUpdateAction": self._batch_apply_update_action,
+            "DescribeCacheSubnetGroups": self._describe_cache_subnet_groups,
+            "DescribeReplicationGroups": self._describe_replication_groups,
+            "DescribeCacheParameterGroups": self._describe_cache_parameter_groups,
+            "DescribeCacheEngineVersions": self._describe_cache_engine_versions,
+            "DescribeEngineDefaultParameters": self._describe_engine_default_parameters,
+            "DescribeEvents": self._describe_events,
+            "DescribeSubnets": self._describe_subnets,
+            "DescribeSecurityGroups": self._describe_security_groups,
+        }
+
+    #
+    # wiring
+    #
+    def session(self) -> Session:
+        """A boto3 session with static credentials answered by this fake"""
+        session = Session(
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",  # noqa: S106
+            aws_account_id=ACCOUNT_ID,
+            region_name=REGION,
+        )
+        # a before-send handler returning a response short-circuits the HTTP request
+        session.events.register("before-send", self._handle)  # type: ignore[arg-type]
+        return session
+
+    def client_pool(self) -> ClientPool:
+        """A client pool for AWSApi(client_pool=...)"""
+        return ClientPool(session=self.session())
+
+    def _handle(
+        self,
+        request: AWSPreparedRequest,
+        event_name: str,
+        **_: object,
+    ) -> AWSResponse:
+        service, operation = event_name.split(".")[1:]
+        body = request.body or b""
+        params = {
+            k: v[0]
+            for k, v in parse_qs(
+                body.decode() if isinstance(body, bytes) else str(body)
+            ).items()
+        }
+
+        with self._lock:
+            self.calls[operation] += 1
+            throttled = self._rng.random() < self.faults.throttle_rate
+            delay = self.faults.latency + self._rng.random() * self.faults.jitter
+        if delay:
+            time.sleep(delay)
+
+        model = _service_model(service)
+        if throttled:
+            with self._lock:
+                self.throttled[operation] += 1
+            error = FakeAWSError(
+                THROTTLING_ERRORS[service],
+                "Rate exceeded",
+                status_code=503 if service == "ec2" else 400,
+            )
+            return self._response(request, error.status_code, self._error(model, error))
+        try:
+            with self._lock:
+                result = self._operations[operation](params)
+        except FakeAWSError as e:
+            return self._response(request, e.status_code, self._error(model, e))
+
+        output_shape = model.operation_model(operation).output_shape
+        assert output_shape  # mypy
+        output = _xml(output_shape, result, model.protocol)
+        namespace = model.metadata.get("xmlNamespace", "")
+        if model.protocol == "ec2":
+            xml = (
+                f'<{operation}Response xmlns="{namespace}">'
+                f"<requestId>fake</requestId>{output}</{operation}Response>"
+            )
+        else:
+            wrapper = output_shape.serialization["resultWrapper"]
+            xml = (
+                f'<{operation}Response xmlns="{namespace}">'
+                f"<{wrapper}>{output}</{wrapper}>"
+                "<ResponseMetadata><RequestId>fake</RequestId></ResponseMetadata>"
+                f"</{operation}Response>"
+            )
+        return self._response(request, 200, xml)
+
+    @staticmethod
+    def _error(model: "ServiceModel", error: FakeAWSError) -> str:
+        if model.protocol == "ec2":
+            return (
+                f"<Response><Errors><Error><Code>{error.code}</Code>"
+                f"<Message>{escape(error.message)}</Message></Error></Errors>"
+                "<RequestID>fake</RequestID></Response>"
+            )
+        return (
+            f"<ErrorResponse><Error><Type>Sender</Type><Code>{error.code}</Code>"
+            f"<Message>{escape(error.message)}</Message></Error>"
+            "<RequestId>fake</RequestId></ErrorResponse>"
+        )
+
+    @staticmethod
+    def _response(
+        request: AWSPreparedRequest, status_code: int, xml: str
+    ) -> AWSResponse:
+        headers = HTTPHeaders()
+        headers["Content-Type"] = "text/xml"
+        return AWSResponse(
+            request.url, status_code, headers, _RawResponse(xml.encode())
+        )
+
+    #
+    # elasticache
+    #
+    def _describe_update_actions(self, params: Mapping[str, str]) -> dict[str, Any]:
+        replication_group_ids = set(_list(params, "ReplicationGroupIds"))
+        service_update_status = set(_list(params, "ServiceUpdateStatus"))
+        update_action_status = set(_list(params, "UpdateActionStatus"))
+        actions = [
+            a
+            for a in self.update_actions
+            if (
+                not replication_group_ids
+                or a.get("ReplicationGroupId") in replication_group_ids
+            )
+            and (
+                not service_update_status
+                or a.get("ServiceUpdateStatus", "available") in service_update_status
+            )
+            and (
+                not update_action_status
+                or a.get("UpdateActionStatus") in update_action_status
+            )
+        ]
+        page, marker = _page(actions, params, self.faults.page_size)
+        return {"UpdateActions": page, "Marker": marker}
+
+    def _batch_apply_update_action(self, params: Mapping[str, str]) -> dict[str, Any]:
+        name = params["ServiceUpdateName"]
+        processed, unprocessed = [], []
+        for replication_group_id in _list(params, "ReplicationGroupIds"):
+            actions = [
+                a
+                for a in self.update_actions
+                if a.get("ReplicationGroupId") == replication_group_id
+                and a.get("ServiceUpdateName") == name
+            ]
+            if not actions:
+                unprocessed.append({
+                    "ReplicationGroupId": replication_group_id,
+                    "ServiceUpdateName": name,
+                    "ErrorType": "ServiceUpdateNotFoundFault",
+                    "ErrorMessage": f"Service update {name} not found",
+                })
+                continue
+            for action in actions:
+                action["UpdateActionStatus"] = "in-progress"
+            processed.append({
+                "ReplicationGroupId": replication_group_id,
+                "ServiceUpdateName": name,
+                "UpdateActionStatus": "in-progress",
+            })
+        return {
+            "ProcessedUpdateActions": processed,
+            "UnprocessedUpdateActions": unprocessed,
+        }
+
+    def _describe_cache_subnet_groups(
+        self, params: Mapping[str, str]
+    ) -> dict[str, Any]:
+        if name := params.get("CacheSubnetGroupName"):
+            if name not in self.cache_subnet_groups:
+                raise FakeAWSError(
+                    "CacheSubnetGroupNotFoundFault",
+                    f"Cache subnet group {name} not found",
+                )
+            groups = [self.cache_subnet_groups[name]]
+        else:
+            groups = list(self.cache_subnet_groups.values())
+        page, marker = _page(groups, params, self.faults.page_size)
+        return {"CacheSubnetGroups": page, "Marker": marker}
+
+    def _describe_replication_groups(self, params: Mapping[str, str]) -> dict[str, Any]:
+        groups = self.replication_groups
+        if replication_group_id := params.get("ReplicationGroupId"):
+            groups = [
+                g for g in groups if g["ReplicationGroupId"] == replication_group_id
+            ]
+            if not groups:
+                raise FakeAWSError(
+                    "ReplicationGroupNotFoundFault",
+                    f"ReplicationGroup {replication_group_id} not found.",
+                    status_code=404,
+                )
+        page, marker = _page(groups, params, self.faults.page_size)
+        return {"ReplicationGroups": page, "Marker": marker}
+
+    def _describe_cache_parameter_groups(
+        self, params: Mapping[str, str]
+    ) -> dict[str, Any]:
+        groups = self.cache_parameter_groups
+        if name := params.get("CacheParameterGroupName"):
+            groups = [g for g in groups if g["CacheParameterGroupName"] == name]
+            if not groups:
+                raise FakeAWSError(
+                    "CacheParameterGroupNotFound",
+                    f"CacheParameterGroup {name} not found.",
+                    status_code=404,
+                )
+        page, marker = _page(groups, params, self.faults.page_size)
+        return {"CacheParameterGroups": page, "Marker": marker}
+
+    def _describe_cache_engine_versions(
+        self, params: Mapping[str, str]
+    ) -> dict[str, Any]:
+        versions = [
+            v
+            for v in self.cache_engine_versions
+            if params.get("Engine", v["Engine"]) == v["Engine"]
+            and params.get("EngineVersion", v["EngineVersion"]) == v["EngineVersion"]
+        ]
+        page, marker = _page(versions, params, self.faults.page_size)
+        return {"CacheEngineVersions": page, "Marker": marker}
+
+    def _describe_engine_default_parameters(
+        self, params: Mapping[str, str]
+    ) -> dict[str, Any]:
+        family = params["CacheParameterGroupFamily"]
+        page, marker = _page(
+            self.engine_default_parameters.get(family, []),
+            params,
+            self.faults.page_size,
+        )
+        return {
+            "EngineDefaults": {
+                "CacheParameterGroupFamily": family,
+                "Parameters": page,
+                "Marker": marker,
+            }
+        }
+
+    def _describe_events(self, params: Mapping[str, str]) -> dict[str, Any]:
+        start_time = datetime.fromisoformat(params["StartTime"])
+        events = sorted(
+            (
+                e
+                for e in self.events
+                if e["SourceIdentifier"] == params.get("SourceIdentifier")
+                and e["Date"] >= start_time
+            ),
+            key=operator.itemgetter("Date"),
+            reverse=True,
+        )
+        page, marker = _page(events, params, self.faults.page_size)
+        return {"Events": page, "Marker": marker}
+
+    #
+    # ec2
+    #
+    def _describe_subnets(self, params: Mapping[str, str]) -> dict[str, Any]:
+        subnet_ids = _list(params, "SubnetId")
+        subnets = {s["SubnetId"]: s for s in self.subnets}
+        if missing := [s for s in subnet_ids if s not in subnets]:
+            raise FakeAWSError(
+                "InvalidSubnetID.NotFound",
+                f"The subnet ID '{missing[0]}' does not exist",
+            )
+        return {
+            "Subnets": [subnets[s] for s in subnet_ids] if subnet_ids else self.subnets
+        }
+
+    def _describe_security_groups(self, params: Mapping[str, str]) -> dict[str, Any]:
+        group_ids = _list(params, "GroupId")
+        groups = {g["GroupId"]: g for g in self.security_groups}
+        if missing := [g for g in group_ids if g not in groups]:
+            raise FakeAWSError(
+                "InvalidGroup.NotFound",
+                f"The security group '{missing[0]}' does not exist",
+            )
+        return {
+            "SecurityGroups": [groups[g] for g in group_ids]
+            if group_ids
+            else self.security_groups
+        }
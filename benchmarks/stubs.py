@@ -0,0 +1,102 @@
+"""Canned AWS responses for the benchmarks."""
+
+from collections.abc import Iterator, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, cast
+
+from hooks_lib.aws_api import AWSApi
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2.type_defs import SecurityGroupTypeDef
+    from mypy_boto3_ec2.type_defs import SubnetTypeDef as EC2SubnetTypeDef
+    from mypy_boto3_elasticache.literals import UpdateActionStatusType
+    from mypy_boto3_elasticache.type_defs import (
+        SubnetTypeDef as ElasticacheSubnetTypeDef,
+    )
+    from mypy_boto3_elasticache.type_defs import UpdateActionTypeDef
+else:
+    SecurityGroupTypeDef = EC2SubnetTypeDef = UpdateActionStatusType = (
+        ElasticacheSubnetTypeDef
+    ) = UpdateActionTypeDef = object
+
+SEVERITIES = ("critical", "important", "medium", "low")
+TYPES = ("security-update", "engine-update")
+STATUSES = ("not-applied", "scheduled", "complete")
+
+
+def update_actions(count: int) -> list[UpdateActionTypeDef]:
+    """Synthetic describe_update_actions items, one release per hour"""
+    start = datetime(2020, 1, 1, tzinfo=UTC)
+    return [
+        cast(
+            "UpdateActionTypeDef",
+            {
+                "ServiceUpdateName": f"elasticache-update-{i}",
+                "ServiceUpdateReleaseDate": start + timedelta(hours=i),
+                "ServiceUpdateSeverity": SEVERITIES[i % len(SEVERITIES)],
+                "ServiceUpdateType": TYPES[i % len(TYPES)],
+                "UpdateActionStatus": STATUSES[i % len(STATUSES)],
+            },
+        )
+        for i in range(count)
+    ]
+
+
+class StubAWSApi(AWSApi):
+    """AWSApi answering from canned data, without botocore"""
+
+    def __init__(
+        self,
+        replication_group_ids: Sequence[str] = (),
+        parameter_group_names: Sequence[str] = (),
+        actions: Sequence[UpdateActionTypeDef] = (),
+    ) -> None:
+        super().__init__(config_options={"region_name": "us-east-1"})
+        self.replication_group_ids = replication_group_ids
+        self.parameter_group_names = parameter_group_names
+        self.actions = actions
+        self.vpc_id = "vpc-1"
+        self.availability_zones = ("us-east-1a", "us-east-1b")
+
+    @property
+    def account_key(self) -> str:
+        """A fixed account, there are no credentials to resolve"""
+        return "123456789012"
+
+    def get_cache_group_subnets(
+        self,
+        cache_subnet_group_name: str,  # noqa: ARG002
+    ) -> list[ElasticacheSubnetTypeDef]:
+        """One subnet per availability zone"""
+        return [
+            {"SubnetIdentifier": f"subnet-{az}", "SubnetAvailabilityZone": {"Name": az}}
+            for az in self.availability_zones
+        ]
+
+    def get_subnets(self, subnets: Sequence[str]) -> list[EC2SubnetTypeDef]:
+        """All subnets are in one VPC"""
+        return [{"SubnetId": s, "VpcId": self.vpc_id} for s in subnets]
+
+    def get_security_groups(
+        self, security_groups: Sequence[str]
+    ) -> list[SecurityGroupTypeDef]:
+        """All security groups are in the subnet VPC"""
+        return [{"GroupId": s, "VpcId": self.vpc_id} for s in security_groups]
+
+    def iter_replication_group_ids(self) -> Iterator[str]:
+        """The canned replication groups"""
+        yield from self.replication_group_ids
+
+    def iter_cache_parameter_group_names(self) -> Iterator[str]:
+        """The canned parameter groups"""
+        yield from self.parameter_group_names
+
+    def iter_update_actions(
+        self,
+        replication_group_ids: Sequence[str],  # noqa: ARG002
+        status: Sequence[UpdateActionStatusType] | None = None,
+    ) -> Iterator[UpdateActionTypeDef]:
+        """The canned update actions, filtered by status like the API does"""
+        for action in self.actions:
+            if not status or action["UpdateActionStatus"] in status:
+                yield action
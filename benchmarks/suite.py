@@ -0,0 +1,332 @@
+"""Benchmark input parsing, plan validation and service update selection.
+
+Usage: python -m benchmarks.suite [--rounds N] [--filter TEXT] [--threshold 0.5]
+                                  [--baseline FILE] [--update-baseline] [--output FILE]
+
+The results are compared to the baseline (benchmarks/baseline.json); the run fails
+if a benchmark is slower than its baseline by more than the threshold. Baselines
+are machine specific, refresh them with --update-baseline on the machine that runs
+the comparison.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from external_resources_io.input import parse_model
+from external_resources_io.terraform import ResourceChange
+
+from benchmarks.fake_aws import FakeAWS
+from benchmarks.stubs import StubAWSApi, update_actions
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from er_aws_elasticache.engine_catalog import EngineCatalog, EngineVersion
+from hooks.post_plan import ElasticachePlanValidator
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.existence_index import ExistenceIndex
+from hooks_lib.plan_index import PlanIndex
+from hooks_lib.service_updates import ServiceUpdatesManager
+from hooks_lib.topology_cache import TopologyCache
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+SCHEMA_VERSION = 1
+# shared CI runners are noisy, smaller regressions are not reliably detectable
+DEFAULT_THRESHOLD = 0.5
+PLAN_SIZES = (10, 100, 1_000, 10_000)
+UPDATE_ACTION_COUNTS = (1_000, 10_000, 100_000)
+# through botocore and the in-process AWS stand-in, 100 update actions per page
+FAKE_AWS_UPDATE_ACTION_COUNTS = (100, 1_000)
+
+
+def sample_input() -> dict[str, Any]:
+    """A valid app-interface input"""
+    return {
+        "data": {
+            "replication_group_id": "benchmark-01",
+            "replication_group_description": "benchmark",
+            "node_type": "cache.t4g.micro",
+            "automatic_failover_enabled": True,
+            "auto_minor_version_upgrade": False,
+            "engine": "redis",
+            "engine_version": "6.2",
+            "at_rest_encryption_enabled": True,
+            "transit_encryption_enabled": True,
+            "security_group_ids": ["sg-1"],
+            "subnet_group_name": "default",
+            "number_cache_clusters": 2,
+            "identifier": "benchmark-01",
+            "parameter_group": {
+                "family": "redis6.x",
+                "description": "benchmark",
+                "parameters": [{"name": "tcp-keepalive", "value": 300}],
+                "name": "benchmark-01-pg",
+            },
+            "parameter_group_name": "benchmark-01-pg",
+            "output_prefix": "benchmark-01",
+            "region": "us-east-1",
+            "tags": {"app": "benchmark"},
+        },
+        "provision": {
+            "provision_provider": "aws",
+            "provisioner": "benchmark",
+            "provider": "elasticache",
+            "identifier": "benchmark-01",
+            "target_cluster": "cluster",
+            "target_namespace": "namespace",
+            "target_secret_name": "benchmark-01",
+            "module_provision_data": {
+                "tf_state_bucket": "bucket",
+                "tf_state_region": "us-east-1",
+                "tf_state_dynamodb_table": "table",
+                "tf_state_key": "key",
+            },
+        },
+    }
+
+
+def plan_changes(count: int) -> list[ResourceChange]:
+    """Synthetic plan: every 10th change creates a replication group, every 10th a parameter group"""
+    changes = []
+    for i in range(count):
+        match i % 10:
+            case 0:
+                resource_type = "aws_elasticache_replication_group"
+                actions = ["create"]
+                after = {
+                    "replication_group_id": f"rg-{i}",
+                    "subnet_group_name": "default",
+                    "security_group_ids": ["sg-1"],
+                    "preferred_cache_cluster_azs": ["us-east-1a"],
+                    "engine": "redis",
+                    "engine_version": "6.2",
+                }
+            case 1:
+                resource_type = "aws_elasticache_parameter_group"
+                actions = ["create"]
+                after = {"family": "redis6.x"}
+            case _:
+                resource_type = "random_password"
+                actions = ["no-op"]
+                after = {}
+        changes.append(
+            ResourceChange.model_validate({
+                "address": f"{resource_type}.r{i}",
+                "type": resource_type,
+                "name": f"r{i}",
+                "change": {
+                    "actions": actions,
+                    "before": None,
+                    "after": after,
+                    "after_unknown": None,
+                },
+            })
+        )
+    return changes
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A benchmark: setup() returns the function to measure, called number times per round"""
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int = 1
+
+
+def _parse_model() -> Callable[[], object]:
+    data = sample_input()
+    return lambda: parse_model(AppInterfaceInput, data)
+
+
+def _validate_plan(size: int) -> Callable[[], object]:
+    changes = plan_changes(size)
+    app_interface_input = parse_model(AppInterfaceInput, sample_input())
+    aws_api = StubAWSApi(
+        replication_group_ids=[f"existing-{i}" for i in range(1000)],
+        parameter_group_names=[f"existing-pg-{i}" for i in range(1000)],
+    )
+    engine_catalog = EngineCatalog(
+        engine_versions=[
+            EngineVersion(engine="redis", version="6.2", family="redis6.x")
+        ],
+        generated_at=datetime.now(tz=UTC),
+    )
+    # in memory only: every run looks up the topology like a fresh process
+    topology_cache = TopologyCache()
+    topology_cache.directory = None
+
+    def _run() -> object:
+        topology_cache.reset()
+        validator = ElasticachePlanValidator(
+            PlanIndex(changes),
+            app_interface_input,
+            aws_api=aws_api,
+            existence_index=ExistenceIndex(aws_api),
+            engine_catalog=engine_catalog,
+            topology_cache=topology_cache,
+        )
+        assert validator.validate(), validator.errors
+        return validator
+
+    return _run
+
+
+def _service_updates(count: int, limit: int | None) -> Callable[[], object]:
+    manager = ServiceUpdatesManager(
+        "rg-1", "us-east-1", aws_api=StubAWSApi(actions=update_actions(count))
+    )
+    released_before = datetime(2100, 1, 1, tzinfo=UTC)
+    return lambda: manager.service_updates(
+        service_updates_types=["security-update", "engine-update"],
+        severities=["critical", "important"],
+        released_before=released_before,
+        limit=limit,
+    )
+
+
+def _fake_aws_service_updates(count: int) -> Callable[[], object]:
+    fake = FakeAWS()
+    fake.update_actions = [
+        {**action, "ReplicationGroupId": "rg-1", "ServiceUpdateStatus": "available"}
+        for action in update_actions(count)
+    ]
+    manager = ServiceUpdatesManager(
+        "rg-1",
+        "us-east-1",
+        aws_api=AWSApi(
+            {"region_name": "us-east-1"},
+            client_pool=fake.client_pool(),
+            rate_limiter=None,
+            # every run goes through botocore instead of the cached pages
+            response_cache=None,
+        ),
+    )
+    released_before = datetime(2100, 1, 1, tzinfo=UTC)
+    return lambda: manager.service_updates(
+        service_updates_types=["security-update", "engine-update"],
+        severities=["critical", "important"],
+        released_before=released_before,
+        limit=1,
+    )
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    """All benchmarks"""
+    yield Benchmark("parse_model", _parse_model, number=100)
+    for size in PLAN_SIZES:
+        yield Benchmark(
+            f"validate_plan[{size}]",
+            partial(_validate_plan, size),
+            number=max(1, 1000 // size),
+        )
+    for count in UPDATE_ACTION_COUNTS:
+        for limit in (1, None):
+            yield Benchmark(
+                f"service_updates[{count},limit={limit}]",
+                partial(_service_updates, count, limit),
+            )
+    for count in FAKE_AWS_UPDATE_ACTION_COUNTS:
+        yield Benchmark(
+            f"fake_aws_service_updates[{count}]",
+            partial(_fake_aws_service_updates, count),
+        )
+
+
+def measure(benchmark: Benchmark, rounds: int) -> float:
+    """Duration of one call in milliseconds, best of rounds (least disturbed by noise)"""
+    func = benchmark.setup()
+    func()  # warm up
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(benchmark.number):
+            func()
+        timings.append((time.perf_counter() - start) / benchmark.number * 1000)
+    return min(timings)
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    """Read a baseline file; a missing file is an empty baseline"""
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data["schema_version"] != SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark baseline schema version {data['schema_version']}"
+        )
+    return data["results_ms"]
+
+
+def dump_results(path: Path, results: Mapping[str, float]) -> None:
+    """Write results in the baseline format"""
+    path.write_text(
+        json.dumps(
+            {
+                "schema_version": SCHEMA_VERSION,
+                "python": sys.version.split()[0],
+                "results_ms": {name: round(ms, 4) for name, ms in results.items()},
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def regressions(
+    results: Mapping[str, float], baseline: Mapping[str, float], threshold: float
+) -> list[str]:
+    """Names of the benchmarks slower than their baseline by more than threshold"""
+    return [
+        name
+        for name, ms in results.items()
+        if name in baseline and ms > baseline[name] * (1 + threshold)
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--filter", default="", help="only run matching benchmarks")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    results: dict[str, float] = {}
+    for benchmark in benchmarks():
+        if args.filter not in benchmark.name:
+            continue
+        results[benchmark.name] = ms = measure(benchmark, args.rounds)
+        reference = (
+            f"{ms / baseline[benchmark.name]:6.2f}x baseline"
+            if baseline.get(benchmark.name)
+            else "new"
+        )
+        print(f"{benchmark.name:40} {ms:12.4f} ms  {reference}")  # noqa: T201
+
+    if args.output:
+        dump_results(args.output, results)
+    if args.update_baseline:
+        dump_results(args.baseline, {**baseline, **results})
+        return
+    if failed := regressions(results, baseline, args.threshold):
+        print(  # noqa: T201
+            f"Regressions beyond {args.threshold:.0%} of the baseline: {', '.join(failed)}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # the validator logs every check
+    logging.disable(logging.INFO)
+    main()
@@ -1,10 +1,10 @@
 from collections.abc import Sequence
-from typing import Any, Self
+from typing import Any, Literal, Self
 
 from external_resources_io.input import AppInterfaceProvision
 from pydantic import BaseModel, field_validator, model_validator
 
-MAX_REPLICATION_GROUP_ID_LENGTH = 40
+from .rules import ELASTICACHE_RULES, RuleViolationsError
 
 
 class ElasticacheLogDeliveryConfiguration(BaseModel):
@@ -65,6 +65,11 @@ class ElasticacheData(BaseModel):
     ]
     service_updates_severities: Sequence[str] = ["critical", "important"]
     service_updates_cooldown_days: int | None = None
+    # apply all eligible service updates in one run instead of only the most recent
+    service_updates_apply_all: bool = False
+    # wait in post_apply until the update completed; otherwise start it, write a
+    # checkpoint and let the next run report the outcome
+    service_updates_wait_for_completion: bool = True
 
     # aws_elasticache_replication_group
     apply_immediately: bool = False
@@ -84,6 +89,9 @@ class ElasticacheData(BaseModel):
     num_node_groups: int | None = None
     parameter_group: ParameterGroup | None = None
     parameter_group_name: str | None = None
+    # parameter changes that only take effect after a node reboot are
+    # allowed silently, logged as a warning or fail post_plan
+    parameter_group_reboot_policy: Literal["allow", "warn", "block"] = "warn"
     port: int | None = None
     availability_zones: Sequence[str] = []
     replicas_per_node_group: int | None = None
@@ -96,91 +104,10 @@ class ElasticacheData(BaseModel):
     transit_encryption_mode: str | None = None
 
     @model_validator(mode="after")
-    def automatic_failover(self) -> Self:
-        """If enabled, number_cache_clusters must be greater than 1. Must be enabled for Redis (cluster mode enabled) replication groups."""
-        if (
-            self.automatic_failover_enabled
-            and self.number_cache_clusters is not None
-            and self.number_cache_clusters < 2  # noqa: PLR2004
-        ):
-            raise ValueError(
-                "Automatic failover is not supported for clusters with less than 2 nodes. Set number_cache_clusters to 2 or more."
-            )
-        return self
-
-    @model_validator(mode="after")
-    def no_auto_minor_version_upgrade_for_redis_five(self) -> Self:
-        """Auto minor version upgrade is not supported for Redis 5.x"""
-        if (
-            self.engine == "redis"
-            and self.engine_version.startswith("5.")
-            and self.auto_minor_version_upgrade
-        ):
-            raise ValueError(
-                "Auto minor version upgrade is not supported for Redis 5.x"
-            )
-        return self
-
-    @model_validator(mode="after")
-    def no_redis_seven(self) -> Self:
-        """We don't support Redis 7+"""
-        if self.engine == "redis" and self.engine_version.startswith("7."):
-            raise ValueError(
-                "Redis 7.x is not supported. Please use the Valkey engine instead."
-            )
-        return self
-
-    @model_validator(mode="after")
-    def multi_az_needs_automatic_failover(self) -> Self:
-        """Multi-AZ is only supported with automatic failover enabled"""
-        if self.multi_az_enabled and not self.automatic_failover_enabled:
-            raise ValueError(
-                "Multi-AZ is only supported with automatic failover enabled. Either enable 'automatic_failover_enabled' or disable 'multi_az_enabled'"
-            )
-        return self
-
-    @model_validator(mode="after")
-    def number_cache_clusters_vs_num_node_groups(self) -> Self:
-        """If num_node_groups is set, number_cache_clusters must be unset"""
-        if self.num_node_groups and self.number_cache_clusters:
-            raise ValueError(
-                "number_cache_clusters and cluster_mode.num_node_groups are mutually exclusive."
-            )
-        return self
-
-    @model_validator(mode="after")
-    def no_availability_zones_for_num_node_groups(self) -> Self:
-        """Preferred cache cluster AZs are not supported when num_node_groups is set"""
-        if self.num_node_groups and self.availability_zones:
-            raise ValueError(
-                "availability_zones and cluster_mode.num_node_groups are mutually exclusive. Use the subnet_group_name to control the availability zones."
-            )
-        return self
-
-    @model_validator(mode="after")
-    def no_snapshot_retention_limit_for_cache_t1_micro(self) -> Self:
-        """Snapshot retention limit is not supported for cache.t1.micro"""
-        if self.node_type == "cache.t1.micro" and self.snapshot_retention_limit:
-            raise ValueError(
-                "Snapshot retention limit is not supported for cache.t1.micro"
-            )
-        return self
-
-    @model_validator(mode="after")
-    def no_older_versions_for_valkey(self) -> Self:
-        """Check for Valkey engine version."""
-        if self.engine == "valkey" and self.engine_version.startswith(("5.", "6.")):
-            raise ValueError("Valkey requires an engine_version 7.2 or higher")
-        return self
-
-    @model_validator(mode="after")
-    def check_parameter_group_family(self) -> Self:
-        """Check if the parameter group family matches the engine"""
-        family = f"{self.engine}{self.engine_version[0]}"
-        if self.parameter_group and family not in self.parameter_group.family:
-            raise ValueError(
-                f"Parameter group family must match the engine. Expected {family}, got {self.parameter_group.family}"
-            )
+    def check_rules(self) -> Self:
+        """Evaluate all ELASTICACHE_RULES in one pass and report every violation at once"""
+        if violations := ELASTICACHE_RULES.evaluate(self):
+            raise RuleViolationsError(violations)
         return self
 
     @model_validator(mode="after")
@@ -190,16 +117,6 @@ class ElasticacheData(BaseModel):
             self.parameter_group_name = self.parameter_group.name
         return self
 
-    @model_validator(mode="after")
-    def check_replication_group_id_length(self) -> Self:
-        """Check if the replication group ID is within the allowed length"""
-        if len(self.replication_group_id) > MAX_REPLICATION_GROUP_ID_LENGTH:
-            raise ValueError(
-                f"Replication group ID must be {MAX_REPLICATION_GROUP_ID_LENGTH} characters or less. "
-                f"Current length: {len(self.replication_group_id)}"
-            )
-        return self
-
 
 class AppInterfaceInput(BaseModel):
     """Input model for AWS Elasticache"""
@@ -0,0 +1,110 @@
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from functools import cache
+from pathlib import Path
+from typing import Self
+
+CATALOG_FILE = Path(__file__).parent / "data" / "engine_versions.json"
+SCHEMA_VERSION = 1
+DEFAULT_TTL = timedelta(days=90)
+
+
+@dataclass(frozen=True)
+class EngineVersion:
+    """An ElastiCache engine version and its parameter group family"""
+
+    engine: str
+    version: str
+    family: str
+
+
+class EngineCatalog:
+    """Offline catalog of ElastiCache engine versions (describe_cache_engine_versions).
+
+    Lookups by (engine, version) are answered from an in-memory index. The catalog
+    ships with the image (CATALOG_FILE) and is refreshed on demand with
+    `python -m hooks_lib.engine_catalog`; it is considered expired after its TTL.
+    """
+
+    def __init__(
+        self,
+        engine_versions: Iterable[EngineVersion],
+        generated_at: datetime,
+        ttl: timedelta = DEFAULT_TTL,
+    ) -> None:
+        self.engine_versions = sorted(
+            set(engine_versions), key=lambda e: (e.engine, e.version)
+        )
+        self.generated_at = generated_at
+        self.ttl = ttl
+        self._index: dict[tuple[str, str], EngineVersion] = {
+            (e.engine, e.version): e for e in self.engine_versions
+        }
+        # "6.x" style versions (latest minor version) if all minor versions share a family
+        majors: dict[tuple[str, str], set[EngineVersion]] = {}
+        for e in self.engine_versions:
+            majors.setdefault((e.engine, e.version.split(".")[0]), set()).add(e)
+        for (engine, major), versions in majors.items():
+            if len(family := {v.family for v in versions}) == 1:
+                self._index.setdefault(
+                    (engine, f"{major}.x"),
+                    EngineVersion(
+                        engine=engine, version=f"{major}.x", family=family.pop()
+                    ),
+                )
+
+    def lookup(self, engine: str, version: str) -> EngineVersion | None:
+        """Return the catalog entry for an engine version"""
+        return self._index.get((engine, version))
+
+    def families(self, engine: str) -> set[str]:
+        """All parameter group families of an engine"""
+        return {e.family for e in self.engine_versions if e.engine == engine}
+
+    @property
+    def expired(self) -> bool:
+        """Whether the catalog is older than its TTL"""
+        return datetime.now(tz=UTC) - self.generated_at > self.ttl
+
+    @classmethod
+    def load(cls, path: Path = CATALOG_FILE, ttl: timedelta = DEFAULT_TTL) -> Self:
+        """Load a catalog file"""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data["schema_version"] != SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported engine catalog schema version {data['schema_version']}"
+            )
+        return cls(
+            engine_versions=(EngineVersion(**e) for e in data["engine_versions"]),
+            generated_at=datetime.fromisoformat(data["generated_at"]),
+            ttl=ttl,
+        )
+
+    def dump(self, path: Path = CATALOG_FILE) -> None:
+        """Write the catalog file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "schema_version": SCHEMA_VERSION,
+                    "generated_at": self.generated_at.isoformat(),
+                    "engine_versions": [asdict(e) for e in self.engine_versions],
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+
+@cache
+def default_engine_catalog() -> EngineCatalog | None:
+    """The engine catalog shipped with the module, if there is one.
+
+    The image build generates it (`make engine-catalog`, needs AWS credentials).
+    """
+    if not CATALOG_FILE.is_file():
+        return None
+    return EngineCatalog.load(CATALOG_FILE)
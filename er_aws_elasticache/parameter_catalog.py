@@ -0,0 +1,202 @@
+import json
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from functools import cache
+from pathlib import Path
+from typing import Self
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+CATALOG_DIR = Path(__file__).parent / "data" / "parameters"
+SCHEMA_VERSION = 1
+DEFAULT_TTL = timedelta(days=90)
+
+
+class ParameterCatalogSettings(BaseSettings):
+    """Environment Variables."""
+
+    # catalogs post_plan fetched from AWS; the shipped ones are in CATALOG_DIR
+    parameter_catalog_dir: Path = Field(
+        Path("tmp/parameter-catalogs"), alias="PARAMETER_CATALOG_DIR"
+    )
+
+
+# AllowedValues of numeric parameters are values and ranges, e.g. "0,20-" or "1-10000"
+_RANGE = re.compile(r"^(-?\d+(?:\.\d+)?)(?:(-)(-?\d+(?:\.\d+)?)?)?$")
+
+
+def _in_range(number: float, allowed: str) -> bool:
+    """Whether number is a value ("5") or in a range ("1-10", "20-") of AllowedValues"""
+    if not (match := _RANGE.match(allowed.strip())):
+        return False
+    low, dash, high = match.groups()
+    if not dash:
+        return number == float(low)
+    return float(low) <= number and (high is None or number <= float(high))
+
+
+@dataclass(frozen=True)
+class ParameterSpec:
+    """A parameter of a parameter group family (describe_engine_default_parameters)"""
+
+    name: str
+    data_type: str = "string"
+    allowed_values: str | None = None
+    is_modifiable: bool = True
+    change_type: str | None = None
+    minimum_engine_version: str | None = None
+
+    def check(self, value: str) -> str | None:
+        """Return why value is not valid for the parameter, or None"""
+        if not self.is_modifiable:
+            return f"Parameter {self.name} is not modifiable"
+        try:
+            number = self._number(value)
+        except ValueError:
+            return (
+                f"Parameter {self.name} must be of type {self.data_type}, got {value!r}"
+            )
+
+        return self._check_allowed_values(value, number)
+
+    def _check_allowed_values(self, value: str, number: float | None) -> str | None:
+        if not self.allowed_values:
+            return None
+        allowed = self.allowed_values.split(",")
+        if number is None:
+            if value not in allowed:
+                return f"Parameter {self.name} must be one of {self.allowed_values}, got {value!r}"
+            return None
+        if not any(_in_range(number, a) for a in allowed):
+            return (
+                f"Parameter {self.name} must be in {self.allowed_values}, got {value!r}"
+            )
+        return None
+
+    def _number(self, value: str) -> float | None:
+        """The value of a numeric parameter; raises ValueError if it is not a number"""
+        if self.data_type == "integer":
+            return int(value)
+        if self.data_type in {"float", "double"}:
+            return float(value)
+        return None
+
+
+class ParameterCatalog:
+    """Offline catalog of the parameters of a parameter group family.
+
+    Lookups by name are answered from an in-memory index. One catalog file per
+    family ships with the image (CATALOG_DIR) and is created or refreshed with
+    `python -m hooks_lib.parameter_catalog`; it is considered expired after its TTL.
+    """
+
+    def __init__(
+        self,
+        family: str,
+        parameters: Iterable[ParameterSpec],
+        generated_at: datetime,
+        ttl: timedelta = DEFAULT_TTL,
+    ) -> None:
+        self.family = family
+        self.parameters = sorted(set(parameters), key=lambda p: p.name)
+        self.generated_at = generated_at
+        self.ttl = ttl
+        self._index = {p.name: p for p in self.parameters}
+
+    def lookup(self, name: str) -> ParameterSpec | None:
+        """Return the catalog entry for a parameter"""
+        return self._index.get(name)
+
+    def check(self, parameters: Iterable[tuple[str, str]]) -> list[str]:
+        """Return why (name, value) pairs are not valid for the family"""
+        errors = []
+        for name, value in parameters:
+            if (spec := self.lookup(name)) is None:
+                errors.append(
+                    f"Parameter {name} does not exist in parameter group family {self.family}"
+                )
+            elif error := spec.check(value):
+                errors.append(error)
+        return errors
+
+    @property
+    def expired(self) -> bool:
+        """Whether the catalog is older than its TTL"""
+        return datetime.now(tz=UTC) - self.generated_at > self.ttl
+
+    @staticmethod
+    def path(family: str, directory: Path = CATALOG_DIR) -> Path:
+        """The catalog file of a family"""
+        return directory / f"{family}.json"
+
+    @classmethod
+    def load(cls, path: Path, ttl: timedelta = DEFAULT_TTL) -> Self:
+        """Load a catalog file"""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data["schema_version"] != SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported parameter catalog schema version {data['schema_version']}"
+            )
+        return cls(
+            family=data["family"],
+            parameters=(ParameterSpec(**p) for p in data["parameters"]),
+            generated_at=datetime.fromisoformat(data["generated_at"]),
+            ttl=ttl,
+        )
+
+    @classmethod
+    def load_current(cls, path: Path) -> Self | None:
+        """Load a catalog file unless it is missing, unreadable or expired"""
+        try:
+            catalog = cls.load(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return None if catalog.expired else catalog
+
+    def dump(self, directory: Path = CATALOG_DIR) -> Path:
+        """Write the catalog file of the family and return its path.
+
+        The file is replaced atomically, concurrent readers never see a partial one.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(self.family, directory)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "schema_version": SCHEMA_VERSION,
+                    "family": self.family,
+                    "generated_at": self.generated_at.isoformat(),
+                    "parameters": [asdict(p) for p in self.parameters],
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+        return path
+
+
+@cache
+def default_parameter_catalog(family: str) -> ParameterCatalog | None:
+    """The current parameter catalog of a family, if there is one.
+
+    The newer one of the catalog shipped with the module and the one post_plan
+    saved in PARAMETER_CATALOG_DIR.
+    """
+    directories = (CATALOG_DIR, ParameterCatalogSettings().parameter_catalog_dir)
+    catalogs = [
+        catalog
+        for directory in directories
+        if (
+            catalog := ParameterCatalog.load_current(
+                ParameterCatalog.path(family, directory)
+            )
+        )
+    ]
+    return max(catalogs, key=lambda c: c.generated_at, default=None)
@@ -0,0 +1,207 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .engine_catalog import EngineVersion, default_engine_catalog
+from .parameter_catalog import default_parameter_catalog
+
+if TYPE_CHECKING:
+    from .app_interface_input import ElasticacheData
+
+MAX_REPLICATION_GROUP_ID_LENGTH = 40
+
+
+def parse_version(version: str) -> tuple[int, ...]:
+    """Numeric components of an engine version, e.g. '7.0.7' -> (7, 0, 7), '6.x' -> (6,)"""
+    parts = []
+    for part in version.split("."):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts)
+
+
+@dataclass(frozen=True)
+class RuleContext:
+    """The input of a rule: the data and values derived from it once for all rules"""
+
+    data: "ElasticacheData"
+    engine_version: tuple[int, ...]
+    engine_catalog_entry: EngineVersion | None
+
+    @classmethod
+    def from_data(cls, data: "ElasticacheData") -> "RuleContext":
+        """Precompute the derived values"""
+        catalog = default_engine_catalog()
+        return cls(
+            data=data,
+            engine_version=parse_version(data.engine_version),
+            # like post_plan, do not trust a missing or expired catalog
+            engine_catalog_entry=None
+            if catalog is None or catalog.expired
+            else catalog.lookup(data.engine, data.engine_version),
+        )
+
+    def is_engine(self, engine: str, *majors: int) -> bool:
+        """Whether the engine matches and its major version is one of majors (if given)"""
+        return self.data.engine == engine and (
+            not majors or self.engine_version[:1] in {(m,) for m in majors}
+        )
+
+
+@dataclass(frozen=True)
+class RuleViolation:
+    """A failed rule"""
+
+    rule: str
+    message: str
+
+
+class RuleViolationsError(ValueError):
+    """All rule violations of an input"""
+
+    def __init__(self, violations: Sequence[RuleViolation]) -> None:
+        self.violations = list(violations)
+        super().__init__("; ".join(v.message for v in self.violations))
+
+
+Rule = Callable[[RuleContext], str | None]
+
+
+class RuleRegistry:
+    """Ordered set of rules, a rule returns an error message or None"""
+
+    def __init__(self) -> None:
+        self._rules: dict[str, Rule] = {}
+
+    def register(self, rule: Rule) -> Rule:
+        """Register a rule under its function name"""
+        self._rules[rule.__name__] = rule
+        return rule
+
+    @property
+    def names(self) -> list[str]:
+        """Names of all registered rules"""
+        return list(self._rules)
+
+    def evaluate(self, data: "ElasticacheData") -> list[RuleViolation]:
+        """Run all rules in one pass and collect every violation"""
+        ctx = RuleContext.from_data(data)
+        return [
+            RuleViolation(rule=name, message=message)
+            for name, rule in self._rules.items()
+            if (message := rule(ctx))
+        ]
+
+
+ELASTICACHE_RULES = RuleRegistry()
+
+
+@ELASTICACHE_RULES.register
+def automatic_failover(ctx: RuleContext) -> str | None:
+    """If enabled, number_cache_clusters must be greater than 1. Must be enabled for Redis (cluster mode enabled) replication groups."""
+    data = ctx.data
+    if (
+        data.automatic_failover_enabled
+        and data.number_cache_clusters is not None
+        and data.number_cache_clusters < 2  # noqa: PLR2004
+    ):
+        return "Automatic failover is not supported for clusters with less than 2 nodes. Set number_cache_clusters to 2 or more."
+    return None
+
+
+@ELASTICACHE_RULES.register
+def no_auto_minor_version_upgrade_for_redis_five(ctx: RuleContext) -> str | None:
+    """Auto minor version upgrade is not supported for Redis 5.x"""
+    if ctx.is_engine("redis", 5) and ctx.data.auto_minor_version_upgrade:
+        return "Auto minor version upgrade is not supported for Redis 5.x"
+    return None
+
+
+@ELASTICACHE_RULES.register
+def no_redis_seven(ctx: RuleContext) -> str | None:
+    """We don't support Redis 7+"""
+    if ctx.is_engine("redis", 7):
+        return "Redis 7.x is not supported. Please use the Valkey engine instead."
+    return None
+
+
+@ELASTICACHE_RULES.register
+def multi_az_needs_automatic_failover(ctx: RuleContext) -> str | None:
+    """Multi-AZ is only supported with automatic failover enabled"""
+    if ctx.data.multi_az_enabled and not ctx.data.automatic_failover_enabled:
+        return "Multi-AZ is only supported with automatic failover enabled. Either enable 'automatic_failover_enabled' or disable 'multi_az_enabled'"
+    return None
+
+
+@ELASTICACHE_RULES.register
+def number_cache_clusters_vs_num_node_groups(ctx: RuleContext) -> str | None:
+    """If num_node_groups is set, number_cache_clusters must be unset"""
+    if ctx.data.num_node_groups and ctx.data.number_cache_clusters:
+        return "number_cache_clusters and cluster_mode.num_node_groups are mutually exclusive."
+    return None
+
+
+@ELASTICACHE_RULES.register
+def no_availability_zones_for_num_node_groups(ctx: RuleContext) -> str | None:
+    """Preferred cache cluster AZs are not supported when num_node_groups is set"""
+    if ctx.data.num_node_groups and ctx.data.availability_zones:
+        return "availability_zones and cluster_mode.num_node_groups are mutually exclusive. Use the subnet_group_name to control the availability zones."
+    return None
+
+
+@ELASTICACHE_RULES.register
+def no_snapshot_retention_limit_for_cache_t1_micro(ctx: RuleContext) -> str | None:
+    """Snapshot retention limit is not supported for cache.t1.micro"""
+    if ctx.data.node_type == "cache.t1.micro" and ctx.data.snapshot_retention_limit:
+        return "Snapshot retention limit is not supported for cache.t1.micro"
+    return None
+
+
+@ELASTICACHE_RULES.register
+def no_older_versions_for_valkey(ctx: RuleContext) -> str | None:
+    """Check for Valkey engine version."""
+    if ctx.is_engine("valkey", 5, 6):
+        return "Valkey requires an engine_version 7.2 or higher"
+    return None
+
+
+@ELASTICACHE_RULES.register
+def check_parameter_group_family(ctx: RuleContext) -> str | None:
+    """Check if the parameter group family matches the engine"""
+    if not (parameter_group := ctx.data.parameter_group):
+        return None
+    if entry := ctx.engine_catalog_entry:
+        if entry.family != parameter_group.family:
+            return f"Parameter group family must match the engine. Expected {entry.family}, got {parameter_group.family}"
+        return None
+
+    # unknown engine version, e.g. newer than the engine catalog
+    family = f"{ctx.data.engine}{ctx.data.engine_version.split('.')[0]}"
+    if family not in parameter_group.family:
+        return f"Parameter group family must match the engine. Expected {family}, got {parameter_group.family}"
+    return None
+
+
+@ELASTICACHE_RULES.register
+def check_parameter_group_parameters(ctx: RuleContext) -> str | None:
+    """Check the parameters against the parameter catalog of the family"""
+    if not (parameter_group := ctx.data.parameter_group):
+        return None
+    # families without a catalog are checked by post_plan
+    if not (catalog := default_parameter_catalog(parameter_group.family)):
+        return None
+    if errors := catalog.check((p.name, p.value) for p in parameter_group.parameters):
+        return "; ".join(errors)
+    return None
+
+
+@ELASTICACHE_RULES.register
+def check_replication_group_id_length(ctx: RuleContext) -> str | None:
+    """Check if the replication group ID is within the allowed length"""
+    if len(ctx.data.replication_group_id) > MAX_REPLICATION_GROUP_ID_LENGTH:
+        return (
+            f"Replication group ID must be {MAX_REPLICATION_GROUP_ID_LENGTH} characters or less. "
+            f"Current length: {len(ctx.data.replication_group_id)}"
+        )
+    return None
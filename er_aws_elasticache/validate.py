@@ -0,0 +1,153 @@
+"""Validate many app-interface inputs at once.
+
+Usage: validate-inputs [--jobs N] [PATH ...]
+
+PATH is an input JSON file, a JSON-lines file (.jsonl, one input per line) or a
+directory searched recursively for both; without PATH (or with -) JSON lines are
+read from stdin. One JSON line per input is written to stdout, in input order.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from pydantic import ValidationError
+
+from .app_interface_input import AppInterfaceInput
+from .rules import RuleViolationsError
+
+INPUT_SUFFIXES = {".json", ".jsonl"}
+
+
+@dataclass(frozen=True)
+class InputSource:
+    """An input to validate: a file or an inline JSON document"""
+
+    source: str
+    text: str | None = None
+
+
+@dataclass
+class ValidationResult:
+    """Validation outcome of a single input"""
+
+    source: str
+    valid: bool
+    seconds: float
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _errors(exc: ValidationError) -> list[dict[str, Any]]:
+    errors: list[dict[str, Any]] = []
+    for error in exc.errors(include_url=False, include_input=False):
+        loc = ".".join(str(part) for part in error["loc"])
+        if isinstance(e := error.get("ctx", {}).get("error"), RuleViolationsError):
+            errors.extend(
+                {"loc": loc, "rule": v.rule, "msg": v.message} for v in e.violations
+            )
+        else:
+            errors.append({"loc": loc, "msg": error["msg"]})
+    return errors
+
+
+def validate_input(source: InputSource) -> ValidationResult:
+    """Validate one input"""
+    start = time.perf_counter()
+    errors: list[dict[str, Any]] = []
+    try:
+        text = (
+            source.text
+            if source.text is not None
+            else Path(source.source).read_text(encoding="utf-8")
+        )
+        AppInterfaceInput.model_validate_json(text)
+    except ValidationError as e:
+        errors = _errors(e)
+    except OSError as e:
+        errors = [{"loc": "", "msg": str(e)}]
+    return ValidationResult(
+        source=source.source,
+        valid=not errors,
+        seconds=time.perf_counter() - start,
+        errors=errors,
+    )
+
+
+def _read_lines(fp: IO[str], name: str) -> Iterator[InputSource]:
+    for lineno, line in enumerate(fp, start=1):
+        if line.strip():
+            yield InputSource(source=f"{name}:{lineno}", text=line)
+
+
+def iter_inputs(paths: Sequence[str], stdin: IO[str]) -> Iterator[InputSource]:
+    """Lazily enumerate all inputs"""
+    for path in paths or ["-"]:
+        if path == "-":
+            yield from _read_lines(stdin, "<stdin>")
+            continue
+        files = (
+            sorted(p for p in Path(path).rglob("*") if p.suffix in INPUT_SUFFIXES)
+            if Path(path).is_dir()
+            else [Path(path)]
+        )
+        for file in files:
+            if file.suffix == ".jsonl":
+                with file.open(encoding="utf-8") as fp:
+                    yield from _read_lines(fp, str(file))
+            else:
+                yield InputSource(source=str(file))
+
+
+def validate_inputs(
+    inputs: Iterable[InputSource], jobs: int | None = None
+) -> Iterator[ValidationResult]:
+    """Validate inputs on a process pool and yield the results in input order.
+
+    At most a few inputs per worker are in flight at any time, so memory use does
+    not depend on the number of inputs.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        yield from map(validate_input, inputs)
+        return
+
+    in_flight: deque[Future[ValidationResult]] = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for source in inputs:
+            in_flight.append(executor.submit(validate_input, source))
+            if len(in_flight) >= jobs * 4:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Validate app-interface inputs in bulk."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("paths", nargs="*", metavar="PATH")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (all cores)"
+    )
+    args = parser.parse_args(argv)
+
+    total = invalid = 0
+    for result in validate_inputs(iter_inputs(args.paths, sys.stdin), args.jobs):
+        total += 1
+        invalid += not result.valid
+        sys.stdout.write(json.dumps(asdict(result)) + "\n")
+    sys.stdout.flush()
+    sys.stderr.write(f"{total} inputs validated, {invalid} invalid\n")
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+import argparse
+import logging
+import sys
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+
+from external_resources_io.config import Config
+from external_resources_io.input import parse_model, read_input_from_file
+from external_resources_io.log import setup_logging
+
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from hooks import post_apply, post_output, post_plan, pre_run
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.metrics import emit_at_exit
+from hooks_lib.plan_index import PlanIndex
+
+logger = logging.getLogger(__name__)
+
+
+class HookContext:
+    """State shared by all phases of a driver run.
+
+    The input, the AWS API and the plan are loaded once, on first use.
+    """
+
+    def __init__(self, config: Config | None = None) -> None:
+        self.config = config or Config()
+
+    @cached_property
+    def app_interface_input(self) -> AppInterfaceInput:
+        """The parsed app-interface input"""
+        return parse_model(AppInterfaceInput, read_input_from_file())
+
+    @cached_property
+    def aws_api(self) -> AWSApi:
+        """The AWS API of the input region"""
+        return AWSApi(
+            config_options={"region_name": self.app_interface_input.data.region}
+        )
+
+    @cached_property
+    def plan(self) -> PlanIndex:
+        """The terraform plan"""
+        return PlanIndex.from_file(self.config.plan_file_json)
+
+
+PHASES: dict[str, Callable[[HookContext], None]] = {
+    "pre_run": lambda ctx: pre_run.main(ctx.app_interface_input, aws_api=ctx.aws_api),
+    "post_plan": lambda ctx: post_plan.main(
+        ctx.plan, ctx.app_interface_input, aws_api=ctx.aws_api
+    ),
+    "post_apply": lambda ctx: post_apply.main(
+        ctx.plan,
+        ctx.app_interface_input,
+        dry_run=ctx.config.dry_run,
+        aws_api=ctx.aws_api,
+    ),
+    "post_output": lambda _: post_output.main(),
+}
+
+
+@dataclass
+class PhaseResult:
+    """Outcome of a single phase"""
+
+    phase: str
+    seconds: float
+    exit_code: int
+
+
+def run(phases: Sequence[str], ctx: HookContext) -> list[PhaseResult]:
+    """Run the phases in order and stop at the first failing one."""
+    results = []
+    for phase in phases:
+        logger.info(f"Running phase {phase}")
+        start = time.perf_counter()
+        try:
+            PHASES[phase](ctx)
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        results.append(
+            PhaseResult(
+                phase=phase, seconds=time.perf_counter() - start, exit_code=exit_code
+            )
+        )
+        if exit_code:
+            break
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the hook phases in one process."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("phases", nargs="+", choices=list(PHASES))
+    args = parser.parse_args(argv)
+
+    results = run(args.phases, HookContext())
+    for result in results:
+        logger.info(
+            f"Phase {result.phase}: {result.seconds:.2f}s (exit code {result.exit_code})"
+        )
+    if results[-1].exit_code:
+        sys.exit(results[-1].exit_code)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    emit_at_exit("driver")
+    main()
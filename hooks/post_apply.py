@@ -1,47 +1,97 @@
 #!/usr/bin/env python
 
 import logging
-from datetime import UTC, timedelta
-from datetime import datetime as dt
+import sys
+from datetime import UTC, datetime, timedelta
 
 from external_resources_io.config import Config
 from external_resources_io.input import parse_model, read_input_from_file
 from external_resources_io.log import setup_logging
-from external_resources_io.terraform import Action, TerraformJsonPlanParser
+from external_resources_io.terraform import TerraformJsonPlanParser
 
-from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from er_aws_elasticache.app_interface_input import AppInterfaceInput, ElasticacheData
 from hooks_lib import ServiceUpdatesManager
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.checkpoint import (
+    Checkpoint,
+    CheckpointStatus,
+    CheckpointStore,
+    resolve_checkpoint,
+)
+from hooks_lib.metrics import emit_at_exit
+from hooks_lib.plan_index import PlanIndex, get_plan_index
+from hooks_lib.service_updates import (  # noqa: F401 - default_cooldown is re-exported
+    ServiceUpdate,
+    default_cooldown,
+    released_before,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def terraform_changes(plan: TerraformJsonPlanParser) -> bool:
+def terraform_changes(plan: TerraformJsonPlanParser | PlanIndex) -> bool:
     """Check if there are any terraform changes"""
-    return any(
-        c.change and c.change.actions != [Action.ActionNoop]
-        for c in plan.plan.resource_changes
-    )
+    return get_plan_index(plan).has_changes
 
 
-def default_cooldown(environment: str) -> int:
-    """Calculate the cooldown period based on the environment name."""
-    name = environment.lower().strip()
-    match name:
-        case _ if "production" in name:
-            default = 14
-        case _ if "staging" in name or "stage" in name:
-            default = 7
-        case _:
-            default = 5
+def checkpointed_update_in_progress(
+    sumgr: ServiceUpdatesManager, checkpoints: CheckpointStore
+) -> bool:
+    """Report a service update started by a previous run; exit non-zero if it failed"""
+    match resolve_checkpoint(sumgr, checkpoints):
+        case CheckpointStatus.IN_PROGRESS:
+            return True
+        case CheckpointStatus.FAILED:
+            sys.exit(1)
+    return False
 
-    return default
+
+def converge(
+    sumgr: ServiceUpdatesManager, data: ElasticacheData, before: datetime
+) -> None:
+    """Apply all eligible service updates and exit non-zero if one did not complete"""
+    results = sumgr.converge(
+        service_updates_types=data.service_updates_types,
+        severities=data.service_updates_severities,
+        released_before=before,
+    )
+    for result in results:
+        error = f" ({result.error})" if result.error else ""
+        logger.info(
+            f"Service update {result.name}: {result.status} after "
+            f"{timedelta(seconds=round(result.seconds))}{error}"
+        )
+    if any(r.status != "completed" for r in results):
+        sys.exit(1)
+
+
+def start_service_update(
+    sumgr: ServiceUpdatesManager,
+    service_update: ServiceUpdate,
+    checkpoints: CheckpointStore,
+) -> None:
+    """Apply a service update without waiting and checkpoint it for the next run"""
+    started_at = datetime.now(tz=UTC)
+    logger.info(f"Starting service update {service_update.name}")
+    sumgr.apply_service_update(service_update)
+    checkpoints.save(
+        Checkpoint(
+            replication_group_id=sumgr.replication_group_id,
+            region=sumgr.region,
+            service_update=service_update.name,
+            started_at=started_at,
+        )
+    )
+    logger.info("Not waiting for the service update, the next run reports its outcome.")
 
 
 def main(
-    plan: TerraformJsonPlanParser,
+    plan: TerraformJsonPlanParser | PlanIndex,
     app_interface_input: AppInterfaceInput,
     *,
     dry_run: bool,
+    aws_api: AWSApi | None = None,
+    checkpoints: CheckpointStore | None = None,
 ) -> None:
     """Ensure that no service updates are in progress."""
     if not app_interface_input.data.service_updates_enabled:
@@ -54,18 +104,27 @@ def main(
         return
 
     sumgr = ServiceUpdatesManager(
-        app_interface_input.data.replication_group_id, app_interface_input.data.region
+        app_interface_input.data.replication_group_id,
+        app_interface_input.data.region,
+        aws_api=aws_api,
     )
+    checkpoints = checkpoints or CheckpointStore.from_env()
+    if not dry_run and checkpointed_update_in_progress(sumgr, checkpoints):
+        return
+
+    data = app_interface_input.data
+    before = released_before(data.service_updates_cooldown_days, data.environment)
+    wait = data.service_updates_wait_for_completion
+    if data.service_updates_apply_all and wait and not dry_run:
+        converge(sumgr, data, before)
+        return
 
     service_updates = sumgr.service_updates(
-        service_updates_types=app_interface_input.data.service_updates_types,
-        severities=app_interface_input.data.service_updates_severities,
-        released_before=dt.now(tz=UTC)
-        - timedelta(
-            days=app_interface_input.data.service_updates_cooldown_days
-            if app_interface_input.data.service_updates_cooldown_days is not None
-            else default_cooldown(app_interface_input.data.environment)
-        ),
+        service_updates_types=data.service_updates_types,
+        severities=data.service_updates_severities,
+        released_before=before,
+        # only the most recent update gets applied
+        limit=None if dry_run or data.service_updates_apply_all else 1,
     )
 
     if not service_updates:
@@ -80,15 +139,24 @@ def main(
             )
         return
 
-    # Apply the most recent service update
-    logger.info(f"Applying service update {service_updates[0].name}")
-    sumgr.apply_service_update(service_updates[0], wait_for_completion=True)
+    if wait:
+        # Apply the most recent service update
+        logger.info(f"Applying service update {service_updates[0].name}")
+        sumgr.apply_service_update(service_updates[0], wait_for_completion=True)
+    else:
+        # without waiting, apply_all works through the updates oldest first, one per run
+        start_service_update(
+            sumgr,
+            service_updates[-1 if data.service_updates_apply_all else 0],
+            checkpoints,
+        )
 
 
 if __name__ == "__main__":
     setup_logging()
+    emit_at_exit("post_apply")
     config = Config()
     app_interface_input = parse_model(AppInterfaceInput, read_input_from_file())
-    plan = TerraformJsonPlanParser(plan_path=config.plan_file_json)
+    plan = PlanIndex.from_file(config.plan_file_json)
     main(plan, app_interface_input, dry_run=config.dry_run)
     logger.info("Post apply completed.")
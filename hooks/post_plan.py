@@ -1,9 +1,15 @@
 #!/usr/bin/env python
 
+import asyncio
+import copy
 import logging
 import sys
-from collections.abc import Sequence
+import threading
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property, partial
+from typing import TYPE_CHECKING, Any, Self, TypeVar
 
 from external_resources_io.config import Config
 from external_resources_io.input import parse_model, read_input_from_file
@@ -15,10 +21,39 @@ from external_resources_io.terraform import (
 )
 
 from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from er_aws_elasticache.engine_catalog import EngineCatalog, default_engine_catalog
+from er_aws_elasticache.parameter_catalog import (
+    ParameterCatalog,
+    default_parameter_catalog,
+)
+from hooks_lib.async_aws_api import AsyncAWSApi
 from hooks_lib.aws_api import AWSApi
+from hooks_lib.existence_index import EXISTENCE_INDEXES, ExistenceIndex
+from hooks_lib.metrics import emit_at_exit
+from hooks_lib.parameter_catalog import load_parameter_catalog
+from hooks_lib.plan_index import PlanClass, PlanIndex, get_plan_index
+from hooks_lib.topology_cache import (
+    TOPOLOGY_CACHE,
+    SubnetGroupTopology,
+    TopologyCache,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2.type_defs import SecurityGroupTypeDef
+    from mypy_boto3_ec2.type_defs import SubnetTypeDef as EC2SubnetTypeDef
+    from mypy_boto3_elasticache.type_defs import (
+        SubnetTypeDef as ElasticacheSubnetTypeDef,
+    )
+else:
+    SecurityGroupTypeDef = EC2SubnetTypeDef = ElasticacheSubnetTypeDef = object
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# a validation of the plan, called with the validator
+Check = partial[Any]
+
 
 @dataclass
 class EngineInfo:
@@ -35,48 +70,123 @@ class EngineInfo:
     version: str
 
 
+@dataclass(frozen=True)
+class ParameterChange:
+    """A changed parameter of a parameter group.
+
+    Attributes:
+        name: The name of the parameter.
+        before: The value before the change, None if the parameter is added.
+        after: The value after the change, None if it is reset to the default.
+        change_type: 'immediate', 'requires-reboot' or None if unknown.
+    """
+
+    name: str
+    before: str | None
+    after: str | None
+    change_type: str | None
+
+    @property
+    def requires_reboot(self) -> bool:
+        """Whether the change only takes effect after a node reboot"""
+        return self.change_type == "requires-reboot"
+
+
+def parameter_values(parameters: Sequence[Mapping[str, Any]] | None) -> dict[str, str]:
+    """The values of the parameter set of a planned parameter group by name"""
+    return {p["name"]: str(p["value"]) for p in parameters or []}
+
+
 class ElasticachePlanValidator:
-    """The plan validator class"""
+    """The plan validator class
 
-    def __init__(
-        self, plan: TerraformJsonPlanParser, app_interface_input: AppInterfaceInput
+    Independent AWS lookups run concurrently on a thread pool of max_workers
+    threads; use max_workers=1 to run them one after another. Engine versions are
+    resolved from the offline engine catalog, AWS is only asked on a catalog miss.
+    The plan is either a parsed plan or a (streamed) PlanIndex.
+
+    The AWS API, the engine catalog and the existence index are created on first
+    use, so a plan without checks never sets up an AWS session. Subnet groups
+    and security groups are looked up in the topology cache first, so validating
+    a new cluster in a known subnet group needs no EC2 calls.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        plan: TerraformJsonPlanParser | PlanIndex,
+        app_interface_input: AppInterfaceInput,
+        *,
+        max_workers: int = 8,
+        engine_catalog: EngineCatalog | None = None,
+        existence_index: ExistenceIndex | None = None,
+        aws_api: AWSApi | None = None,
+        topology_cache: TopologyCache | None = None,
     ) -> None:
         self.plan = plan
         self.input = app_interface_input
-        self.aws_api = AWSApi(config_options={"region_name": self.input.data.region})
+        self.max_workers = max_workers
+        self._aws_api = aws_api
+        self._engine_catalog = engine_catalog
+        self._existence_index = existence_index
+        self._topology_cache = topology_cache
+        # per family; shared with the copies of the concurrent checks
+        self._parameter_catalogs: dict[str, ParameterCatalog | None] = {}
+        self._parameter_catalogs_lock = threading.Lock()
         self.errors: list[str] = []
 
+    @cached_property
+    def aws_api(self) -> AWSApi:
+        """The AWS API of the input region"""
+        return self._aws_api or AWSApi(
+            config_options={"region_name": self.input.data.region}
+        )
+
+    @cached_property
+    def engine_catalog(self) -> EngineCatalog | None:
+        """The engine catalog, None if none is installed"""
+        return self._engine_catalog or default_engine_catalog()
+
+    @cached_property
+    def existence_index(self) -> ExistenceIndex:
+        """The existence index of the account and region (resolves the credentials)"""
+        return self._existence_index or EXISTENCE_INDEXES.get(self.aws_api)
+
+    @property
+    def plan_index(self) -> PlanIndex:
+        """The resource changes of the plan indexed by type and action"""
+        return get_plan_index(self.plan)
+
     @property
     def elasticache_replication_group_updates(self) -> list[ResourceChange]:
         """Get the elasticache replication group updates"""
         return [
             c
-            for c in self.plan.plan.resource_changes
-            if c.type == "aws_elasticache_replication_group"
-            and c.change
-            and c.change.after
-            and (
-                Action.ActionCreate in c.change.actions
-                or Action.ActionUpdate in c.change.actions
+            for c in self.plan_index.changes(
+                "aws_elasticache_replication_group",
+                Action.ActionCreate,
+                Action.ActionUpdate,
             )
+            if c.change and c.change.after
         ]
 
     @property
     def elasticache_parameter_group_updates(self) -> list[ResourceChange]:
         """Get the elasticache parameter group updates"""
-        return [
-            c
-            for c in self.plan.plan.resource_changes
-            if c.type == "aws_elasticache_parameter_group"
-            and c.change
-            and (
-                Action.ActionCreate in c.change.actions
-                or Action.ActionUpdate in c.change.actions
-            )
-        ]
+        return self.plan_index.changes(
+            "aws_elasticache_parameter_group", Action.ActionCreate, Action.ActionUpdate
+        )
 
     def get_engine_version(self, engine: str, engine_version: str) -> EngineInfo:
         """Get the engine version and the cache parameter group family"""
+        if self.engine_catalog is None:
+            logger.warning(
+                "No engine catalog is installed (make engine-catalog). Using the AWS API instead."
+            )
+        elif self.engine_catalog.expired:
+            logger.warning("The engine catalog is expired. Using the AWS API instead.")
+        elif entry := self.engine_catalog.lookup(engine, engine_version):
+            return EngineInfo(name=engine, version=engine_version, family=entry.family)
+
         # Get available engine versions from AWS
         response = self.aws_api.client.describe_cache_engine_versions(
             Engine=engine, EngineVersion=engine_version
@@ -99,68 +209,153 @@ class ElasticachePlanValidator:
     #
     def _validate_replication_group_id(self, replication_group_id: str) -> None:
         logger.info(f"Validating Elasticache replication group {replication_group_id}")
-        try:
-            self.aws_api.client.describe_replication_groups(
-                ReplicationGroupId=replication_group_id
-            )
+        if self.existence_index.replication_group_exists(replication_group_id):
             self.errors.append(
                 f"Replication group ID {replication_group_id} already exists!"
             )
-        except self.aws_api.client.exceptions.ReplicationGroupNotFoundFault:
-            pass
+
+    @cached_property
+    def topology_cache(self) -> TopologyCache:
+        """The subnet group and security group topology cache"""
+        return self._topology_cache or TOPOLOGY_CACHE
+
+    @cached_property
+    def topology_key(self) -> str:
+        """The account and region of the topology cache (resolves the credentials)"""
+        return f"{self.aws_api.account_key}/{self.aws_api.region}"
 
     def _validate_subnets(
         self, cache_subnet_group_name: str, availability_zones: Sequence[str]
     ) -> str | None:
         logger.info(f"Validating Elasticache subnet group {cache_subnet_group_name}")
+        if topology := self._cached_subnet_group(
+            cache_subnet_group_name, availability_zones
+        ):
+            return self._check_subnets(availability_zones, topology)
 
-        vpc_ids: set[str] = set()
         cache_group_subnets = self.aws_api.get_cache_group_subnets(
             cache_subnet_group_name
         )
         subnets = self.aws_api.get_subnets(
             subnets=[s["SubnetIdentifier"] for s in cache_group_subnets]
         )
+        return self._check_subnets(
+            availability_zones,
+            self._put_subnet_group(
+                cache_subnet_group_name, cache_group_subnets, subnets
+            ),
+        )
 
-        for subnet in subnets:
-            if "VpcId" not in subnet:
-                self.errors.append(
-                    f"VpcId not found for subnet {subnet.get('SubnetId')}"
-                )
-                continue
-            vpc_ids.add(subnet["VpcId"])
+    def _cached_subnet_group(
+        self, cache_subnet_group_name: str, availability_zones: Sequence[str]
+    ) -> SubnetGroupTopology | None:
+        """The cached topology of a subnet group if it passes the checks.
+
+        A cached topology failing a check may be outdated; it is dropped, so the
+        check is repeated against AWS.
+        """
+        topology = self.topology_cache.subnet_group(
+            self.topology_key, cache_subnet_group_name
+        )
+        if topology is None:
+            return None
+        if self._subnet_errors(availability_zones, topology):
+            self.topology_cache.invalidate(
+                self.topology_key, subnet_group=cache_subnet_group_name
+            )
+            return None
+        return topology
 
-        if len(vpc_ids) > 1:
-            self.errors.append("All subnets must belong to the same VPC")
+    def _put_subnet_group(
+        self,
+        cache_subnet_group_name: str,
+        cache_group_subnets: Sequence[ElasticacheSubnetTypeDef],
+        subnets: Sequence[EC2SubnetTypeDef],
+    ) -> SubnetGroupTopology:
+        """Cache the topology of a subnet group described by AWS"""
+        topology = SubnetGroupTopology.from_describe(
+            cache_subnet_group_name, cache_group_subnets, subnets
+        )
+        self.topology_cache.put_subnet_group(self.topology_key, topology)
+        return topology
+
+    def _check_subnets(
+        self, availability_zones: Sequence[str], topology: SubnetGroupTopology
+    ) -> str | None:
+        """Check the subnets of a subnet group and return their VPC"""
+        self.errors.extend(self._subnet_errors(availability_zones, topology))
+        vpc_ids = topology.vpc_ids
+        return vpc_ids.pop() if vpc_ids else None
+
+    @staticmethod
+    def _subnet_errors(
+        availability_zones: Sequence[str], topology: SubnetGroupTopology
+    ) -> list[str]:
+        errors = [
+            f"VpcId not found for subnet {subnet.subnet_id}"
+            for subnet in topology.subnets
+            if not subnet.vpc_id
+        ]
+        if len(topology.vpc_ids) > 1:
+            errors.append("All subnets must belong to the same VPC")
 
         # Check that all requested availability zones are covered by the subnet group
-        cache_group_subnet_availability_zones = {
-            name
-            for s in cache_group_subnets
-            if (name := s.get("SubnetAvailabilityZone", {}).get("Name"))
-        }
-        if not cache_group_subnet_availability_zones.issuperset(availability_zones):
-            self.errors.append(
-                f"Subnet group {cache_subnet_group_name} does not cover all requested availability zones {availability_zones}. "
-                f"Available zones: {cache_group_subnet_availability_zones} "
+        if not topology.availability_zones.issuperset(availability_zones):
+            errors.append(
+                f"Subnet group {topology.name} does not cover all requested availability zones {availability_zones}. "
+                f"Available zones: {topology.availability_zones} "
                 "If unsure, just remove the availability_zones from your configuration and use the subnet group defaults."
             )
-
-        return vpc_ids.pop()
+        return errors
 
     def _validate_security_groups(
         self, security_groups: Sequence[str], vpc_id: str
     ) -> None:
         logger.info(f"Validating security group {security_groups}")
-        data = self.aws_api.get_security_groups(security_groups)
-        if missing := set(security_groups).difference({s.get("GroupId") for s in data}):
+        vpc_ids = self._cached_security_groups(security_groups, vpc_id)
+        if missing := [g for g in security_groups if g not in vpc_ids]:
+            vpc_ids |= self._put_security_groups(
+                self.aws_api.get_security_groups(missing)
+            )
+        self._check_security_groups(security_groups, vpc_id, vpc_ids)
+
+    def _cached_security_groups(
+        self, security_groups: Sequence[str], vpc_id: str
+    ) -> dict[str, str | None]:
+        """The cached VPC of the security groups in vpc_id.
+
+        A security group cached in another VPC may have been recreated; it is
+        dropped, so it is looked up again.
+        """
+        vpc_ids = self.topology_cache.security_groups(
+            self.topology_key, security_groups
+        )
+        if outdated := [g for g, vpc in vpc_ids.items() if vpc != vpc_id]:
+            self.topology_cache.invalidate(self.topology_key, security_groups=outdated)
+        return {g: vpc for g, vpc in vpc_ids.items() if vpc == vpc_id}
+
+    def _put_security_groups(
+        self, data: Sequence[SecurityGroupTypeDef]
+    ) -> dict[str, str | None]:
+        """Cache the security groups described by AWS and return their VPC"""
+        self.topology_cache.put_security_groups(self.topology_key, data)
+        return {g: sg.get("VpcId") for sg in data if (g := sg.get("GroupId"))}
+
+    def _check_security_groups(
+        self,
+        security_groups: Sequence[str],
+        vpc_id: str,
+        vpc_ids: Mapping[str, str | None],
+    ) -> None:
+        """Check that the security groups exist and belong to the VPC"""
+        if missing := set(security_groups).difference(vpc_ids):
             self.errors.append(f"Security group(s) {missing} not found")
             return
 
-        for sg in data:
-            if sg.get("VpcId") != vpc_id:
+        for group_id in security_groups:
+            if vpc_ids[group_id] != vpc_id:
                 self.errors.append(
-                    f"Security group {sg.get('GroupId')} does not belong to the same VPC as the subnets"
+                    f"Security group {group_id} does not belong to the same VPC as the subnets"
                 )
 
     def _validate_cluster_upgrade(
@@ -193,7 +388,15 @@ class ElasticachePlanValidator:
         """Validate a single replication group change"""
         # Only validate replication group ID for new resources
         self._validate_replication_group_id(replication_group_id)
+        self._validate_network(subnet_group_name, security_groups, availability_zones)
 
+    def _validate_network(
+        self,
+        subnet_group_name: str,
+        security_groups: Sequence[str],
+        availability_zones: Sequence[str],
+    ) -> None:
+        """Validate the subnet group and the security groups in its VPC"""
         if vpc_id := self._validate_subnets(
             cache_subnet_group_name=subnet_group_name,
             availability_zones=availability_zones,
@@ -202,16 +405,43 @@ class ElasticachePlanValidator:
                 security_groups=security_groups, vpc_id=vpc_id
             )
 
+    async def _validate_network_async(
+        self,
+        aws_api: AsyncAWSApi,
+        subnet_group_name: str,
+        security_groups: Sequence[str],
+        availability_zones: Sequence[str],
+    ) -> None:
+        """Asyncio counterpart of _validate_network"""
+        logger.info(f"Validating Elasticache subnet group {subnet_group_name}")
+        if not (
+            topology := self._cached_subnet_group(subnet_group_name, availability_zones)
+        ):
+            cache_group_subnets = await aws_api.get_cache_group_subnets(
+                subnet_group_name
+            )
+            subnets = await aws_api.get_subnets([
+                s["SubnetIdentifier"] for s in cache_group_subnets
+            ])
+            topology = self._put_subnet_group(
+                subnet_group_name, cache_group_subnets, subnets
+            )
+        if vpc_id := self._check_subnets(availability_zones, topology):
+            logger.info(f"Validating security group {security_groups}")
+            vpc_ids = self._cached_security_groups(security_groups, vpc_id)
+            if missing := [g for g in security_groups if g not in vpc_ids]:
+                vpc_ids |= self._put_security_groups(
+                    await aws_api.get_security_groups(missing)
+                )
+            self._check_security_groups(security_groups, vpc_id, vpc_ids)
+
     #
     # Parameter Group validations
     #
     def _validate_parameter_group_name(self, name: str) -> None:
         logger.info(f"Validating Elasticache parameter group {name}")
-        try:
-            self.aws_api.client.describe_cache_parameters(CacheParameterGroupName=name)
+        if self.existence_index.parameter_group_exists(name):
             self.errors.append(f"Parameter group {name} already exists!")
-        except self.aws_api.client.exceptions.CacheParameterGroupNotFoundFault:
-            pass
 
     def _validate_parameter_group_family(
         self, engine_info: EngineInfo, family: str
@@ -226,47 +456,202 @@ class ElasticachePlanValidator:
                 f"Expected: {engine_info.family}"
             )
 
-    def validate(self) -> bool:
-        """Validate method"""
-        engine_info = None
+    def parameter_catalog(self, family: str) -> ParameterCatalog | None:
+        """The parameter catalog of a family, looked up once per validator.
+
+        From AWS if no current one ships or was saved; None if AWS cannot be asked.
+        """
+        with self._parameter_catalogs_lock:
+            if family not in self._parameter_catalogs:
+                self._parameter_catalogs[family] = default_parameter_catalog(
+                    family
+                ) or load_parameter_catalog(self.aws_api, family)
+            return self._parameter_catalogs[family]
+
+    def _validate_parameters(
+        self, family: str, parameters: Sequence[Mapping[str, Any]]
+    ) -> None:
+        """Validate the parameter names and values against the parameter catalog"""
+        if not (catalog := self.parameter_catalog(family)):
+            logger.warning(f"Skipping the parameter validation of {family}")
+            return
+        logger.info(f"Validating parameters of parameter group family {family}")
+        self.errors.extend(
+            catalog.check((p["name"], str(p["value"])) for p in parameters)
+        )
+
+    def parameter_changes(
+        self,
+        family: str,
+        before: Sequence[Mapping[str, Any]] | None,
+        after: Sequence[Mapping[str, Any]] | None,
+    ) -> list[ParameterChange]:
+        """Diff two parameter sets and classify the changes with the parameter catalog"""
+        old, new = parameter_values(before), parameter_values(after)
+        if not (names := sorted(n for n in old | new if old.get(n) != new.get(n))):
+            return []
+        catalog = self.parameter_catalog(family)
+        return [
+            ParameterChange(
+                name=name,
+                before=old.get(name),
+                after=new.get(name),
+                change_type=spec.change_type
+                if catalog and (spec := catalog.lookup(name))
+                else None,
+            )
+            for name in names
+        ]
+
+    def _validate_parameter_changes(
+        self,
+        name: str,
+        family: str,
+        before: Sequence[Mapping[str, Any]] | None,
+        after: Sequence[Mapping[str, Any]] | None,
+    ) -> None:
+        """Report parameter changes requiring a reboot according to the reboot policy"""
+        changes = self.parameter_changes(family, before, after)
+        for change in changes:
+            logger.info(
+                f"Parameter group {name}: {change.name} {change.before} -> {change.after} "
+                f"({change.change_type or 'unknown change type'})"
+            )
+        if not (reboot := [c.name for c in changes if c.requires_reboot]):
+            return
+
+        message = (
+            f"Parameter group {name}: changing {', '.join(reboot)} requires a reboot "
+            "of the cache nodes to take effect"
+        )
+        match self.input.data.parameter_group_reboot_policy:
+            case "block":
+                self.errors.append(
+                    f"{message}. Reboot the nodes after the apply and set "
+                    "parameter_group_reboot_policy to 'warn' or 'allow' to proceed."
+                )
+            case "warn":
+                logger.warning(message)
+
+    def _checked(self, check: Callable[[Self], T]) -> tuple[T, list[str]]:
+        """Run check on a copy of the validator with its own error list.
+
+        Checks running concurrently never share an error list; validate() merges
+        them in submission order, so self.errors is the same as in a sequential run.
+        """
+        worker = copy.copy(self)
+        worker.errors = []
+        return check(worker), worker.errors
+
+    async def _checked_async(
+        self, check: Callable[[Self], Awaitable[T]]
+    ) -> tuple[T, list[str]]:
+        """Asyncio counterpart of _checked"""
+        worker = copy.copy(self)
+        worker.errors = []
+        return await check(worker), worker.errors
+
+    def _plan_checks(self) -> list[Check]:
+        """The checks of the plan in the order of a sequential run"""
+        checks: list[Check] = []
         for change in self.elasticache_replication_group_updates:
             assert change.change  # mypy
             assert change.change.after  # mypy
+            after = change.change.after
 
             if Action.ActionCreate in change.change.actions:
-                self._validate_replication_group(
-                    replication_group_id=change.change.after["replication_group_id"],
-                    subnet_group_name=change.change.after["subnet_group_name"],
-                    security_groups=change.change.after["security_group_ids"],
-                    availability_zones=change.change.after.get(
-                        "preferred_cache_cluster_azs", []
+                checks.extend((
+                    partial(
+                        ElasticachePlanValidator._validate_replication_group_id,
+                        replication_group_id=after["replication_group_id"],
                     ),
-                )
+                    # subnets -> VPC -> security groups
+                    partial(
+                        ElasticachePlanValidator._validate_network,
+                        subnet_group_name=after["subnet_group_name"],
+                        security_groups=after["security_group_ids"],
+                        availability_zones=after.get("preferred_cache_cluster_azs", []),
+                    ),
+                ))
 
             # Run validation for version changes
             if Action.ActionUpdate in change.change.actions:
                 assert change.change.before  # mypy
-                self._validate_cluster_upgrade(
-                    before_engine=change.change.before.get("engine"),
-                    after_engine=change.change.after.get("engine"),
-                    before_version=change.change.before.get("engine_version"),
-                    after_version=change.change.after.get("engine_version"),
-                    apply_immediately=change.change.after.get(
-                        "apply_immediately", False
-                    ),
+                checks.append(
+                    partial(
+                        ElasticachePlanValidator._validate_cluster_upgrade,
+                        before_engine=change.change.before.get("engine"),
+                        after_engine=after.get("engine"),
+                        before_version=change.change.before.get("engine_version"),
+                        after_version=after.get("engine_version"),
+                        apply_immediately=after.get("apply_immediately", False),
+                    )
                 )
 
-            engine_info = self.get_engine_version(
-                engine=change.change.after["engine"],
-                engine_version=change.change.after["engine_version"],
+            checks.append(
+                partial(
+                    ElasticachePlanValidator.get_engine_version,
+                    engine=after["engine"],
+                    engine_version=after["engine_version"],
+                )
             )
 
         for change in self.elasticache_parameter_group_updates:
             assert change.change  # mypy
-            assert change.change.after  # mypy
-
             if Action.ActionCreate in change.change.actions:
-                self._validate_parameter_group_name(name=change.name)
+                checks.append(
+                    partial(
+                        ElasticachePlanValidator._validate_parameter_group_name,
+                        name=change.name,
+                    )
+                )
+            if (
+                Action.ActionUpdate in change.change.actions
+                and (before := change.change.before)
+                and (after := change.change.after)
+                and parameter_values(before.get("parameter"))
+                != parameter_values(after.get("parameter"))
+            ):
+                checks.append(
+                    partial(
+                        ElasticachePlanValidator._validate_parameter_changes,
+                        name=after.get("name", change.name),
+                        family=after["family"],
+                        before=before.get("parameter"),
+                        after=after.get("parameter"),
+                    )
+                )
+            if (after := change.change.after) and after.get("parameter"):
+                checks.append(
+                    partial(
+                        ElasticachePlanValidator._validate_parameters,
+                        family=after["family"],
+                        parameters=after["parameter"],
+                    )
+                )
+        return checks
+
+    def _merge(
+        self, checks: Sequence[Check], results: Sequence[tuple[Any, list[str]]]
+    ) -> bool:
+        """Collect the errors of the checks and validate the parameter group families"""
+        for _, errors in results:
+            self.errors.extend(errors)
+
+        # parameter groups are checked against the last replication group engine
+        engine_info = next(
+            (
+                result
+                for check, (result, _) in reversed(
+                    list(zip(checks, results, strict=True))
+                )
+                if check.func is ElasticachePlanValidator.get_engine_version
+            ),
+            None,
+        )
+        for change in self.elasticache_parameter_group_updates:
+            assert change.change  # mypy
+            assert change.change.after  # mypy
             if engine_info and engine_info.family:
                 # Validate parameter group family matches engine version
                 self._validate_parameter_group_family(
@@ -275,15 +660,80 @@ class ElasticachePlanValidator:
 
         return not self.errors
 
+    def _share_lazy_attributes(self, checks: Sequence[Check]) -> None:
+        """Create the lazy attributes the checks share before copying the validator"""
+        # the existence index is shared by EXISTENCE_INDEXES anyway
+        _ = self.aws_api, self.engine_catalog, self.topology_cache
+        if any(
+            check.func is ElasticachePlanValidator._validate_network for check in checks
+        ):
+            _ = self.topology_key
+
+    def validate(self) -> bool:
+        """Validate method"""
+        if not (checks := self._plan_checks()):
+            return self._merge(checks, [])
+        self._share_lazy_attributes(checks)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._checked, check) for check in checks]
+            # merge in submission order, re-raises the exception of a failed check
+            results = [future.result() for future in futures]
+        return self._merge(checks, results)
+
+    async def validate_async(self, aws_api: AsyncAWSApi | None = None) -> bool:
+        """Asyncio counterpart of validate.
+
+        The network checks await the AWS calls; all other checks run on worker
+        threads of aws_api. Share one AsyncAWSApi to validate many plans on one
+        event loop with bounded concurrency (default: max_workers calls at once).
+        """
+        if not (checks := self._plan_checks()):
+            return self._merge(checks, [])
+        self._share_lazy_attributes(checks)
+        aws_api = aws_api or AsyncAWSApi(self.aws_api, concurrency=self.max_workers)
+
+        def _async(check: Check) -> Callable[[Self], Awaitable[Any]]:
+            if check.func is ElasticachePlanValidator._validate_network:
+                return partial(
+                    ElasticachePlanValidator._validate_network_async,
+                    aws_api=aws_api,
+                    **check.keywords,
+                )
+            return partial(aws_api.run, check)
+
+        results = await asyncio.gather(
+            *(self._checked_async(_async(check)) for check in checks)
+        )
+        return self._merge(checks, results)
+
+
+def main(
+    plan: TerraformJsonPlanParser | PlanIndex,
+    app_interface_input: AppInterfaceInput,
+    *,
+    aws_api: AWSApi | None = None,
+) -> None:
+    """Validate the terraform plan."""
+    if (plan_class := get_plan_index(plan).classification) != (
+        PlanClass.ELASTICACHE_CHANGES
+    ):
+        # most plans are no-ops, skip setting up AWS altogether
+        logger.info(
+            f"No Elasticache resource changes ({plan_class}), nothing to validate"
+        )
+        return
 
-if __name__ == "__main__":
-    setup_logging()
-    app_interface_input = parse_model(AppInterfaceInput, read_input_from_file())
     logger.info("Running Elasticache terraform plan validation")
-    plan = TerraformJsonPlanParser(plan_path=Config().plan_file_json)
-    validator = ElasticachePlanValidator(plan, app_interface_input)
+    validator = ElasticachePlanValidator(plan, app_interface_input, aws_api=aws_api)
     if not validator.validate():
         logger.error(validator.errors)
         sys.exit(1)
 
     logger.info("Validation ended succesfully")
+
+
+if __name__ == "__main__":
+    setup_logging()
+    emit_at_exit("post_plan")
+    app_interface_input = parse_model(AppInterfaceInput, read_input_from_file())
+    main(PlanIndex.from_file(Config().plan_file_json), app_interface_input)
@@ -8,16 +8,34 @@ from external_resources_io.log import setup_logging
 
 from er_aws_elasticache.app_interface_input import AppInterfaceInput
 from hooks_lib import ServiceUpdatesManager
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.checkpoint import CheckpointStatus, CheckpointStore, resolve_checkpoint
+from hooks_lib.metrics import emit_at_exit
 
 logger = logging.getLogger(__name__)
 
 
-def main(app_interface_input: AppInterfaceInput) -> None:
+def main(
+    app_interface_input: AppInterfaceInput,
+    *,
+    aws_api: AWSApi | None = None,
+    checkpoints: CheckpointStore | None = None,
+) -> None:
     """Ensure that no service updates are in progress."""
     sumgr = ServiceUpdatesManager(
-        app_interface_input.data.replication_group_id, app_interface_input.data.region
+        app_interface_input.data.replication_group_id,
+        app_interface_input.data.region,
+        aws_api=aws_api,
     )
 
+    # report the outcome of an update started by a non-blocking post_apply
+    match resolve_checkpoint(sumgr, checkpoints or CheckpointStore.from_env()):
+        case CheckpointStatus.IN_PROGRESS:
+            logger.error("Try again once the service update has completed.")
+            sys.exit(1)
+        case CheckpointStatus.FAILED:
+            sys.exit(1)
+
     if sumgr.update_in_progress:
         logger.error(
             f"A service update is in progress for replication group {sumgr.replication_group_id}"
@@ -29,5 +47,6 @@ def main(app_interface_input: AppInterfaceInput) -> None:
 
 if __name__ == "__main__":
     setup_logging()
+    emit_at_exit("pre_run")
     app_interface_input = parse_model(AppInterfaceInput, read_input_from_file())
     main(app_interface_input)
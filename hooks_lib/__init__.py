@@ -1,3 +1,11 @@
-from .service_updates import ServiceUpdatesManager
+from .service_updates import (
+    AsyncServiceUpdatesManager,
+    ServiceUpdatesBatchManager,
+    ServiceUpdatesManager,
+)
 
-__all__ = ["ServiceUpdatesManager"]
+__all__ = [
+    "AsyncServiceUpdatesManager",
+    "ServiceUpdatesBatchManager",
+    "ServiceUpdatesManager",
+]
@@ -0,0 +1,103 @@
+import asyncio
+from collections.abc import Callable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from hooks_lib.aws_api import AWSApi
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2.type_defs import SecurityGroupTypeDef
+    from mypy_boto3_ec2.type_defs import SubnetTypeDef as EC2SubnetTypeDef
+    from mypy_boto3_elasticache.literals import UpdateActionStatusType
+    from mypy_boto3_elasticache.type_defs import (
+        ProcessedUpdateActionTypeDef,
+        UpdateActionTypeDef,
+    )
+    from mypy_boto3_elasticache.type_defs import (
+        SubnetTypeDef as ElasticacheSubnetTypeDef,
+    )
+else:
+    SecurityGroupTypeDef = EC2SubnetTypeDef = UpdateActionStatusType = (
+        ProcessedUpdateActionTypeDef
+    ) = UpdateActionTypeDef = ElasticacheSubnetTypeDef = object
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+# AWS calls running at once per AsyncAWSApi
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncAWSApi:
+    """Asyncio counterpart of AWSApi.
+
+    Every call runs the blocking AWSApi method on a worker thread, at most
+    concurrency calls at a time, so many replication groups and lookups can be
+    multiplexed on one event loop. Clients, metrics and rate limits are shared
+    with the wrapped AWSApi.
+    """
+
+    def __init__(
+        self,
+        aws_api: AWSApi | None = None,
+        *,
+        config_options: Mapping[str, Any] | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.aws_api = aws_api or AWSApi(config_options=config_options or {})
+        self.concurrency = concurrency
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @property
+    def region(self) -> str:
+        """The AWS region of the clients"""
+        return self.aws_api.region
+
+    async def run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run a blocking function on a worker thread within the concurrency limit"""
+        # a semaphore is bound to one event loop, e.g. per asyncio.run()
+        if (loop := asyncio.get_running_loop()) is not self._loop:
+            self._loop, self._semaphore = loop, asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def get_cache_group_subnets(
+        self, cache_subnet_group_name: str
+    ) -> list[ElasticacheSubnetTypeDef]:
+        """Get the Elasticache subnet group"""
+        return await self.run(
+            self.aws_api.get_cache_group_subnets, cache_subnet_group_name
+        )
+
+    async def get_subnets(self, subnets: Sequence[str]) -> list[EC2SubnetTypeDef]:
+        """Get the subnets"""
+        return await self.run(self.aws_api.get_subnets, subnets)
+
+    async def get_security_groups(
+        self, security_groups: Sequence[str]
+    ) -> list[SecurityGroupTypeDef]:
+        """Get the security groups"""
+        return await self.run(self.aws_api.get_security_groups, security_groups)
+
+    async def get_service_updates(
+        self,
+        replication_group_id: str,
+        status: Sequence[UpdateActionStatusType] | None = None,
+        limit: int | None = None,
+    ) -> list[UpdateActionTypeDef]:
+        """Return the service updates for a replication group ordered by release date (most recent first)."""
+        return await self.run(
+            self.aws_api.get_service_updates, replication_group_id, status, limit
+        )
+
+    async def batch_apply_service_updates(
+        self, replication_group_id: str, service_update_name: str
+    ) -> ProcessedUpdateActionTypeDef:
+        """Apply a service update to a replication group."""
+        return await self.run(
+            self.aws_api.batch_apply_service_updates,
+            replication_group_id,
+            service_update_name,
+        )
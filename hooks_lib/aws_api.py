@@ -1,10 +1,14 @@
+import heapq
 import logging
 import operator
-from collections.abc import Mapping, Sequence
-from typing import TYPE_CHECKING, Any
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from boto3 import Session
-from botocore.config import Config
+from hooks_lib.client_pool import CLIENT_POOL, ClientPool
+from hooks_lib.metrics import METRICS, ApiMetrics
+from hooks_lib.rate_limiter import RATE_LIMITER, RateLimiter
+from hooks_lib.response_cache import RESPONSE_CACHE, ResponseCache
 
 if TYPE_CHECKING:
     from mypy_boto3_ec2.client import EC2Client
@@ -13,7 +17,13 @@ if TYPE_CHECKING:
     from mypy_boto3_elasticache.client import ElastiCacheClient
     from mypy_boto3_elasticache.literals import UpdateActionStatusType
     from mypy_boto3_elasticache.type_defs import (
+        CacheEngineVersionTypeDef,
+        CacheNodeTypeSpecificParameterTypeDef,
+        DescribeUpdateActionsMessagePaginateTypeDef,
+        EventTypeDef,
+        ParameterTypeDef,
         ProcessedUpdateActionTypeDef,
+        UnprocessedUpdateActionTypeDef,
         UpdateActionTypeDef,
     )
     from mypy_boto3_elasticache.type_defs import (
@@ -22,29 +32,100 @@ if TYPE_CHECKING:
 else:
     EC2Client = SecurityGroupTypeDef = EC2SubnetTypeDef = ElastiCacheClient = (
         UpdateActionStatusType
-    ) = ProcessedUpdateActionTypeDef = UpdateActionTypeDef = (
-        ElasticacheSubnetTypeDef
+    ) = CacheEngineVersionTypeDef = DescribeUpdateActionsMessagePaginateTypeDef = (
+        EventTypeDef
+    ) = ProcessedUpdateActionTypeDef = UnprocessedUpdateActionTypeDef = (
+        UpdateActionTypeDef
+    ) = ElasticacheSubnetTypeDef = CacheNodeTypeSpecificParameterTypeDef = (
+        ParameterTypeDef
     ) = object
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# adaptive mode adds botocore's own client-side rate limiting on top of the
+# retries, unless the caller configures retries itself
+DEFAULT_RETRIES = {"mode": "adaptive", "max_attempts": 10}
+
+# describe_update_actions and batch_apply_update_action accept at most 20 replication groups
+MAX_REPLICATION_GROUPS_PER_CALL = 20
+
+
+def chunks(items: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    """Split items into chunks of at most size items."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def most_recent(
+    items: Iterable[T], key: Callable[[T], Any], limit: int | None = None
+) -> list[T]:
+    """Order items by key, most recent first.
+
+    With a limit only the top-k items are kept (heap selection), so the full
+    list is never materialized nor sorted.
+    """
+    if limit is not None:
+        return heapq.nlargest(limit, items, key=key)
+    return sorted(items, key=key, reverse=True)
+
 
 class AWSApi:
     """AWS Api Class"""
 
-    def __init__(self, config_options: Mapping[str, Any]) -> None:
-        self.session = Session()
-        self.config = Config(**config_options)
+    def __init__(
+        self,
+        config_options: Mapping[str, Any],
+        client_pool: ClientPool = CLIENT_POOL,
+        metrics: ApiMetrics = METRICS,
+        rate_limiter: RateLimiter | None = RATE_LIMITER,
+        response_cache: ResponseCache | None = RESPONSE_CACHE,
+    ) -> None:
+        self.config_options = {"retries": DEFAULT_RETRIES, **config_options}
+        self.client_pool = client_pool
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+
+    @property
+    def region(self) -> str:
+        """The AWS region of the clients"""
+        return self.config_options["region_name"]
+
+    @property
+    def account_key(self) -> str:
+        """Identifies the AWS account of the session credentials, stable across runs"""
+        return self.client_pool.account_id(self.region)
+
+    def _instrument(self, client: T) -> T:
+        self.metrics.instrument(client)
+        key = f"{self.account_key}/{self.region}"
+        if self.rate_limiter is not None:
+            self.rate_limiter.instrument(client, key)
+        if self.response_cache is not None:
+            self.response_cache.instrument(client, key)
+        return client
+
+    def _client(self, service_name: str) -> Any:  # noqa: ANN401
+        # clients are shared with AWSApi instances using the same metrics, rate
+        # limiter and response cache only, so opting out of either really does
+        return self.client_pool.client(
+            service_name,
+            self.config_options,
+            instrumentation=(self.metrics, self.rate_limiter, self.response_cache),
+            setup=self._instrument,
+        )
 
     @property
     def client(self) -> ElastiCacheClient:
         """Gets a boto client"""
-        return self.session.client("elasticache", config=self.config)
+        return self._client("elasticache")
 
     @property
     def ec2_client(self) -> EC2Client:
         """Gets a boto client"""
-        return self.session.client("ec2", config=self.config)
+        return self._client("ec2")
 
     def get_cache_group_subnets(
         self, cache_subnet_group_name: str
@@ -73,46 +154,133 @@ class AWSApi:
         )
         return data["SecurityGroups"]
 
+    def iter_replication_group_ids(self) -> Iterator[str]:
+        """Yield the IDs of all replication groups in the region"""
+        paginator = self.client.get_paginator("describe_replication_groups")
+        for page in paginator.paginate():
+            for replication_group in page["ReplicationGroups"]:
+                yield replication_group["ReplicationGroupId"]
+
+    def iter_cache_parameter_group_names(self) -> Iterator[str]:
+        """Yield the names of all cache parameter groups in the region"""
+        paginator = self.client.get_paginator("describe_cache_parameter_groups")
+        for page in paginator.paginate():
+            for parameter_group in page["CacheParameterGroups"]:
+                yield parameter_group["CacheParameterGroupName"]
+
+    def iter_cache_engine_versions(self) -> Iterator[CacheEngineVersionTypeDef]:
+        """Yield all available cache engine versions"""
+        paginator = self.client.get_paginator("describe_cache_engine_versions")
+        for page in paginator.paginate():
+            yield from page["CacheEngineVersions"]
+
+    def iter_engine_default_parameters(
+        self, family: str
+    ) -> Iterator[ParameterTypeDef | CacheNodeTypeSpecificParameterTypeDef]:
+        """Yield the default parameters of a parameter group family"""
+        paginator = self.client.get_paginator("describe_engine_default_parameters")
+        for page in paginator.paginate(CacheParameterGroupFamily=family):
+            yield from page["EngineDefaults"].get("Parameters", [])
+            yield from page["EngineDefaults"].get("CacheNodeTypeSpecificParameters", [])
+
+    def iter_service_updates(
+        self,
+        replication_group_id: str,
+        status: Sequence[UpdateActionStatusType] | None = None,
+    ) -> Iterator[UpdateActionTypeDef]:
+        """Yield the service updates for a replication group page by page (unordered).
+
+        The status filter is applied server-side; stop iterating to stop paginating.
+        """
+        return self.iter_update_actions([replication_group_id], status=status)
+
+    def iter_update_actions(
+        self,
+        replication_group_ids: Sequence[str],
+        status: Sequence[UpdateActionStatusType] | None = None,
+    ) -> Iterator[UpdateActionTypeDef]:
+        """Yield the service updates for many replication groups (unordered).
+
+        The replication groups are queried in chunks of MAX_REPLICATION_GROUPS_PER_CALL.
+        """
+        paginator = self.client.get_paginator("describe_update_actions")
+        for chunk in chunks(replication_group_ids, MAX_REPLICATION_GROUPS_PER_CALL):
+            params: DescribeUpdateActionsMessagePaginateTypeDef = {
+                "ReplicationGroupIds": list(chunk),
+                "ServiceUpdateStatus": ["available"],
+            }
+            if status:
+                params["UpdateActionStatus"] = list(status)
+            for page in paginator.paginate(**params):
+                yield from page["UpdateActions"]
+
     def get_service_updates(
         self,
         replication_group_id: str,
         status: Sequence[UpdateActionStatusType] | None = None,
+        limit: int | None = None,
     ) -> list[UpdateActionTypeDef]:
         """Return a list of service updates for a replication group ordered by release date (most recent first)."""
-        data = self.client.describe_update_actions(
-            ReplicationGroupIds=[replication_group_id],
-            ServiceUpdateStatus=["available"],
-        )
-        return sorted(
-            [
-                i
-                for i in data["UpdateActions"]
-                # Filter out updates that are not in the desired status
-                if not status or i["UpdateActionStatus"] in status
-            ],
+        return most_recent(
+            self.iter_service_updates(replication_group_id, status=status),
             key=operator.itemgetter("ServiceUpdateReleaseDate"),
-            reverse=True,
+            limit=limit,
         )
 
+    def iter_events(
+        self, replication_group_id: str, start_time: datetime
+    ) -> Iterator[EventTypeDef]:
+        """Yield the events of a replication group since start_time (oldest first)."""
+        paginator = self.client.get_paginator("describe_events")
+        events: list[EventTypeDef] = []
+        for page in paginator.paginate(
+            SourceIdentifier=replication_group_id,
+            SourceType="replication-group",
+            StartTime=start_time,
+        ):
+            events.extend(page["Events"])
+        # describe_events returns the most recent events first
+        yield from reversed(events)
+
+    def batch_apply_update_action(
+        self, replication_group_ids: Sequence[str], service_update_name: str
+    ) -> tuple[
+        list[ProcessedUpdateActionTypeDef], list[UnprocessedUpdateActionTypeDef]
+    ]:
+        """Apply a service update to many replication groups.
+
+        The replication groups are sent in chunks of MAX_REPLICATION_GROUPS_PER_CALL.
+        Returns the processed and unprocessed update actions of all chunks.
+        """
+        processed: list[ProcessedUpdateActionTypeDef] = []
+        unprocessed: list[UnprocessedUpdateActionTypeDef] = []
+        for chunk in chunks(replication_group_ids, MAX_REPLICATION_GROUPS_PER_CALL):
+            data = self.client.batch_apply_update_action(
+                ReplicationGroupIds=list(chunk),
+                ServiceUpdateName=service_update_name,
+            )
+            processed.extend(data["ProcessedUpdateActions"])
+            unprocessed.extend(data["UnprocessedUpdateActions"])
+        return processed, unprocessed
+
     def batch_apply_service_updates(
         self, replication_group_id: str, service_update_name: str
     ) -> ProcessedUpdateActionTypeDef:
         """Apply a service update to a replication group."""
-        data = self.client.batch_apply_update_action(
-            ReplicationGroupIds=[replication_group_id],
-            ServiceUpdateName=service_update_name,
+        processed, unprocessed = self.batch_apply_update_action(
+            [replication_group_id], service_update_name
         )
-        if data["UnprocessedUpdateActions"]:
-            for uaction in data["UnprocessedUpdateActions"]:
+        if unprocessed:
+            for uaction in unprocessed:
                 logger.error(uaction)
             raise ValueError("Failed to apply service update")
 
-        if not data["ProcessedUpdateActions"]:
+        if not processed:
             raise ValueError("Failed to apply service update")
 
-        if len(data["ProcessedUpdateActions"]) != 1:
-            for action in data["ProcessedUpdateActions"]:
+        if len(processed) != 1:
+            for action in processed:
                 logger.error(action)
             raise ValueError("Something went wrong: Multiple service updates applied")
 
-        return data["ProcessedUpdateActions"][0]
+        return processed[0]
@@ -0,0 +1,136 @@
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from enum import StrEnum
+from pathlib import Path
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+from hooks_lib.service_updates import ServiceUpdatesManager
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointSettings(BaseSettings):
+    """Environment Variables."""
+
+    # must survive between runs (e.g. a mounted volume) for asynchronous updates
+    service_update_checkpoint_dir: Path = Field(
+        Path("tmp/checkpoints"), alias="SERVICE_UPDATE_CHECKPOINT_DIR"
+    )
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """A service update started by post_apply without waiting for it"""
+
+    replication_group_id: str
+    region: str
+    service_update: str
+    started_at: datetime
+
+
+class CheckpointStatus(StrEnum):
+    """Outcome of a checkpointed service update"""
+
+    IN_PROGRESS = "in-progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# update action status -> checkpoint status, anything else is a failure
+UPDATE_ACTION_STATUSES = {
+    "waiting-to-start": CheckpointStatus.IN_PROGRESS,
+    "in-progress": CheckpointStatus.IN_PROGRESS,
+    "scheduling": CheckpointStatus.IN_PROGRESS,
+    "stopping": CheckpointStatus.IN_PROGRESS,
+    "complete": CheckpointStatus.COMPLETED,
+    # superseded or no longer relevant for the replication group
+    "not-applicable": CheckpointStatus.COMPLETED,
+}
+
+
+class CheckpointStore:
+    """One checkpoint file per replication group in a directory"""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    @classmethod
+    def from_env(cls) -> "CheckpointStore":
+        """The store in SERVICE_UPDATE_CHECKPOINT_DIR"""
+        return cls(CheckpointSettings().service_update_checkpoint_dir)
+
+    def _path(self, region: str, replication_group_id: str) -> Path:
+        return self.directory / f"{region}--{replication_group_id}.json"
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        """Write a checkpoint, replacing the previous one of the replication group"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(checkpoint.region, checkpoint.replication_group_id)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(
+            json.dumps(
+                asdict(checkpoint) | {"started_at": checkpoint.started_at.isoformat()}
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+
+    def load(self, region: str, replication_group_id: str) -> Checkpoint | None:
+        """The checkpoint of a replication group, if there is one"""
+        path = self._path(region, replication_group_id)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return Checkpoint(
+            **data | {"started_at": datetime.fromisoformat(data["started_at"])}
+        )
+
+    def delete(self, region: str, replication_group_id: str) -> None:
+        """Remove the checkpoint of a replication group"""
+        self._path(region, replication_group_id).unlink(missing_ok=True)
+
+
+def resolve_checkpoint(
+    manager: ServiceUpdatesManager, store: CheckpointStore
+) -> CheckpointStatus | None:
+    """Report the outcome of a checkpointed service update of the manager's replication group.
+
+    Finished updates (completed or failed) are reported once and their checkpoint
+    is removed; None means there is no checkpoint.
+    """
+    checkpoint = store.load(manager.region, manager.replication_group_id)
+    if checkpoint is None:
+        return None
+
+    action_status = manager.update_action_status(checkpoint.service_update)
+    status = UPDATE_ACTION_STATUSES.get(action_status or "", CheckpointStatus.FAILED)
+    elapsed = datetime.now(tz=UTC) - checkpoint.started_at
+    if status == CheckpointStatus.IN_PROGRESS:
+        logger.info(
+            f"Service update {checkpoint.service_update} started at "
+            f"{checkpoint.started_at:%Y-%m-%d %H:%M:%S} is still in progress "
+            f"({elapsed.total_seconds() // 60:.0f}m)"
+        )
+        return status
+
+    for event in manager.aws_api.iter_events(
+        manager.replication_group_id, checkpoint.started_at
+    ):
+        logger.info(f"{event['Date']:%Y-%m-%d %H:%M:%S} {event.get('Message')}")
+    if status == CheckpointStatus.COMPLETED:
+        logger.info(
+            f"Service update {checkpoint.service_update} completed "
+            f"(update action status {action_status})"
+        )
+    else:
+        logger.error(
+            f"Service update {checkpoint.service_update} failed "
+            f"(update action status {action_status or 'unknown'})"
+        )
+    store.delete(checkpoint.region, checkpoint.replication_group_id)
+    return status
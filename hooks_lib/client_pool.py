@@ -0,0 +1,132 @@
+import copy
+import logging
+import threading
+from collections.abc import Callable, Hashable, Mapping
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from boto3 import Session
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Hashable:  # noqa: ANN401
+    """Turn (nested) config options into a hashable pool key."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list | tuple | set | frozenset):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class ClientPool:
+    """Thread-safe pool of boto3 clients.
+
+    All clients share one boto3/botocore session, and with it the service model
+    loader, endpoint resolver and credential chain. Clients are created once per
+    (service, region, config, instrumentation) and reused afterwards; botocore
+    clients themselves are thread-safe, only their creation is not. Event hooks
+    registered on a client apply to every user of it, so users with different
+    hooks pass different instrumentation keys and get their own clients.
+
+    boto3 is imported on first use only, so hooks that never talk to AWS do not
+    pay its import cost.
+    """
+
+    def __init__(self, session: "Session | None" = None) -> None:
+        # reentrant: the setup of a new client may ask for the session
+        self._lock = threading.RLock()
+        # a preconfigured session, e.g. with static credentials or event handlers
+        self._initial_session = session
+        self._session = session
+        self._account_id: str | None = None
+        self._clients: dict[Hashable, Any] = {}
+
+    @property
+    def session(self) -> "Session":
+        """The shared boto3 session, created on first use."""
+        with self._lock:
+            return self._get_session()
+
+    def _get_session(self) -> "Session":
+        if self._session is None:
+            from boto3 import Session  # noqa: PLC0415
+
+            self._session = Session()
+        return self._session
+
+    def account_id(self, region_name: str | None = None) -> str:
+        """The AWS account of the session credentials, resolved once per session.
+
+        Static credentials with an account ID and a profile with a role_arn name
+        the account without an API call; refreshable credentials are not read,
+        as that may refresh them. Otherwise sts:GetCallerIdentity is called once.
+        """
+        with self._lock:
+            if self._account_id is None:
+                self._account_id = self._resolve_account_id(region_name)
+            return self._account_id
+
+    def _resolve_account_id(self, region_name: str | None) -> str:
+        from botocore.credentials import RefreshableCredentials  # noqa: PLC0415
+
+        session = self._get_session()
+        if (credentials := session.get_credentials()) is None:
+            return "anonymous"
+        if not isinstance(credentials, RefreshableCredentials) and (
+            account_id := getattr(credentials, "account_id", None)
+        ):
+            return account_id
+        # arn:aws:iam::123456789012:role/name
+        role_arn = session._session.get_scoped_config().get("role_arn", "")  # noqa: SLF001
+        if len(parts := role_arn.split(":")) > 4 and parts[4]:  # noqa: PLR2004
+            return parts[4]
+        logger.debug("Resolving the AWS account with sts:GetCallerIdentity")
+        sts = session.client("sts", region_name=region_name)
+        return sts.get_caller_identity()["Account"]
+
+    def client(
+        self,
+        service_name: str,
+        config_options: Mapping[str, Any],
+        *,
+        instrumentation: Hashable = None,
+        setup: Callable[[Any], object] | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Return a pooled client for the given service, config options and instrumentation.
+
+        setup is called once with a new client, e.g. to register event hooks; the
+        hooks must be the same for every caller passing the same instrumentation.
+        """
+        key = (service_name, _freeze(config_options), instrumentation)
+        if (client := self._clients.get(key)) is not None:
+            return client
+
+        with self._lock:
+            # another thread may have created it while we waited for the lock
+            if (client := self._clients.get(key)) is None:
+                from botocore.config import Config  # noqa: PLC0415
+
+                logger.debug(f"Creating {service_name} client {config_options}")
+                # botocore rewrites the retries options in place
+                client = self._get_session().client(
+                    service_name, config=Config(**copy.deepcopy(dict(config_options)))
+                )
+                if setup is not None:
+                    setup(client)
+                self._clients[key] = client
+            return client
+
+    def clear(self) -> None:
+        """Drop all pooled clients and the shared session (unless it was passed in)."""
+        with self._lock:
+            self._clients.clear()
+            self._session = self._initial_session
+            self._account_id = None
+
+    def __len__(self) -> int:
+        """Number of pooled clients"""
+        return len(self._clients)
+
+
+CLIENT_POOL = ClientPool()
@@ -0,0 +1,47 @@
+"""Refresh the engine catalog shipped with the module.
+
+Usage: python -m hooks_lib.engine_catalog [--region REGION] [--output FILE]
+"""
+
+import argparse
+import logging
+from datetime import UTC, datetime
+from pathlib import Path
+
+from er_aws_elasticache.engine_catalog import CATALOG_FILE, EngineCatalog, EngineVersion
+from hooks_lib.aws_api import AWSApi
+
+logger = logging.getLogger(__name__)
+
+
+def build_engine_catalog(aws_api: AWSApi) -> EngineCatalog:
+    """Build an engine catalog from describe_cache_engine_versions"""
+    return EngineCatalog(
+        engine_versions=(
+            EngineVersion(
+                engine=v["Engine"],
+                version=v["EngineVersion"],
+                family=v["CacheParameterGroupFamily"],
+            )
+            for v in aws_api.iter_cache_engine_versions()
+        ),
+        generated_at=datetime.now(tz=UTC),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--region", default="us-east-1")
+    parser.add_argument("--output", type=Path, default=CATALOG_FILE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    catalog = build_engine_catalog(AWSApi(config_options={"region_name": args.region}))
+    catalog.dump(args.output)
+    logger.info(
+        f"Wrote {len(catalog.engine_versions)} engine versions to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import logging
+import threading
+from collections.abc import Callable, Iterable
+
+from hooks_lib.aws_api import AWSApi
+
+logger = logging.getLogger(__name__)
+
+
+class ExistenceIndex:
+    """Region-wide index of existing replication groups and parameter groups.
+
+    Each kind of resource is listed once, on first use, with paginated list calls;
+    membership queries are answered from in-memory sets afterwards. The index is
+    thread-safe and meant to be shared by all validations of an account and region
+    (see ExistenceIndexRegistry).
+    """
+
+    def __init__(self, aws_api: AWSApi) -> None:
+        self.aws_api = aws_api
+        self._lock = threading.Lock()
+        self._replication_group_ids: frozenset[str] | None = None
+        self._parameter_group_names: frozenset[str] | None = None
+
+    def _build(self, kind: str, items: Callable[[], Iterable[str]]) -> frozenset[str]:
+        index = frozenset(i.lower() for i in items())
+        logger.debug(f"Indexed {len(index)} {kind} in {self.aws_api.region}")
+        return index
+
+    @property
+    def replication_group_ids(self) -> frozenset[str]:
+        """All replication group IDs (lower case)"""
+        with self._lock:
+            if self._replication_group_ids is None:
+                self._replication_group_ids = self._build(
+                    "replication groups", self.aws_api.iter_replication_group_ids
+                )
+            return self._replication_group_ids
+
+    @property
+    def parameter_group_names(self) -> frozenset[str]:
+        """All cache parameter group names (lower case)"""
+        with self._lock:
+            if self._parameter_group_names is None:
+                self._parameter_group_names = self._build(
+                    "parameter groups", self.aws_api.iter_cache_parameter_group_names
+                )
+            return self._parameter_group_names
+
+    def replication_group_exists(self, replication_group_id: str) -> bool:
+        """Check if a replication group exists. ElastiCache IDs are case-insensitive."""
+        return replication_group_id.lower() in self.replication_group_ids
+
+    def parameter_group_exists(self, name: str) -> bool:
+        """Check if a cache parameter group exists. ElastiCache names are case-insensitive."""
+        return name.lower() in self.parameter_group_names
+
+
+class ExistenceIndexRegistry:
+    """Process-wide ExistenceIndex per AWS account and region"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indexes: dict[tuple[str, str], ExistenceIndex] = {}
+
+    def get(self, aws_api: AWSApi) -> ExistenceIndex:
+        """Get the shared index for the account and region of aws_api"""
+        key = (aws_api.account_key, aws_api.region)
+        with self._lock:
+            if key not in self._indexes:
+                self._indexes[key] = ExistenceIndex(aws_api)
+            return self._indexes[key]
+
+    def clear(self) -> None:
+        """Forget all indexes"""
+        with self._lock:
+            self._indexes.clear()
+
+
+EXISTENCE_INDEXES = ExistenceIndexRegistry()
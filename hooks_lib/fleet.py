@@ -0,0 +1,389 @@
+"""Apply service updates to a fleet of replication groups.
+
+Usage: python -m hooks_lib.fleet --state FILE [--apply] [--region-concurrency N]
+                                 [--environment-concurrency ENV=N ...] [PATH ...]
+
+PATH is an app-interface input file, a JSON-lines file or a directory of both (see
+validate-inputs). Every replication group gets its most recent eligible service
+update, following the service_updates_* settings of its input like the post_apply
+hook. Progress is recorded in the state file; running again resumes where the last
+run stopped. Without --apply the eligible updates are only reported.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from er_aws_elasticache.validate import iter_inputs
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.service_updates import ServiceUpdatesManager, released_before
+from hooks_lib.waiter import WaiterConfig
+
+logger = logging.getLogger(__name__)
+
+STATE_SCHEMA_VERSION = 1
+
+
+class TargetStatus(StrEnum):
+    """Progress of a replication group"""
+
+    PENDING = "pending"
+    APPLYING = "applying"
+    COMPLETED = "completed"
+    UP_TO_DATE = "up-to-date"
+    AVAILABLE = "available"
+    DISABLED = "disabled"
+    FAILED = "failed"
+
+
+# nothing left to do for these, a resumed run skips them
+DONE_STATUSES = {TargetStatus.COMPLETED, TargetStatus.UP_TO_DATE}
+
+
+@dataclass(frozen=True)
+class FleetTarget:
+    """A replication group and its service update settings"""
+
+    replication_group_id: str
+    region: str
+    environment: str
+    service_updates_types: tuple[str, ...]
+    severities: tuple[str, ...]
+    cooldown_days: int | None = None
+    service_updates_enabled: bool = True
+
+    @property
+    def key(self) -> str:
+        """Unique key of the target"""
+        return f"{self.region}/{self.replication_group_id}"
+
+    @classmethod
+    def from_input(cls, app_interface_input: AppInterfaceInput) -> "FleetTarget":
+        """The target of an app-interface input"""
+        data = app_interface_input.data
+        return cls(
+            replication_group_id=data.replication_group_id,
+            region=data.region,
+            environment=data.environment.lower().strip(),
+            service_updates_types=tuple(data.service_updates_types),
+            severities=tuple(data.service_updates_severities),
+            cooldown_days=data.service_updates_cooldown_days,
+            service_updates_enabled=data.service_updates_enabled,
+        )
+
+
+@dataclass
+class TargetState:
+    """Recorded progress of a target"""
+
+    status: TargetStatus = TargetStatus.PENDING
+    service_update: str | None = None
+    error: str | None = None
+    attempts: int = 0
+    updated_at: str | None = None
+
+
+class FleetStateStore:
+    """Progress of all targets, persisted to a JSON file after every change.
+
+    The file is replaced atomically, so an interrupted run leaves a consistent state
+    behind. Without a path the state is kept in memory only.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.states: dict[str, TargetState] = {}
+        if path is not None and path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data["schema_version"] != STATE_SCHEMA_VERSION:
+                raise ValueError(
+                    f"Unsupported fleet state schema version {data['schema_version']}"
+                )
+            self.states = {
+                key: TargetState(**{**state, "status": TargetStatus(state["status"])})
+                for key, state in data["targets"].items()
+            }
+
+    def get(self, key: str) -> TargetState:
+        """The state of a target"""
+        with self._lock:
+            return self.states.get(key, TargetState())
+
+    def update(self, key: str, **changes: Any) -> TargetState:  # noqa: ANN401
+        """Change the state of a target and persist it"""
+        with self._lock:
+            state = self.states.setdefault(key, TargetState())
+            for name, value in changes.items():
+                setattr(state, name, value)
+            state.updated_at = datetime.now(tz=UTC).isoformat()
+            self._save()
+            return state
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "schema_version": STATE_SCHEMA_VERSION,
+                    "targets": {k: asdict(s) for k, s in self.states.items()},
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+
+    def summary(self) -> Counter[str]:
+        """Number of targets per status"""
+        with self._lock:
+            return Counter(s.status.value for s in self.states.values())
+
+
+@dataclass(frozen=True)
+class FleetConfig:
+    """Fleet orchestrator settings.
+
+    Attributes:
+        region_concurrency: Replication groups updated at once per region.
+        environment_concurrency: Replication groups updated at once per environment
+            name; environments not listed use default_environment_concurrency.
+        default_environment_concurrency: See environment_concurrency.
+        apply: Apply the updates; otherwise only record the available ones.
+        wait_for_completion: Wait for every update to complete before starting the
+            next one in its slot; otherwise the slot is freed once the update started.
+        waiter_config: Polling behaviour while waiting for an update.
+    """
+
+    region_concurrency: int = 5
+    environment_concurrency: Mapping[str, int] = field(default_factory=dict)
+    default_environment_concurrency: int = 10
+    apply: bool = False
+    wait_for_completion: bool = True
+    waiter_config: WaiterConfig | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the concurrency limits"""
+        limits = [
+            self.region_concurrency,
+            self.default_environment_concurrency,
+            *self.environment_concurrency.values(),
+        ]
+        if min(limits) < 1:
+            raise ValueError("Fleet concurrency limits must be at least 1")
+
+
+class FleetOrchestrator:
+    """Apply the eligible service updates to many replication groups.
+
+    Targets are started in the given order as soon as their region and environment
+    have a free slot; a failing target is recorded and does not stop the others.
+    """
+
+    def __init__(
+        self,
+        config: FleetConfig,
+        state: FleetStateStore | None = None,
+        aws_api_factory: Callable[[str], AWSApi] | None = None,
+    ) -> None:
+        self.config = config
+        self.state = state or FleetStateStore()
+        self._aws_api_factory = aws_api_factory or (
+            lambda region: AWSApi(config_options={"region_name": region})
+        )
+        self._aws_apis: dict[str, AWSApi] = {}
+        self._lock = threading.Lock()
+
+    def aws_api(self, region: str) -> AWSApi:
+        """The AWS API of a region, shared by all its targets"""
+        with self._lock:
+            if region not in self._aws_apis:
+                self._aws_apis[region] = self._aws_api_factory(region)
+            return self._aws_apis[region]
+
+    def _environment_concurrency(self, environment: str) -> int:
+        return self.config.environment_concurrency.get(
+            environment, self.config.default_environment_concurrency
+        )
+
+    def _has_slot(self, target: FleetTarget, running: Iterable[FleetTarget]) -> bool:
+        running = list(running)
+        in_region = sum(t.region == target.region for t in running)
+        in_environment = sum(t.environment == target.environment for t in running)
+        return in_region < self.config.region_concurrency and (
+            in_environment < self._environment_concurrency(target.environment)
+        )
+
+    def process(self, target: FleetTarget) -> TargetState:
+        """Apply the most recent eligible service update to a target."""
+        if not target.service_updates_enabled:
+            # like the post_apply hook; not done, the input may enable them again
+            return self.state.update(
+                target.key,
+                status=TargetStatus.DISABLED,
+                service_update=None,
+                error=None,
+            )
+        return self._apply(target)
+
+    def _apply(self, target: FleetTarget) -> TargetState:
+        attempts = self.state.get(target.key).attempts + 1
+        try:
+            manager = ServiceUpdatesManager(
+                target.replication_group_id,
+                target.region,
+                aws_api=self.aws_api(target.region),
+            )
+            if manager.update_in_progress:
+                # e.g. started by an interrupted run or by the post_apply hook
+                if not (self.config.apply and self.config.wait_for_completion):
+                    return self.state.update(
+                        target.key, status=TargetStatus.APPLYING, attempts=attempts
+                    )
+                logger.info(f"{target.key}: waiting for the update in progress")
+                manager.wait_for_completion(self.config.waiter_config)
+
+            updates = manager.service_updates(
+                service_updates_types=target.service_updates_types,
+                severities=target.severities,
+                released_before=released_before(
+                    target.cooldown_days, target.environment
+                ),
+                limit=1,
+            )
+            if not updates:
+                return self.state.update(
+                    target.key,
+                    status=TargetStatus.UP_TO_DATE,
+                    service_update=None,
+                    error=None,
+                    attempts=attempts,
+                )
+            if not self.config.apply:
+                return self.state.update(
+                    target.key,
+                    status=TargetStatus.AVAILABLE,
+                    service_update=updates[0].name,
+                    attempts=attempts,
+                )
+
+            logger.info(f"{target.key}: applying service update {updates[0].name}")
+            self.state.update(
+                target.key,
+                status=TargetStatus.APPLYING,
+                service_update=updates[0].name,
+                error=None,
+                attempts=attempts,
+            )
+            manager.apply_service_update(
+                updates[0],
+                wait_for_completion=self.config.wait_for_completion,
+                waiter_config=self.config.waiter_config,
+            )
+            if not self.config.wait_for_completion:
+                return self.state.get(target.key)
+            return self.state.update(target.key, status=TargetStatus.COMPLETED)
+        except Exception as e:
+            logger.exception(f"{target.key}: service update failed")
+            return self.state.update(
+                target.key, status=TargetStatus.FAILED, error=str(e), attempts=attempts
+            )
+
+    def run(self, targets: Sequence[FleetTarget]) -> dict[str, TargetState]:
+        """Process all targets that are not done yet and return their states."""
+        pending = [
+            t
+            for t in dict.fromkeys(targets)
+            if self.state.get(t.key).status not in DONE_STATUSES
+        ]
+        skipped = len(targets) - len(pending)
+        if skipped:
+            logger.info(f"Skipping {skipped} replication groups done in a previous run")
+
+        running: dict[Future[TargetState], FleetTarget] = {}
+        max_workers = max(1, min(len(pending), 64))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                for target in list(pending):
+                    if self._has_slot(target, running.values()):
+                        pending.remove(target)
+                        running[executor.submit(self.process, target)] = target
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+        return {t.key: self.state.get(t.key) for t in targets}
+
+
+def _concurrency(value: str) -> tuple[str, int]:
+    environment, _, limit = value.partition("=")
+    return environment.lower().strip(), int(limit)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("paths", nargs="*", metavar="PATH")
+    parser.add_argument("--state", type=Path, required=True, help="state file")
+    parser.add_argument("--apply", action="store_true", help="apply the updates")
+    parser.add_argument(
+        "--no-wait", action="store_true", help="do not wait for updates"
+    )
+    parser.add_argument("--region-concurrency", type=int, default=5)
+    parser.add_argument(
+        "--environment-concurrency",
+        type=_concurrency,
+        action="append",
+        default=[],
+        metavar="ENV=N",
+    )
+    parser.add_argument("--default-environment-concurrency", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    targets = [
+        FleetTarget.from_input(
+            AppInterfaceInput.model_validate_json(
+                source.text
+                if source.text is not None
+                else Path(source.source).read_bytes()
+            )
+        )
+        for source in iter_inputs(args.paths, sys.stdin)
+    ]
+    orchestrator = FleetOrchestrator(
+        FleetConfig(
+            region_concurrency=args.region_concurrency,
+            environment_concurrency=dict(args.environment_concurrency),
+            default_environment_concurrency=args.default_environment_concurrency,
+            apply=args.apply,
+            wait_for_completion=not args.no_wait,
+        ),
+        FleetStateStore(args.state),
+    )
+    states = orchestrator.run(targets)
+    for key, state in states.items():
+        logger.info(
+            f"{key}: {state.status} {state.service_update or ''} {state.error or ''}".rstrip()
+        )
+    logger.info(f"Fleet summary: {dict(orchestrator.state.summary())}")
+    if any(s.status == TargetStatus.FAILED for s in states.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+from hooks_lib.response_cache import CACHE_HIT
+
+logger = logging.getLogger(__name__)
+
+# Prometheus' default buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+THROTTLING_ERROR_CODES = frozenset({
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "TransactionInProgressException",
+    "RequestLimitExceeded",
+    "BandwidthLimitExceeded",
+    "LimitExceededException",
+    "RequestThrottled",
+    "SlowDown",
+    "PriorRequestNotComplete",
+    "EC2ThrottledException",
+})
+METRIC_PREFIX = "er_aws_elasticache_aws_api"
+# the botocore request context key of the call start time
+_START = "er_aws_elasticache_metrics_start"
+
+
+class MetricsSettings(BaseSettings):
+    """Environment Variables."""
+
+    # write <hook>.json and <hook>.prom into this directory at hook exit
+    metrics_dir: Path | None = Field(None, alias="METRICS_DIR")
+
+
+@dataclass
+class OperationMetrics:
+    """Counters of one AWS API operation.
+
+    Attributes:
+        calls: API calls, including failed ones; retries are not extra calls.
+        cache_hits: Calls answered from the response cache, not part of calls.
+        errors: Calls that finally failed.
+        retries: Retried attempts.
+        throttles: Attempts rejected with a throttling error.
+        seconds: Total duration of all calls, retries included.
+        buckets: Number of calls per latency bucket (LATENCY_BUCKETS and +Inf, not cumulative).
+    """
+
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    retries: int = 0
+    throttles: int = 0
+    seconds: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def observe(self, seconds: float) -> None:
+        """Record the duration of one call"""
+        self.calls += 1
+        self.seconds += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+
+class ApiMetrics:
+    """Per-operation AWS API call metrics, collected with botocore event hooks.
+
+    instrument() registers the hooks on a client; a client is instrumented once, no
+    matter how often it is passed in. The metrics are thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._instrumented: weakref.WeakSet[Any] = weakref.WeakSet()
+        self.operations: dict[tuple[str, str], OperationMetrics] = {}
+
+    def instrument(self, client: Any) -> Any:  # noqa: ANN401
+        """Register the metric hooks on a botocore client and return it."""
+        if client in self._instrumented:
+            return client
+        with self._lock:
+            if client not in self._instrumented:
+                events = client.meta.events
+                events.register("before-call", self._before_call)
+                events.register("after-call", self._after_call)
+                events.register("after-call-error", self._after_call_error)
+                events.register("needs-retry", self._needs_retry)
+                self._instrumented.add(client)
+        return client
+
+    def _operation(self, event_name: str) -> OperationMetrics:
+        # <event>.<service>.<operation>, the caller holds the lock
+        _, service, operation = event_name.split(".", 2)
+        return self.operations.setdefault((service, operation), OperationMetrics())
+
+    @staticmethod
+    def _before_call(context: dict[str, Any], **_: object) -> None:
+        context[_START] = time.perf_counter()
+
+    def _after_call(
+        self,
+        parsed: Mapping[str, Any],
+        context: Mapping[str, Any],
+        event_name: str,
+        **_: object,
+    ) -> None:
+        seconds = time.perf_counter() - context.get(_START, time.perf_counter())
+        with self._lock:
+            metrics = self._operation(event_name)
+            if context.get(CACHE_HIT):
+                metrics.cache_hits += 1
+                return
+            metrics.observe(seconds)
+            metrics.retries += parsed.get("ResponseMetadata", {}).get(
+                "RetryAttempts", 0
+            )
+            if "Error" in parsed:
+                metrics.errors += 1
+
+    def _after_call_error(
+        self, context: Mapping[str, Any], event_name: str, **_: object
+    ) -> None:
+        # connection errors and the like, there is no parsed response
+        seconds = time.perf_counter() - context.get(_START, time.perf_counter())
+        with self._lock:
+            metrics = self._operation(event_name)
+            metrics.observe(seconds)
+            metrics.errors += 1
+
+    def _needs_retry(
+        self,
+        response: tuple[Any, Mapping[str, Any]] | None,
+        event_name: str,
+        **_: object,
+    ) -> None:
+        # called after every attempt; never decides about the retry itself
+        if response is None:
+            return
+        if response[1].get("Error", {}).get("Code") in THROTTLING_ERROR_CODES:
+            with self._lock:
+                self._operation(event_name).throttles += 1
+
+    def reset(self) -> None:
+        """Drop all collected metrics"""
+        with self._lock:
+            self.operations.clear()
+
+    def report(self) -> dict[str, Any]:
+        """The metrics as a JSON serializable dict"""
+        with self._lock:
+            operations = [
+                {
+                    "service": service,
+                    "operation": operation,
+                    "calls": m.calls,
+                    "cache_hits": m.cache_hits,
+                    "errors": m.errors,
+                    "retries": m.retries,
+                    "throttles": m.throttles,
+                    "seconds": round(m.seconds, 6),
+                    "latency_buckets": {
+                        str(bound): count
+                        for bound, count in zip(
+                            [*LATENCY_BUCKETS, "+Inf"], m.buckets, strict=True
+                        )
+                    },
+                }
+                for (service, operation), m in sorted(self.operations.items())
+            ]
+            calls = sum(m.calls for m in self.operations.values())
+            seconds = sum(m.seconds for m in self.operations.values())
+        return {"calls": calls, "seconds": round(seconds, 6), "operations": operations}
+
+    def prometheus(self, labels: Mapping[str, str] | None = None) -> str:
+        """The metrics in the Prometheus text exposition format"""
+
+        def _labels(**extra: str) -> str:
+            items = {**(labels or {}), **extra}
+            return ",".join(f'{k}="{v}"' for k, v in items.items())
+
+        counters = {
+            "calls": "AWS API calls",
+            "cache_hits": "AWS API calls answered from the response cache",
+            "errors": "AWS API calls that failed",
+            "retries": "Retried AWS API call attempts",
+            "throttles": "AWS API call attempts rejected by throttling",
+        }
+        with self._lock:
+            operations = sorted(self.operations.items())
+            lines = []
+            for name, help_text in counters.items():
+                lines += [
+                    f"# HELP {METRIC_PREFIX}_{name}_total {help_text}",
+                    f"# TYPE {METRIC_PREFIX}_{name}_total counter",
+                ]
+                lines += [
+                    f"{METRIC_PREFIX}_{name}_total"
+                    f"{{{_labels(service=service, operation=operation)}}} "
+                    f"{getattr(m, name)}"
+                    for (service, operation), m in operations
+                ]
+
+            histogram = f"{METRIC_PREFIX}_call_duration_seconds"
+            lines += [
+                f"# HELP {histogram} AWS API call duration, retries included",
+                f"# TYPE {histogram} histogram",
+            ]
+            for (service, operation), m in operations:
+                cumulative = 0
+                for bound, count in zip(
+                    [*LATENCY_BUCKETS, "+Inf"], m.buckets, strict=True
+                ):
+                    cumulative += count
+                    lines.append(
+                        f"{histogram}_bucket"
+                        f"{{{_labels(service=service, operation=operation, le=str(bound))}}} "
+                        f"{cumulative}"
+                    )
+                lines += [
+                    f"{histogram}_sum{{{_labels(service=service, operation=operation)}}} "
+                    f"{m.seconds}",
+                    f"{histogram}_count{{{_labels(service=service, operation=operation)}}} "
+                    f"{m.calls}",
+                ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Path, hook: str) -> None:
+        """Write <hook>.json and <hook>.prom (a node exporter textfile) to directory.
+
+        Files are replaced atomically, a collector never reads a partial file.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        for path, content in (
+            (directory / f"{hook}.json", json.dumps(self.report(), indent=2) + "\n"),
+            (directory / f"{hook}.prom", self.prometheus({"hook": hook})),
+        ):
+            tmp = path.with_name(f".{path.name}.{os.getpid()}")
+            tmp.write_text(content, encoding="utf-8")
+            tmp.replace(path)
+        logger.info(f"AWS API metrics written to {directory}")
+
+
+METRICS = ApiMetrics()
+
+
+def emit_at_exit(hook: str, metrics: ApiMetrics = METRICS) -> None:
+    """Write the metrics of this process when it exits, if METRICS_DIR is set."""
+    if (directory := MetricsSettings().metrics_dir) is None:
+        return
+    atexit.register(metrics.write, directory, hook)
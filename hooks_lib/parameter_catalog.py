@@ -0,0 +1,103 @@
+"""Create or refresh the parameter catalogs shipped with the module.
+
+Usage: python -m hooks_lib.parameter_catalog [--region REGION] [--output-dir DIR] [FAMILY ...]
+
+Without families, the catalogs of all families of the engine catalog are written.
+"""
+
+import argparse
+import logging
+from datetime import UTC, datetime
+from pathlib import Path
+
+from er_aws_elasticache.engine_catalog import default_engine_catalog
+from er_aws_elasticache.parameter_catalog import (
+    CATALOG_DIR,
+    ParameterCatalog,
+    ParameterCatalogSettings,
+    ParameterSpec,
+    default_parameter_catalog,
+)
+from hooks_lib.aws_api import AWSApi
+
+logger = logging.getLogger(__name__)
+
+
+def build_parameter_catalog(aws_api: AWSApi, family: str) -> ParameterCatalog:
+    """Build the parameter catalog of a family from describe_engine_default_parameters"""
+    return ParameterCatalog(
+        family=family,
+        parameters=(
+            ParameterSpec(
+                name=p["ParameterName"],
+                data_type=p.get("DataType", "string"),
+                allowed_values=p.get("AllowedValues") or None,
+                is_modifiable=p.get("IsModifiable", True),
+                change_type=p.get("ChangeType"),
+                minimum_engine_version=p.get("MinimumEngineVersion"),
+            )
+            for p in aws_api.iter_engine_default_parameters(family)
+            if "ParameterName" in p
+        ),
+        generated_at=datetime.now(tz=UTC),
+    )
+
+
+def load_parameter_catalog(
+    aws_api: AWSApi, family: str, directory: Path | None = None
+) -> ParameterCatalog | None:
+    """The parameter catalog of a family saved in directory, or from AWS.
+
+    A missing or expired catalog is fetched and saved in directory for later runs.
+    Returns None if it cannot be fetched.
+    """
+    directory = directory or ParameterCatalogSettings().parameter_catalog_dir
+    if catalog := ParameterCatalog.load_current(
+        ParameterCatalog.path(family, directory)
+    ):
+        return catalog
+
+    from botocore.exceptions import BotoCoreError, ClientError  # noqa: PLC0415
+
+    logger.warning(
+        f"No current parameter catalog for {family}. Using the AWS API instead."
+    )
+    try:
+        catalog = build_parameter_catalog(aws_api, family)
+    except (BotoCoreError, ClientError) as e:
+        logger.warning(f"Cannot fetch the parameter catalog of {family}: {e}")
+        return None
+    try:
+        catalog.dump(directory)
+    except OSError as e:
+        logger.warning(f"Cannot save the parameter catalog of {family}: {e}")
+    # the parse-time rule uses the new catalog from now on
+    default_parameter_catalog.cache_clear()
+    return catalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--region", default="us-east-1")
+    parser.add_argument("--output-dir", type=Path, default=CATALOG_DIR)
+    parser.add_argument("families", nargs="*")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.families:
+        families = args.families
+    elif engine_catalog := default_engine_catalog():
+        families = sorted({e.family for e in engine_catalog.engine_versions})
+    else:
+        parser.error(
+            "No engine catalog to take the families from, run make engine-catalog"
+        )
+    aws_api = AWSApi(config_options={"region_name": args.region})
+    for family in families:
+        catalog = build_parameter_catalog(aws_api, family)
+        path = catalog.dump(args.output_dir)
+        logger.info(f"Wrote {len(catalog.parameters)} parameters to {path}")
+
+
+if __name__ == "__main__":
+    main()
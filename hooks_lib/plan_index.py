@@ -0,0 +1,239 @@
+import json
+import re
+import threading
+import weakref
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Self, TextIO
+
+from external_resources_io.terraform import (
+    Action,
+    ResourceChange,
+    TerraformJsonPlanParser,
+)
+
+ELASTICACHE_RESOURCE_PREFIX = "aws_elasticache_"
+
+# a complete string, an incomplete string (cut off at the end of the buffer) or a structural character
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|"|[{}\[\],]')
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _JsonStream:
+    """Minimal incremental reader for a top-level JSON object.
+
+    Only the values asked for are decoded; everything else is skipped with a
+    tokenizer that never materializes it.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Drop the consumed part of the buffer and read the next chunk."""
+        # read at least as much as is buffered to avoid quadratic re-decoding of large values
+        chunk = self._fp.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            match = _WHITESPACE.match(self._buffer, self._pos)
+            assert match  # mypy
+            self._pos = match.end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        """Consume char."""
+        if (found := self.peek()) != char:
+            raise ValueError(f"Expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def decode(self) -> Any:  # noqa: ANN401
+        """Decode the next string, object or array."""
+        self.peek()
+        while True:
+            try:
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+            else:
+                return value
+
+    def skip(self) -> None:
+        """Skip the next value."""
+        depth = 0
+        while True:
+            match = _TOKEN.search(self._buffer, self._pos)
+            if match is None or match.group() == '"':
+                # the value continues beyond the buffer
+                self._pos = len(self._buffer) if match is None else match.start()
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON document")
+                continue
+
+            char = match.group()
+            if char in {"{", "["}:
+                depth += 1
+            elif char in {"}", "]"}:
+                if depth == 0:
+                    # end of the enclosing object, a scalar value was skipped
+                    self._pos = match.start()
+                    return
+                depth -= 1
+            elif char == "," and depth == 0:
+                self._pos = match.start()
+                return
+            self._pos = match.end()
+            if depth == 0:
+                return
+
+
+def iter_resource_changes(
+    plan_path: Path | str, chunk_size: int = 1024 * 1024
+) -> Iterator[dict[str, Any]]:
+    """Yield the raw resource_changes of a terraform JSON plan one by one.
+
+    The plan file is read in chunks; all other plan attributes are skipped without
+    being decoded, and reading stops after the resource_changes array.
+    """
+    with Path(plan_path).open(encoding="utf-8") as fp:
+        stream = _JsonStream(fp, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.decode()
+            stream.expect(":")
+            if key == "resource_changes":
+                stream.expect("[")
+                while stream.peek() != "]":
+                    yield stream.decode()
+                    if stream.peek() == ",":
+                        stream.expect(",")
+                return
+            stream.skip()
+            if stream.peek() == "}":
+                return
+            stream.expect(",")
+
+
+class PlanClass(StrEnum):
+    """What a plan changes, from the point of view of the hooks"""
+
+    NO_CHANGES = "no-changes"
+    # changes, but no ElastiCache resource is created or updated
+    OTHER_CHANGES = "other-changes"
+    ELASTICACHE_CHANGES = "elasticache-changes"
+
+
+class PlanIndex:
+    """Resource changes of a terraform plan, indexed by resource type and action.
+
+    The index is built in one pass over the plan. Use get_plan_index() to share
+    one index per plan between all hooks.
+    """
+
+    def __init__(
+        self,
+        resource_changes: Iterable[ResourceChange],
+        *,
+        has_changes: bool | None = None,
+    ) -> None:
+        self._by_type: dict[str, list[ResourceChange]] = defaultdict(list)
+        self._by_type_action: dict[tuple[str, Action], list[ResourceChange]] = (
+            defaultdict(list)
+        )
+        changes = False
+        for resource_change in resource_changes:
+            self._by_type[resource_change.type].append(resource_change)
+            if not resource_change.change:
+                continue
+            changes = changes or resource_change.change.actions != [Action.ActionNoop]
+            for action in dict.fromkeys(resource_change.change.actions):
+                self._by_type_action[resource_change.type, action].append(
+                    resource_change
+                )
+        self.has_changes = changes if has_changes is None else has_changes
+
+    def changes(self, resource_type: str, *actions: Action) -> list[ResourceChange]:
+        """Resource changes of a type (in plan order), optionally only with any of the given actions."""
+        if not actions:
+            return list(self._by_type.get(resource_type, []))
+        if len(actions) == 1:
+            return list(self._by_type_action.get((resource_type, actions[0]), []))
+        return [
+            c
+            for c in self._by_type.get(resource_type, [])
+            if c.change and not set(actions).isdisjoint(c.change.actions)
+        ]
+
+    @property
+    def classification(self) -> PlanClass:
+        """Classify the plan without looking at any resource change again"""
+        if any(
+            resource_type.startswith(ELASTICACHE_RESOURCE_PREFIX)
+            and action in {Action.ActionCreate, Action.ActionUpdate}
+            for resource_type, action in self._by_type_action
+        ):
+            return PlanClass.ELASTICACHE_CHANGES
+        return PlanClass.OTHER_CHANGES if self.has_changes else PlanClass.NO_CHANGES
+
+    @classmethod
+    def from_plan(cls, plan: TerraformJsonPlanParser) -> Self:
+        """Index a parsed plan"""
+        return cls(plan.plan.resource_changes)
+
+    @classmethod
+    def from_file(
+        cls,
+        plan_path: Path | str,
+        resource_type_prefix: str = ELASTICACHE_RESOURCE_PREFIX,
+        chunk_size: int = 1024 * 1024,
+    ) -> Self:
+        """Index a terraform JSON plan file in streaming mode.
+
+        Only resource changes whose type starts with resource_type_prefix are
+        materialized; has_changes still covers all resources of the plan.
+        """
+        has_changes = False
+        resource_changes = []
+        for raw in iter_resource_changes(plan_path, chunk_size=chunk_size):
+            change = raw.get("change")
+            has_changes = has_changes or (
+                change is not None
+                and change.get("actions", []) != [Action.ActionNoop.value]
+            )
+            if raw.get("type", "").startswith(resource_type_prefix):
+                resource_changes.append(ResourceChange.model_validate(raw))
+        return cls(resource_changes, has_changes=has_changes)
+
+
+_PLAN_INDEXES: weakref.WeakKeyDictionary[TerraformJsonPlanParser, PlanIndex] = (
+    weakref.WeakKeyDictionary()
+)
+_PLAN_INDEXES_LOCK = threading.Lock()
+
+
+def get_plan_index(plan: TerraformJsonPlanParser | PlanIndex) -> PlanIndex:
+    """Return the shared index of a plan, building it on first use."""
+    if isinstance(plan, PlanIndex):
+        return plan
+    with _PLAN_INDEXES_LOCK:
+        if (index := _PLAN_INDEXES.get(plan)) is None:
+            index = _PLAN_INDEXES[plan] = PlanIndex.from_plan(plan)
+        return index
@@ -0,0 +1,223 @@
+import fcntl
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+from hooks_lib.metrics import THROTTLING_ERROR_CODES
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiterSettings(BaseSettings):
+    """Environment Variables."""
+
+    # AWS API calls per second and operation, 0 disables the rate limiter
+    aws_rate_limit: float = Field(10.0, alias="AWS_RATE_LIMIT")
+    aws_rate_limit_burst: float = Field(20.0, alias="AWS_RATE_LIMIT_BURST")
+    # share the rate limits with all processes on the host using this directory
+    aws_rate_limit_dir: Path | None = Field(None, alias="AWS_RATE_LIMIT_DIR")
+
+
+@dataclass(frozen=True)
+class RateLimiterConfig:
+    """Token bucket parameters, per (account, region, operation).
+
+    Attributes:
+        rate: Tokens (API call attempts) per second; 0 disables the limiter.
+        burst: Bucket size, the number of attempts allowed at once.
+        operation_rates: Rates of individual operations, overriding rate.
+        backoff: Factor the rate is multiplied with on every throttling error.
+        min_rate: Lower bound of the rate after throttling errors.
+        recovery: Seconds it takes the rate to grow back after a throttling error.
+        state_dir: Directory of the bucket state files shared by all processes of
+            the host. Without it the buckets are private to the process.
+    """
+
+    rate: float = 10.0
+    burst: float = 20.0
+    operation_rates: Mapping[str, float] = field(default_factory=dict)
+    backoff: float = 0.5
+    min_rate: float = 0.5
+    recovery: float = 30.0
+    state_dir: Path | None = None
+
+    @classmethod
+    def from_env(cls) -> "RateLimiterConfig":
+        """The configuration from the AWS_RATE_LIMIT* environment variables"""
+        settings = RateLimiterSettings()
+        return cls(
+            rate=settings.aws_rate_limit,
+            burst=settings.aws_rate_limit_burst,
+            state_dir=settings.aws_rate_limit_dir,
+        )
+
+
+@dataclass
+class BucketState:
+    """Token bucket state; times are wall clock seconds to be valid across processes."""
+
+    tokens: float
+    updated: float
+    throttled_at: float = 0.0
+    throttled_rate: float = 0.0
+
+
+class RateLimiter:
+    """Client-side token bucket rate limiter for AWS API calls.
+
+    Every call attempt, retries included, takes a token of the bucket of its
+    (account, region, operation) and waits for one if the bucket is empty.
+    Throttling errors cut the rate of the bucket (multiplicative decrease), which
+    then grows back linearly to the configured rate, so a throttled fleet slows
+    down instead of piling up retries.
+
+    With a state directory, the buckets live in small JSON files guarded by flock,
+    and all processes of the host share them.
+    """
+
+    def __init__(
+        self,
+        config: RateLimiterConfig | None = None,
+        *,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
+        self._config = config
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._states: dict[str, BucketState] = {}
+        self._instrumented: weakref.WeakSet[Any] = weakref.WeakSet()
+
+    @cached_property
+    def config(self) -> RateLimiterConfig:
+        """The configuration, from the environment unless given"""
+        return self._config or RateLimiterConfig.from_env()
+
+    @property
+    def enabled(self) -> bool:
+        """False if rate limiting is switched off"""
+        return self.config.rate > 0
+
+    def _rate(self, operation: str, state: BucketState, now: float) -> float:
+        rate = self.config.operation_rates.get(operation, self.config.rate)
+        if not state.throttled_at:
+            return rate
+        recovered = min(1.0, (now - state.throttled_at) / self.config.recovery)
+        return state.throttled_rate + (rate - state.throttled_rate) * recovered
+
+    @contextmanager
+    def _state(self, key: str) -> Iterator[BucketState]:
+        """Lock and yield the state of a bucket, saving changes afterwards."""
+        with self._lock:
+            if self.config.state_dir is None:
+                state = self._states.setdefault(
+                    key, BucketState(tokens=self.config.burst, updated=self._clock())
+                )
+                yield state
+                return
+
+            self.config.state_dir.mkdir(parents=True, exist_ok=True)
+            # the key contains the account, keep it out of the file name
+            name = hashlib.sha256(key.encode()).hexdigest()[:32]
+            with (self.config.state_dir / f"{name}.json").open(
+                "a+", encoding="utf-8"
+            ) as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                try:
+                    state = BucketState(**json.loads(f.read()))
+                except (ValueError, TypeError):
+                    # new or corrupt state file
+                    state = BucketState(tokens=self.config.burst, updated=self._clock())
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(asdict(state)))
+                f.flush()
+
+    def _refill(self, operation: str, state: BucketState, now: float) -> None:
+        elapsed = max(0.0, now - state.updated)
+        state.tokens = min(
+            self.config.burst,
+            state.tokens + elapsed * self._rate(operation, state, now),
+        )
+        state.updated = now
+
+    def _take(self, key: str, operation: str) -> float:
+        """Take a token; return 0 or the seconds to wait for the next one."""
+        with self._state(key) as state:
+            now = self._clock()
+            self._refill(operation, state, now)
+            if state.tokens >= 1:
+                state.tokens -= 1
+                return 0.0
+            return (1 - state.tokens) / self._rate(operation, state, now)
+
+    def acquire(self, key: str, operation: str) -> float:
+        """Wait for a token of the bucket; return the seconds waited."""
+        waited = 0.0
+        while wait := self._take(f"{key}/{operation}", operation):
+            logger.debug(f"Rate limit of {operation} reached, waiting {wait:.2f}s")
+            (self._sleep or time.sleep)(wait)
+            waited += wait
+        return waited
+
+    def throttled(self, key: str, operation: str) -> None:
+        """Slow down the bucket after a throttling error."""
+        with self._state(f"{key}/{operation}") as state:
+            now = self._clock()
+            self._refill(operation, state, now)
+            state.throttled_rate = max(
+                self.config.min_rate,
+                self._rate(operation, state, now) * self.config.backoff,
+            )
+            state.throttled_at = now
+            state.tokens = min(state.tokens, 0.0)
+        logger.info(
+            f"{operation} throttled, rate limit lowered to {state.throttled_rate:.2f}/s"
+        )
+
+    def instrument(self, client: Any, key: str) -> Any:  # noqa: ANN401
+        """Rate limit all call attempts of a botocore client and return it.
+
+        key identifies the account and region of the client.
+        """
+        if not self.enabled or client in self._instrumented:
+            return client
+
+        def _before_sign(operation_name: str, **_: object) -> None:
+            self.acquire(key, operation_name)
+
+        def _needs_retry(
+            response: tuple[Any, Mapping[str, Any]] | None,
+            operation: Any,  # noqa: ANN401
+            **_: object,
+        ) -> None:
+            if (
+                response is not None
+                and response[1].get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+            ):
+                self.throttled(key, operation.name)
+
+        with self._lock:
+            if client not in self._instrumented:
+                client.meta.events.register("before-sign", _before_sign)
+                client.meta.events.register("needs-retry", _needs_retry)
+                self._instrumented.add(client)
+        return client
+
+
+RATE_LIMITER = RateLimiter()
@@ -0,0 +1,211 @@
+import copy
+import json
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+# seconds a describe response is reused, per operation
+DEFAULT_TTLS: Mapping[str, float] = {
+    # state that changes while a hook runs
+    "DescribeUpdateActions": 30,
+    "DescribeEvents": 0,
+    "DescribeReplicationGroups": 60,
+    "DescribeCacheParameterGroups": 60,
+    # topology and catalog data
+    "DescribeCacheSubnetGroups": 300,
+    "DescribeSubnets": 300,
+    "DescribeSecurityGroups": 300,
+    "DescribeCacheEngineVersions": 3600,
+}
+# other describe operations
+DEFAULT_TTL = 60
+# the botocore request context keys of a cached call
+_KEY = "er_aws_elasticache_cache_key"
+CACHE_HIT = "er_aws_elasticache_cache_hit"
+
+_fresh: ContextVar[bool] = ContextVar("er_aws_elasticache_fresh", default=False)
+
+
+@contextmanager
+def fresh() -> Iterator[None]:
+    """Send all AWS calls within this context to AWS, e.g. while polling for a status.
+
+    The context is inherited by asyncio tasks and asyncio.to_thread, not by
+    other threads.
+    """
+    token = _fresh.set(True)
+    try:
+        yield
+    finally:
+        _fresh.reset(token)
+
+
+class ResponseCacheSettings(BaseSettings):
+    """Environment Variables."""
+
+    # reuse the responses of describe calls within a hook run
+    aws_response_cache: bool = Field(default=True, alias="AWS_RESPONSE_CACHE")
+
+
+@dataclass
+class CacheStats:
+    """Lookups of one operation.
+
+    Attributes:
+        hits: Calls answered from the cache.
+        misses: Calls sent to AWS, the response was cached.
+        bypasses: Calls sent to AWS because a fresh response was required.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+
+
+class _CachedResponse:
+    """The HTTP response botocore expects next to a cached parsed response"""
+
+    status_code = 200
+
+
+class ResponseCache:
+    """Memoization of idempotent describe_* calls, keyed by the request.
+
+    instrument() registers botocore hooks on a client: a cached response is returned
+    instead of sending the request until its per-operation TTL expires. Any other
+    operation (e.g. batch_apply_update_action) drops the cached responses of its
+    account, region and service. Code that needs the current state runs inside
+    fresh(); its calls always go to AWS and refresh the cache. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        *,
+        enabled: bool | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self._enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._instrumented: weakref.WeakSet[Any] = weakref.WeakSet()
+        self._entries: dict[tuple[str, str, str, str], tuple[float, Any]] = {}
+        self.stats: dict[str, CacheStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether responses are cached at all (AWS_RESPONSE_CACHE by default)"""
+        if self._enabled is None:
+            self._enabled = ResponseCacheSettings().aws_response_cache
+        return self._enabled
+
+    def ttl(self, operation: str) -> float:
+        """Seconds a response of operation is reused; 0 for operations never cached"""
+        if not operation.startswith("Describe"):
+            return 0
+        return self.ttls.get(operation, DEFAULT_TTL)
+
+    def _stats(self, operation: str) -> CacheStats:
+        # the caller holds the lock
+        return self.stats.setdefault(operation, CacheStats())
+
+    def instrument(self, client: Any, key: str) -> Any:  # noqa: ANN401
+        """Cache the describe responses of a botocore client and return it.
+
+        key identifies the account and region of the client.
+        """
+        if not self.enabled or client in self._instrumented:
+            return client
+        service = client.meta.service_model.service_name
+
+        def _before_call(
+            model: Any,  # noqa: ANN401
+            params: Mapping[str, Any],
+            context: dict[str, Any],
+            **_: object,
+        ) -> tuple[_CachedResponse, Any] | None:
+            operation = model.name
+            if not (ttl := self.ttl(operation)):
+                if not operation.startswith("Describe"):
+                    self.invalidate(key, service)
+                return None
+            request = json.dumps(
+                [params.get("url_path"), params.get("query_string"), params["body"]],
+                sort_keys=True,
+                default=str,
+            )
+            entry_key = (key, service, operation, request)
+            context[_KEY] = entry_key
+            with self._lock:
+                stats = self._stats(operation)
+                if _fresh.get():
+                    stats.bypasses += 1
+                    return None
+                cached = self._entries.get(entry_key)
+                if cached is None or self._clock() - cached[0] > ttl:
+                    stats.misses += 1
+                    return None
+                stats.hits += 1
+            context[CACHE_HIT] = True
+            return _CachedResponse(), copy.deepcopy(cached[1])
+
+        def _after_call(
+            http_response: Any,  # noqa: ANN401
+            parsed: Mapping[str, Any],
+            context: Mapping[str, Any],
+            **_: object,
+        ) -> None:
+            if (
+                (entry_key := context.get(_KEY)) is None
+                or context.get(CACHE_HIT)
+                or http_response.status_code >= 300  # noqa: PLR2004
+            ):
+                return
+            with self._lock:
+                self._entries[entry_key] = (self._clock(), copy.deepcopy(parsed))
+
+        with self._lock:
+            if client not in self._instrumented:
+                client.meta.events.register("before-call", _before_call)
+                client.meta.events.register("after-call", _after_call)
+                self._instrumented.add(client)
+        return client
+
+    def invalidate(self, key: str | None = None, service: str | None = None) -> None:
+        """Drop the cached responses of an account and region (and service), or all"""
+        with self._lock:
+            for entry_key in list(self._entries):
+                if (key is None or entry_key[0] == key) and (
+                    service is None or entry_key[1] == service
+                ):
+                    del self._entries[entry_key]
+
+    def reset(self) -> None:
+        """Drop all cached responses and statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.stats.clear()
+
+    def report(self) -> dict[str, dict[str, int]]:
+        """Hits, misses and bypasses per operation"""
+        with self._lock:
+            return {
+                operation: {
+                    "hits": s.hits,
+                    "misses": s.misses,
+                    "bypasses": s.bypasses,
+                }
+                for operation, s in sorted(self.stats.items())
+            }
+
+
+RESPONSE_CACHE = ResponseCache()
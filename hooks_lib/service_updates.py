@@ -1,13 +1,34 @@
 import logging
+import operator
 import time
+from collections import defaultdict
 from collections.abc import Sequence
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from functools import cached_property
+from typing import TYPE_CHECKING
 
-from hooks_lib.aws_api import AWSApi
+from hooks_lib.async_aws_api import AsyncAWSApi
+from hooks_lib.aws_api import AWSApi, most_recent
+from hooks_lib.response_cache import fresh
+from hooks_lib.waiter import AsyncServiceUpdateWaiter, ServiceUpdateWaiter, WaiterConfig
+
+if TYPE_CHECKING:
+    from mypy_boto3_elasticache.literals import UpdateActionStatusType
+    from mypy_boto3_elasticache.type_defs import UpdateActionTypeDef
+else:
+    UpdateActionStatusType = UpdateActionTypeDef = object
 
 logger = logging.getLogger(__name__)
 
+IN_PROGRESS_STATUSES: list[UpdateActionStatusType] = [
+    "waiting-to-start",
+    "in-progress",
+    "scheduling",
+    "stopping",
+]
+PENDING_STATUSES: list[UpdateActionStatusType] = ["not-applied", "scheduled", "stopped"]
+
 
 @dataclass
 class ServiceUpdate:
@@ -19,6 +40,72 @@ class ServiceUpdate:
     status: str
     type: str
 
+    @classmethod
+    def from_update_action(cls, update_action: UpdateActionTypeDef) -> "ServiceUpdate":
+        """Create a ServiceUpdate from a describe_update_actions item"""
+        return cls(
+            name=update_action["ServiceUpdateName"],
+            release_date=update_action["ServiceUpdateReleaseDate"],
+            severity=update_action["ServiceUpdateSeverity"],
+            status=update_action["UpdateActionStatus"],
+            type=update_action["ServiceUpdateType"],
+        )
+
+
+@dataclass
+class ServiceUpdateResult:
+    """Outcome of one service update applied by ServiceUpdatesManager.converge
+
+    Attributes:
+        name: The service update.
+        status: completed, failed or timed-out.
+        seconds: Time from applying the update to its completion (or failure).
+        error: Error message of a failed or timed out update.
+    """
+
+    name: str
+    status: str
+    seconds: float
+    error: str | None = None
+
+
+def default_cooldown(environment: str) -> int:
+    """Calculate the cooldown period based on the environment name."""
+    name = environment.lower().strip()
+    match name:
+        case _ if "production" in name:
+            default = 14
+        case _ if "staging" in name or "stage" in name:
+            default = 7
+        case _:
+            default = 5
+
+    return default
+
+
+def released_before(
+    cooldown_days: int | None, environment: str, now: datetime | None = None
+) -> datetime:
+    """Release date limit of the service updates to apply (the cooldown defaults by environment)."""
+    return (now or datetime.now(tz=UTC)) - timedelta(
+        days=cooldown_days
+        if cooldown_days is not None
+        else default_cooldown(environment)
+    )
+
+
+def _eligible(
+    update_action: UpdateActionTypeDef,
+    service_updates_types: Sequence[str],
+    severities: Sequence[str],
+    released_before: datetime,
+) -> bool:
+    return (
+        update_action["ServiceUpdateType"] in service_updates_types
+        and update_action["ServiceUpdateSeverity"] in severities
+        and update_action["ServiceUpdateReleaseDate"] < released_before
+    )
+
 
 class ServiceUpdatesManager:
     """This class manages AWS ElastiCache service updates."""
@@ -28,61 +115,365 @@ class ServiceUpdatesManager:
         replication_group_id: str,
         region: str,
         aws_api_class: type[AWSApi] = AWSApi,
+        aws_api: AWSApi | None = None,
     ) -> None:
         self.replication_group_id = replication_group_id
-        self.aws_api = aws_api_class(config_options={"region_name": region})
+        self.region = region
+        self._aws_api_class = aws_api_class
+        # share an existing AWSApi, e.g. between the phases of the hook driver
+        self._aws_api = aws_api
+
+    @cached_property
+    def aws_api(self) -> AWSApi:
+        """The AWS API, created on first use"""
+        return self._aws_api or self._aws_api_class(
+            config_options={"region_name": self.region}
+        )
 
     @property
     def update_in_progress(self) -> bool:
         """Check if an update is in progress."""
-        return bool(
-            self.aws_api.get_service_updates(
+        # stops paginating at the first match
+        return any(
+            True
+            for _ in self.aws_api.iter_service_updates(
                 replication_group_id=self.replication_group_id,
-                status=["waiting-to-start", "in-progress", "scheduling", "stopping"],
+                status=IN_PROGRESS_STATUSES,
             )
         )
 
+    def update_action_status(self, service_update_name: str) -> str | None:
+        """The update action status of a service update (None if it is not listed)."""
+        return next(
+            (
+                u["UpdateActionStatus"]
+                for u in self.aws_api.iter_service_updates(
+                    replication_group_id=self.replication_group_id
+                )
+                if u["ServiceUpdateName"] == service_update_name
+            ),
+            None,
+        )
+
     def service_updates(
         self,
         service_updates_types: Sequence[str],
         severities: Sequence[str],
         released_before: datetime,
+        limit: int | None = None,
     ) -> list[ServiceUpdate]:
-        """Get a list of all available service updates ordered by release date (most recent first)."""
-        return [
-            ServiceUpdate(
-                name=u["ServiceUpdateName"],
-                release_date=u["ServiceUpdateReleaseDate"],
-                severity=u["ServiceUpdateSeverity"],
-                status=u["UpdateActionStatus"],
-                type=u["ServiceUpdateType"],
-            )
-            for u in self.aws_api.get_service_updates(
-                replication_group_id=self.replication_group_id,
-                status=["not-applied", "scheduled", "stopped"],
-            )
-            if u["ServiceUpdateType"] in service_updates_types
-            and u["ServiceUpdateSeverity"] in severities
-            and u["ServiceUpdateReleaseDate"] < released_before
-        ]
+        """Get a list of all available service updates ordered by release date (most recent first).
+
+        Use limit to get only the most recent ones.
+        """
+        return most_recent(
+            (
+                ServiceUpdate.from_update_action(u)
+                for u in self.aws_api.iter_service_updates(
+                    replication_group_id=self.replication_group_id,
+                    status=PENDING_STATUSES,
+                )
+                if _eligible(u, service_updates_types, severities, released_before)
+            ),
+            key=operator.attrgetter("release_date"),
+            limit=limit,
+        )
 
     def apply_service_update(
-        self, service_update: ServiceUpdate, *, wait_for_completion: bool = False
+        self,
+        service_update: ServiceUpdate,
+        *,
+        wait_for_completion: bool = False,
+        waiter_config: WaiterConfig | None = None,
     ) -> None:
         """Apply a service update."""
-        if self.update_in_progress:
-            raise RuntimeError("An update is already in progress.")
+        # a cached "not in progress" must not let a second update start
+        with fresh():
+            if self.update_in_progress:
+                raise RuntimeError("An update is already in progress.")
 
+        started = datetime.now(tz=UTC)
         self.aws_api.batch_apply_service_updates(
             replication_group_id=self.replication_group_id,
             service_update_name=service_update.name,
         )
 
         if wait_for_completion:
-            msg = "Waiting for service update to complete..."
-            logger.info(msg)
-            start_time = time.time()
-            while self.update_in_progress:
-                time.sleep(60)
-                elapsed_time = int(time.time() - start_time)
-                logger.info(f"{msg} ({elapsed_time // 60}m)")
+            logger.info("Waiting for service update to complete...")
+            polls = self.wait_for_completion(waiter_config, since=started)
+            logger.info(
+                f"Service update {service_update.name} completed after {polls} polls"
+            )
+
+    def converge(
+        self,
+        service_updates_types: Sequence[str],
+        severities: Sequence[str],
+        released_before: datetime,
+        waiter_config: WaiterConfig | None = None,
+    ) -> list[ServiceUpdateResult]:
+        """Apply all eligible service updates back to back, oldest first.
+
+        The pending updates are listed again after every update because applying
+        one may complete or obsolete others, so only the updates still needed are
+        applied. ElastiCache applies one update per replication group at a time, so
+        they cannot be batched. All waits share one deadline (waiter_config.timeout);
+        the first failure or timeout stops the run.
+        """
+        waiter = ServiceUpdateWaiter(
+            self.aws_api, self.replication_group_id, waiter_config
+        )
+        deadline = waiter.deadline()
+        results: list[ServiceUpdateResult] = []
+        applied: set[str] = set()
+        while pending := [
+            u
+            for u in reversed(
+                self.service_updates(service_updates_types, severities, released_before)
+            )
+            # an update still listed after completing must not loop forever
+            if u.name not in applied
+        ]:
+            update = pending[0]
+            applied.add(update.name)
+            logger.info(
+                f"Applying service update {update.name} ({len(pending) - 1} more pending)"
+            )
+            start = time.monotonic()
+            started = datetime.now(tz=UTC)
+            error: str | None = None
+            try:
+                self.apply_service_update(update)
+                waiter.wait(
+                    lambda: not self.update_in_progress,
+                    since=started,
+                    deadline=deadline,
+                )
+            except TimeoutError as e:
+                status, error = "timed-out", str(e)
+            except Exception as e:
+                logger.exception(f"Service update {update.name} failed")
+                status, error = "failed", str(e)
+            else:
+                status = "completed"
+            results.append(
+                ServiceUpdateResult(
+                    name=update.name,
+                    status=status,
+                    seconds=time.monotonic() - start,
+                    error=error,
+                )
+            )
+            if error:
+                break
+        return results
+
+    def wait_for_completion(
+        self, waiter_config: WaiterConfig | None = None, since: datetime | None = None
+    ) -> int:
+        """Block until no update is in progress; return the number of polls."""
+        waiter = ServiceUpdateWaiter(
+            self.aws_api, self.replication_group_id, waiter_config
+        )
+        waiter.wait(lambda: not self.update_in_progress, since=since)
+        return waiter.polls
+
+
+class AsyncServiceUpdatesManager:
+    """Asyncio counterpart of ServiceUpdatesManager.
+
+    The AWS calls of many managers sharing one AsyncAWSApi run concurrently within
+    its concurrency limit.
+    """
+
+    def __init__(
+        self,
+        replication_group_id: str,
+        region: str,
+        aws_api: AsyncAWSApi | None = None,
+    ) -> None:
+        self.aws_api = aws_api or AsyncAWSApi(config_options={"region_name": region})
+        self.manager = ServiceUpdatesManager(
+            replication_group_id, region, aws_api=self.aws_api.aws_api
+        )
+
+    @property
+    def replication_group_id(self) -> str:
+        """The managed replication group"""
+        return self.manager.replication_group_id
+
+    async def update_in_progress(self) -> bool:
+        """Check if an update is in progress."""
+        return await self.aws_api.run(lambda: self.manager.update_in_progress)
+
+    async def update_action_status(self, service_update_name: str) -> str | None:
+        """The update action status of a service update (None if it is not listed)."""
+        return await self.aws_api.run(
+            self.manager.update_action_status, service_update_name
+        )
+
+    async def service_updates(
+        self,
+        service_updates_types: Sequence[str],
+        severities: Sequence[str],
+        released_before: datetime,
+        limit: int | None = None,
+    ) -> list[ServiceUpdate]:
+        """Get the available service updates ordered by release date (most recent first)."""
+        return await self.aws_api.run(
+            self.manager.service_updates,
+            service_updates_types,
+            severities,
+            released_before,
+            limit,
+        )
+
+    async def apply_service_update(
+        self,
+        service_update: ServiceUpdate,
+        *,
+        wait_for_completion: bool = False,
+        waiter_config: WaiterConfig | None = None,
+    ) -> None:
+        """Apply a service update."""
+        with fresh():
+            if await self.update_in_progress():
+                raise RuntimeError("An update is already in progress.")
+
+        started = datetime.now(tz=UTC)
+        await self.aws_api.batch_apply_service_updates(
+            replication_group_id=self.replication_group_id,
+            service_update_name=service_update.name,
+        )
+
+        if wait_for_completion:
+            logger.info(f"{self.replication_group_id}: waiting for service update")
+            polls = await self.wait_for_completion(waiter_config, since=started)
+            logger.info(
+                f"{self.replication_group_id}: service update {service_update.name} "
+                f"completed after {polls} polls"
+            )
+
+    async def wait_for_completion(
+        self, waiter_config: WaiterConfig | None = None, since: datetime | None = None
+    ) -> int:
+        """Wait until no update is in progress; return the number of polls."""
+        waiter = AsyncServiceUpdateWaiter(
+            self.aws_api, self.replication_group_id, waiter_config
+        )
+
+        async def is_done() -> bool:
+            return not await self.update_in_progress()
+
+        await waiter.wait_async(is_done, since=since)
+        return waiter.polls
+
+
+@dataclass
+class BatchApplyResult:
+    """Outcome of applying a service update to many replication groups.
+
+    Attributes:
+        service_update_name: The applied service update.
+        processed: Update action status per processed replication group.
+        unprocessed: Error message per replication group that was not processed.
+    """
+
+    service_update_name: str
+    processed: dict[str, str] = field(default_factory=dict)
+    unprocessed: dict[str, str] = field(default_factory=dict)
+
+
+class ServiceUpdatesBatchManager:
+    """Manage AWS ElastiCache service updates for many replication groups at once.
+
+    All AWS calls are batched with up to MAX_REPLICATION_GROUPS_PER_CALL replication
+    groups per request.
+    """
+
+    def __init__(
+        self,
+        replication_group_ids: Sequence[str],
+        region: str,
+        aws_api_class: type[AWSApi] = AWSApi,
+    ) -> None:
+        self.replication_group_ids = list(dict.fromkeys(replication_group_ids))
+        self.region = region
+        self._aws_api_class = aws_api_class
+
+    @cached_property
+    def aws_api(self) -> AWSApi:
+        """The AWS API, created on first use"""
+        return self._aws_api_class(config_options={"region_name": self.region})
+
+    @property
+    def updates_in_progress(self) -> set[str]:
+        """Replication groups with a service update in progress."""
+        return {
+            u["ReplicationGroupId"]
+            for u in self.aws_api.iter_update_actions(
+                self.replication_group_ids, status=IN_PROGRESS_STATUSES
+            )
+        }
+
+    def service_updates(
+        self,
+        service_updates_types: Sequence[str],
+        severities: Sequence[str],
+        released_before: datetime,
+    ) -> dict[str, list[ServiceUpdate]]:
+        """Get the available service updates per replication group ordered by release date (most recent first)."""
+        updates: dict[str, list[ServiceUpdate]] = defaultdict(list)
+        for u in self.aws_api.iter_update_actions(
+            self.replication_group_ids, status=PENDING_STATUSES
+        ):
+            if _eligible(u, service_updates_types, severities, released_before):
+                updates[u["ReplicationGroupId"]].append(
+                    ServiceUpdate.from_update_action(u)
+                )
+        return {
+            replication_group_id: most_recent(
+                group_updates, key=operator.attrgetter("release_date")
+            )
+            for replication_group_id, group_updates in updates.items()
+        }
+
+    def apply_service_update(
+        self,
+        service_update_name: str,
+        replication_group_ids: Sequence[str] | None = None,
+    ) -> BatchApplyResult:
+        """Apply a service update to the given (default: all) replication groups.
+
+        Replication groups with an update in progress are skipped and reported as unprocessed.
+        """
+        result = BatchApplyResult(service_update_name=service_update_name)
+        targets = (
+            self.replication_group_ids
+            if replication_group_ids is None
+            else list(replication_group_ids)
+        )
+        # a cached "not in progress" must not let a second update start
+        with fresh():
+            busy = self.updates_in_progress
+        for replication_group_id in busy.intersection(targets):
+            result.unprocessed[replication_group_id] = (
+                "An update is already in progress."
+            )
+
+        if not (targets := [t for t in targets if t not in busy]):
+            return result
+
+        processed, unprocessed = self.aws_api.batch_apply_update_action(
+            replication_group_ids=targets, service_update_name=service_update_name
+        )
+        for action in processed:
+            result.processed[action["ReplicationGroupId"]] = action[
+                "UpdateActionStatus"
+            ]
+        for uaction in unprocessed:
+            logger.error(uaction)
+            result.unprocessed[uaction["ReplicationGroupId"]] = (
+                f"{uaction['ErrorType']}: {uaction['ErrorMessage']}"
+            )
+        return result
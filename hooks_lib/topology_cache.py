@@ -0,0 +1,273 @@
+import fcntl
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+if TYPE_CHECKING:
+    from mypy_boto3_ec2.type_defs import SecurityGroupTypeDef
+    from mypy_boto3_ec2.type_defs import SubnetTypeDef as EC2SubnetTypeDef
+    from mypy_boto3_elasticache.type_defs import (
+        SubnetTypeDef as ElasticacheSubnetTypeDef,
+    )
+else:
+    SecurityGroupTypeDef = EC2SubnetTypeDef = ElasticacheSubnetTypeDef = object
+
+CACHE_SCHEMA_VERSION = 1
+
+
+class TopologyCacheSettings(BaseSettings):
+    """Environment Variables."""
+
+    # persist the topology here, shared by all runs and processes using the directory
+    topology_cache_dir: Path | None = Field(None, alias="TOPOLOGY_CACHE_DIR")
+    # seconds a cached subnet group or security group is trusted
+    topology_cache_ttl: float = Field(24 * 60 * 60, alias="TOPOLOGY_CACHE_TTL")
+
+
+@dataclass(frozen=True)
+class SubnetTopology:
+    """A subnet of a cache subnet group"""
+
+    subnet_id: str
+    vpc_id: str | None = None
+    availability_zone: str | None = None
+
+
+@dataclass(frozen=True)
+class SubnetGroupTopology:
+    """The subnets of a cache subnet group with their VPC and availability zone"""
+
+    name: str
+    subnets: tuple[SubnetTopology, ...]
+    cached_at: float = 0.0
+
+    @property
+    def subnet_ids(self) -> list[str]:
+        """IDs of all subnets"""
+        return [s.subnet_id for s in self.subnets]
+
+    @property
+    def vpc_ids(self) -> set[str]:
+        """VPCs of the subnets (one for a valid subnet group)"""
+        return {s.vpc_id for s in self.subnets if s.vpc_id}
+
+    @property
+    def availability_zones(self) -> set[str]:
+        """Availability zones covered by the subnet group"""
+        return {s.availability_zone for s in self.subnets if s.availability_zone}
+
+    @classmethod
+    def from_describe(
+        cls,
+        name: str,
+        cache_group_subnets: Sequence[ElasticacheSubnetTypeDef],
+        subnets: Sequence[EC2SubnetTypeDef],
+    ) -> "SubnetGroupTopology":
+        """The topology from describe_cache_subnet_groups and describe_subnets"""
+        vpc_ids = {s.get("SubnetId"): s.get("VpcId") for s in subnets}
+        return cls(
+            name=name,
+            subnets=tuple(
+                SubnetTopology(
+                    subnet_id=s["SubnetIdentifier"],
+                    vpc_id=vpc_ids.get(s["SubnetIdentifier"]),
+                    availability_zone=s.get("SubnetAvailabilityZone", {}).get("Name"),
+                )
+                for s in cache_group_subnets
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SubnetGroupTopology":
+        """The topology from its JSON representation"""
+        return cls(
+            name=data["name"],
+            subnets=tuple(SubnetTopology(**s) for s in data["subnets"]),
+            cached_at=data["cached_at"],
+        )
+
+
+@dataclass
+class AccountTopology:
+    """Cached topology of an account and region"""
+
+    subnet_groups: dict[str, SubnetGroupTopology] = field(default_factory=dict)
+    # security group ID -> (VPC ID, cached at)
+    security_groups: dict[str, tuple[str | None, float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, text: str) -> "AccountTopology":
+        """Parse a cache file; an unknown schema version is an empty topology"""
+        data = json.loads(text)
+        if data.get("schema_version") != CACHE_SCHEMA_VERSION:
+            return cls()
+        return cls(
+            subnet_groups={
+                name: SubnetGroupTopology.from_dict(g)
+                for name, g in data["subnet_groups"].items()
+            },
+            security_groups={
+                group_id: (vpc_id, cached_at)
+                for group_id, (vpc_id, cached_at) in data["security_groups"].items()
+            },
+        )
+
+    def to_json(self) -> str:
+        """The cache file content"""
+        return json.dumps({
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "subnet_groups": {
+                name: asdict(g) for name, g in sorted(self.subnet_groups.items())
+            },
+            "security_groups": dict(sorted(self.security_groups.items())),
+        })
+
+
+class TopologyCache:
+    """Subnet groups and security groups per account and region.
+
+    Subnet groups map to their subnets, VPC and availability zones, security
+    groups to their VPC. Both rarely change, so entries are trusted for ttl
+    seconds. Without a directory the cache lives in memory; with one, it is a
+    flock'd JSON file per account and region that all processes share.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        ttl: float | None = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if directory is None or ttl is None:
+            settings = TopologyCacheSettings()
+            directory = directory or settings.topology_cache_dir
+            ttl = settings.topology_cache_ttl if ttl is None else ttl
+        self.directory = directory
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._topologies: dict[str, AccountTopology] = {}
+
+    @contextmanager
+    def _topology(self, key: str, *, write: bool = True) -> Iterator[AccountTopology]:
+        """Lock and yield the topology of an account and region.
+
+        With write, changes are saved afterwards; lookups pass write=False and
+        leave the cache file untouched.
+        """
+        with self._lock:
+            if self.directory is None:
+                yield self._topologies.setdefault(key, AccountTopology())
+                return
+
+            # the key contains the account, keep it out of the file name
+            name = hashlib.sha256(key.encode()).hexdigest()[:32]
+            path = self.directory / f"topology-{name}.json"
+            if not write:
+                if not path.is_file():
+                    yield AccountTopology()
+                    return
+                with path.open(encoding="utf-8") as f:
+                    fcntl.flock(f, fcntl.LOCK_SH)
+                    yield self._read(f)
+                return
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with path.open("a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                topology = self._read(f)
+                yield topology
+                f.seek(0)
+                f.truncate()
+                f.write(topology.to_json())
+                f.flush()
+
+    @staticmethod
+    def _read(f: IO[str]) -> AccountTopology:
+        try:
+            return AccountTopology.from_json(f.read())
+        except (ValueError, TypeError, KeyError):
+            # new or corrupt cache file
+            return AccountTopology()
+
+    def _fresh(self, cached_at: float) -> bool:
+        return self._clock() - cached_at <= self.ttl
+
+    def subnet_group(self, key: str, name: str) -> SubnetGroupTopology | None:
+        """The cached topology of a subnet group, unless it is missing or expired.
+
+        key identifies the account and region.
+        """
+        with self._topology(key, write=False) as topology:
+            group = topology.subnet_groups.get(name)
+        if group is None or not self._fresh(group.cached_at):
+            return None
+        return group
+
+    def put_subnet_group(self, key: str, group: SubnetGroupTopology) -> None:
+        """Cache the topology of a subnet group"""
+        with self._topology(key) as topology:
+            topology.subnet_groups[group.name] = SubnetGroupTopology(
+                name=group.name, subnets=group.subnets, cached_at=self._clock()
+            )
+
+    def security_groups(
+        self, key: str, group_ids: Sequence[str]
+    ) -> dict[str, str | None]:
+        """VPC ID per cached security group; missing and expired ones are left out"""
+        with self._topology(key, write=False) as topology:
+            cached = {g: topology.security_groups.get(g) for g in group_ids}
+        return {
+            group_id: entry[0]
+            for group_id, entry in cached.items()
+            if entry is not None and self._fresh(entry[1])
+        }
+
+    def put_security_groups(
+        self, key: str, security_groups: Sequence[SecurityGroupTypeDef]
+    ) -> None:
+        """Cache the VPC of security groups"""
+        now = self._clock()
+        with self._topology(key) as topology:
+            for sg in security_groups:
+                if group_id := sg.get("GroupId"):
+                    topology.security_groups[group_id] = (sg.get("VpcId"), now)
+
+    def invalidate(
+        self,
+        key: str,
+        subnet_group: str | None = None,
+        security_groups: Sequence[str] | None = None,
+    ) -> None:
+        """Drop a subnet group and/or security groups, or everything, of an account and region"""
+        with self._topology(key) as topology:
+            if subnet_group is None and security_groups is None:
+                topology.subnet_groups.clear()
+                topology.security_groups.clear()
+                return
+            if subnet_group is not None:
+                topology.subnet_groups.pop(subnet_group, None)
+            for group_id in security_groups or []:
+                topology.security_groups.pop(group_id, None)
+
+    def reset(self) -> None:
+        """Drop the topology of all accounts and regions"""
+        with self._lock:
+            self._topologies.clear()
+            if self.directory is not None:
+                for path in self.directory.glob("topology-*.json"):
+                    path.unlink(missing_ok=True)
+
+
+TOPOLOGY_CACHE = TopologyCache()
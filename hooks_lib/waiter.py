@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from hooks_lib.async_aws_api import AsyncAWSApi
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.response_cache import fresh
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WaiterConfig:
+    """Polling behaviour of the ServiceUpdateWaiter.
+
+    Attributes:
+        initial_delay: Seconds between the first polls and after any new event.
+        max_delay: Upper bound of the poll interval in seconds.
+        backoff: Factor the poll interval grows by while nothing happens.
+        jitter: Random +/- fraction applied to every poll interval.
+        timeout: Overall deadline in seconds.
+    """
+
+    initial_delay: float = 15
+    max_delay: float = 300
+    backoff: float = 2.0
+    jitter: float = 0.1
+    timeout: float = 12 * 60 * 60
+
+
+class ServiceUpdateWaiter:
+    """Wait for a service update of a replication group to complete.
+
+    The poll interval grows exponentially (with jitter) while nothing happens and
+    resets to the initial delay as soon as describe_events reports new activity for
+    the replication group, so short updates finish quickly and long ones need only a
+    few API calls.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        aws_api: AWSApi,
+        replication_group_id: str,
+        config: WaiterConfig | None = None,
+        *,
+        sleep: Callable[[float], None] | None = None,
+        clock: Callable[[], float] | None = None,
+        rng: Callable[[], float] | None = None,
+    ) -> None:
+        self.aws_api = aws_api
+        self.replication_group_id = replication_group_id
+        self.config = config or WaiterConfig()
+        self._sleep = sleep or time.sleep
+        self._clock = clock or time.monotonic
+        self._rng = rng or random.random  # noqa: S311 - jitter only
+        self.polls = 0
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1 + self.config.jitter * (2 * self._rng() - 1))
+
+    def _report_progress(self, cursor: datetime) -> datetime | None:
+        """Log all events since cursor and return the new cursor, if there are any."""
+        new_cursor = None
+        for event in self.aws_api.iter_events(self.replication_group_id, cursor):
+            if "Date" not in event or event["Date"] <= cursor:
+                # StartTime is inclusive
+                continue
+            logger.info(f"{event['Date']:%Y-%m-%d %H:%M:%S} {event.get('Message')}")
+            new_cursor = event["Date"]
+        return new_cursor
+
+    def deadline(self) -> float:
+        """A deadline config.timeout from now, see wait()"""
+        return self._clock() + self.config.timeout
+
+    def wait(
+        self,
+        is_done: Callable[[], bool],
+        since: datetime | None = None,
+        deadline: float | None = None,
+    ) -> None:
+        """Block until is_done() returns True.
+
+        Several waits can share one deadline (see deadline()); by default each wait
+        gets config.timeout. Raises TimeoutError when the deadline is reached.
+        """
+        cursor = since or datetime.now(tz=UTC)
+        start = self._clock()
+        deadline = start + self.config.timeout if deadline is None else deadline
+        delay = self.config.initial_delay
+        # polls must see the current state, not a cached response
+        with fresh():
+            while not is_done():
+                self.polls += 1
+                if (remaining := deadline - self._clock()) <= 0:
+                    raise TimeoutError(
+                        f"Service update for {self.replication_group_id} did not complete "
+                        f"within {timedelta(seconds=self.config.timeout)}"
+                    )
+                self._sleep(min(self._jittered(delay), remaining))
+                logger.info(
+                    f"Waiting for service update to complete... ({int(self._clock() - start) // 60}m)"
+                )
+                if new_cursor := self._report_progress(cursor):
+                    cursor = new_cursor
+                    delay = self.config.initial_delay
+                else:
+                    delay = min(delay * self.config.backoff, self.config.max_delay)
+
+
+class AsyncServiceUpdateWaiter(ServiceUpdateWaiter):
+    """Asyncio counterpart of ServiceUpdateWaiter; the event loop is free while waiting."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        aws_api: AsyncAWSApi,
+        replication_group_id: str,
+        config: WaiterConfig | None = None,
+        *,
+        sleep: Callable[[float], Awaitable[None]] | None = None,
+        clock: Callable[[], float] | None = None,
+        rng: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(
+            aws_api.aws_api, replication_group_id, config, clock=clock, rng=rng
+        )
+        self.async_aws_api = aws_api
+        self._async_sleep = sleep or asyncio.sleep
+
+    async def wait_async(
+        self,
+        is_done: Callable[[], Awaitable[bool]],
+        since: datetime | None = None,
+        deadline: float | None = None,
+    ) -> None:
+        """Wait until is_done() returns True, see ServiceUpdateWaiter.wait()"""
+        cursor = since or datetime.now(tz=UTC)
+        start = self._clock()
+        deadline = start + self.config.timeout if deadline is None else deadline
+        delay = self.config.initial_delay
+        # polls must see the current state, not a cached response
+        with fresh():
+            while not await is_done():
+                self.polls += 1
+                if (remaining := deadline - self._clock()) <= 0:
+                    raise TimeoutError(
+                        f"Service update for {self.replication_group_id} did not complete "
+                        f"within {timedelta(seconds=self.config.timeout)}"
+                    )
+                await self._async_sleep(min(self._jittered(delay), remaining))
+                logger.info(
+                    f"{self.replication_group_id}: waiting for service update to complete... "
+                    f"({int(self._clock() - start) // 60}m)"
+                )
+                if new_cursor := await self.async_aws_api.run(
+                    self._report_progress, cursor
+                ):
+                    cursor = new_cursor
+                    delay = self.config.initial_delay
+                else:
+                    delay = min(delay * self.config.backoff, self.config.max_delay)
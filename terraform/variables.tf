@@ -93,6 +93,11 @@ variable "parameter_group_name" {
   default = null
 }
 
+variable "parameter_group_reboot_policy" {
+  type    = string
+  default = "warn"
+}
+
 variable "port" {
   type    = number
   default = null
@@ -126,6 +131,11 @@ variable "security_group_ids" {
   default = []
 }
 
+variable "service_updates_apply_all" {
+  type    = bool
+  default = false
+}
+
 variable "service_updates_cooldown_days" {
   type    = number
   default = null
@@ -146,6 +156,11 @@ variable "service_updates_types" {
   default = ["engine-update", "security-update"]
 }
 
+variable "service_updates_wait_for_completion" {
+  type    = bool
+  default = true
+}
+
 variable "snapshot_retention_limit" {
   type    = number
   default = null
@@ -1,7 +1,45 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
 import pytest
 from external_resources_io.input import parse_model
 
+from benchmarks.fake_aws import FakeAWS
 from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from er_aws_elasticache.parameter_catalog import default_parameter_catalog
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.response_cache import RESPONSE_CACHE
+from hooks_lib.topology_cache import TOPOLOGY_CACHE
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the service update checkpoints of every test apart."""
+    path = tmp_path / "checkpoints"
+    monkeypatch.setenv("SERVICE_UPDATE_CHECKPOINT_DIR", str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def parameter_catalog_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the parameter catalogs fetched from AWS out of the module data."""
+    path = tmp_path / "parameters"
+    monkeypatch.setenv("PARAMETER_CATALOG_DIR", str(path))
+    default_parameter_catalog.cache_clear()
+    return path
+
+
+@pytest.fixture(autouse=True)
+def response_cache() -> None:
+    """Start every test without cached AWS responses"""
+    RESPONSE_CACHE.reset()
+
+
+@pytest.fixture(autouse=True)
+def topology_cache() -> None:
+    """Start every test without cached subnet groups and security groups"""
+    TOPOLOGY_CACHE.reset()
 
 
 @pytest.fixture
@@ -70,3 +108,49 @@ def raw_input_data() -> dict:
 def ai_input(raw_input_data: dict) -> AppInterfaceInput:
     """Fixture to provide the AppInterfaceInput."""
     return parse_model(AppInterfaceInput, raw_input_data)
+
+
+class FakeClock:
+    """A clock that only moves when told to or when sleeping"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        """The current time"""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock"""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A fake clock for clock= and sleep= arguments"""
+    return FakeClock()
+
+
+@pytest.fixture
+def fake() -> FakeAWS:
+    """In-memory AWS, extend it with the data of a test module"""
+    return FakeAWS()
+
+
+@pytest.fixture
+def fake_aws_api(fake: FakeAWS) -> Callable[..., AWSApi]:
+    """Create AWSApi instances answered by fake; without rate limiting by default"""
+
+    def _aws_api(
+        region: str = "us-east-1",
+        config_options: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> AWSApi:
+        kwargs.setdefault("rate_limiter", None)
+        if "client_pool" not in kwargs:
+            kwargs["client_pool"] = fake.client_pool()
+        return AWSApi({"region_name": region, **(config_options or {})}, **kwargs)
+
+    return _aws_api
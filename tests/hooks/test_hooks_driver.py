@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+import pytest
+from external_resources_io.config import Config
+from pytest_mock import MockerFixture
+
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from hooks.driver import HookContext, main, run
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.plan_index import PlanIndex
+
+
+@pytest.fixture
+def ctx(
+    ai_input: AppInterfaceInput,
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> HookContext:
+    monkeypatch.setenv("DRY_RUN", "False")
+    ctx = HookContext(Config())
+    ctx.app_interface_input = ai_input
+    ctx.aws_api = mocker.create_autospec(spec=AWSApi, instance=True)
+    ctx.plan = PlanIndex([])
+    return ctx
+
+
+@pytest.fixture
+def phase_mains(mocker: MockerFixture) -> dict[str, MagicMock]:
+    return {
+        phase: mocker.patch(f"hooks.{phase}.main")
+        for phase in ("pre_run", "post_plan", "post_apply", "post_output")
+    }
+
+
+def test_run_shares_state(ctx: HookContext, phase_mains: dict[str, MagicMock]) -> None:
+    results = run(["pre_run", "post_plan", "post_apply", "post_output"], ctx)
+
+    assert [r.phase for r in results] == [
+        "pre_run",
+        "post_plan",
+        "post_apply",
+        "post_output",
+    ]
+    assert all(r.exit_code == 0 and r.seconds >= 0 for r in results)
+    phase_mains["pre_run"].assert_called_once_with(
+        ctx.app_interface_input, aws_api=ctx.aws_api
+    )
+    phase_mains["post_plan"].assert_called_once_with(
+        ctx.plan, ctx.app_interface_input, aws_api=ctx.aws_api
+    )
+    phase_mains["post_apply"].assert_called_once_with(
+        ctx.plan, ctx.app_interface_input, dry_run=False, aws_api=ctx.aws_api
+    )
+    phase_mains["post_output"].assert_called_once_with()
+
+
+def test_run_stops_at_failing_phase(
+    ctx: HookContext, phase_mains: dict[str, MagicMock]
+) -> None:
+    phase_mains["post_plan"].side_effect = SystemExit(1)
+
+    results = run(["pre_run", "post_plan", "post_apply"], ctx)
+
+    assert [(r.phase, r.exit_code) for r in results] == [
+        ("pre_run", 0),
+        ("post_plan", 1),
+    ]
+    phase_mains["post_apply"].assert_not_called()
+
+
+def test_hook_context_parses_input_once(
+    mocker: MockerFixture, ai_input: AppInterfaceInput
+) -> None:
+    mocker.patch("hooks.driver.read_input_from_file", return_value={})
+    parse_model = mocker.patch("hooks.driver.parse_model", return_value=ai_input)
+    ctx = HookContext(Config())
+
+    assert ctx.app_interface_input is ai_input
+    assert ctx.aws_api is ctx.aws_api
+    assert ctx.aws_api.region == ai_input.data.region
+    parse_model.assert_called_once()
+
+
+def test_main_exit_code(
+    mocker: MockerFixture, phase_mains: dict[str, MagicMock]
+) -> None:
+    mocker.patch("hooks.driver.HookContext")
+    phase_mains["pre_run"].side_effect = SystemExit(1)
+
+    with pytest.raises(SystemExit) as exc:
+        main(["pre_run", "post_output"])
+
+    assert exc.value.code == 1
+    phase_mains["post_output"].assert_not_called()
+
+
+def test_main_unknown_phase() -> None:
+    with pytest.raises(SystemExit):
+        main(["apply"])
@@ -1,5 +1,6 @@
 # ruff: noqa: DTZ005
 from datetime import datetime as dt
+from pathlib import Path
 
 import pytest
 from external_resources_io.terraform import (
@@ -15,7 +16,8 @@ from hooks.post_apply import (
     main,
     terraform_changes,
 )
-from hooks_lib.service_updates import ServiceUpdate
+from hooks_lib.checkpoint import CheckpointStatus, CheckpointStore
+from hooks_lib.service_updates import ServiceUpdate, ServiceUpdateResult
 
 SERVICE_UPDATE_ITEM = ServiceUpdate(
     name="update-1",
@@ -105,3 +107,121 @@ def test_main(  # noqa: PLR0913
         mock_service_updates_manager.return_value.apply_service_update.assert_called_once()
     else:
         mock_service_updates_manager.return_value.apply_service_update.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("statuses", "exit_code"),
+    [(["completed", "completed"], None), (["completed", "timed-out"], 1)],
+)
+def test_main_apply_all(
+    mocker: MockerFixture,
+    ai_input: AppInterfaceInput,
+    mock_plan: TerraformJsonPlanParser,
+    statuses: list[str],
+    exit_code: int | None,
+) -> None:
+    mock_service_updates_manager = mocker.patch(
+        "hooks.post_apply.ServiceUpdatesManager"
+    )
+    mock_service_updates_manager.return_value.converge.return_value = [
+        ServiceUpdateResult(name=f"update-{i}", status=status, seconds=60)
+        for i, status in enumerate(statuses)
+    ]
+    mocker.patch("hooks.post_apply.terraform_changes", return_value=False)
+    ai_input.data.service_updates_apply_all = True
+
+    if exit_code is None:
+        main(mock_plan, ai_input, dry_run=False)
+    else:
+        with pytest.raises(SystemExit) as exc:
+            main(mock_plan, ai_input, dry_run=False)
+        assert exc.value.code == exit_code
+    mock_service_updates_manager.return_value.converge.assert_called_once()
+    mock_service_updates_manager.return_value.apply_service_update.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("apply_all", "expected_update"), [(False, "update-1"), (True, "update-0")]
+)
+def test_main_no_wait(  # noqa: PLR0913
+    mocker: MockerFixture,
+    ai_input: AppInterfaceInput,
+    mock_plan: TerraformJsonPlanParser,
+    checkpoint_dir: Path,
+    *,
+    apply_all: bool,
+    expected_update: str,
+) -> None:
+    mock_service_updates_manager = mocker.patch(
+        "hooks.post_apply.ServiceUpdatesManager"
+    )
+    # most recent first
+    mock_service_updates_manager.return_value.service_updates.return_value = [
+        SERVICE_UPDATE_ITEM,
+        ServiceUpdate(
+            name="update-0",
+            release_date=dt(2024, 1, 1),  # noqa: DTZ001
+            severity="critical",
+            status="not-applied",
+            type="security",
+        ),
+    ]
+    mock_service_updates_manager.return_value.replication_group_id = (
+        ai_input.data.replication_group_id
+    )
+    mock_service_updates_manager.return_value.region = ai_input.data.region
+    mocker.patch("hooks.post_apply.resolve_checkpoint", return_value=None)
+    mocker.patch("hooks.post_apply.terraform_changes", return_value=False)
+    ai_input.data.service_updates_wait_for_completion = False
+    ai_input.data.service_updates_apply_all = apply_all
+
+    main(mock_plan, ai_input, dry_run=False)
+
+    [update] = (
+        mock_service_updates_manager.return_value.apply_service_update.call_args.args
+    )
+    assert update.name == expected_update
+    mock_service_updates_manager.return_value.converge.assert_not_called()
+    checkpoint = CheckpointStore(checkpoint_dir).load(
+        ai_input.data.region, ai_input.data.replication_group_id
+    )
+    assert checkpoint
+    assert checkpoint.service_update == expected_update
+
+
+@pytest.mark.parametrize(
+    ("status", "exit_code", "expected_apply_call"),
+    [
+        (CheckpointStatus.IN_PROGRESS, None, False),
+        (CheckpointStatus.COMPLETED, None, True),
+        (CheckpointStatus.FAILED, 1, False),
+    ],
+)
+def test_main_checkpoint(  # noqa: PLR0913
+    mocker: MockerFixture,
+    ai_input: AppInterfaceInput,
+    mock_plan: TerraformJsonPlanParser,
+    status: CheckpointStatus,
+    exit_code: int | None,
+    *,
+    expected_apply_call: bool,
+) -> None:
+    mock_service_updates_manager = mocker.patch(
+        "hooks.post_apply.ServiceUpdatesManager"
+    )
+    mock_service_updates_manager.return_value.service_updates.return_value = [
+        SERVICE_UPDATE_ITEM
+    ]
+    mocker.patch("hooks.post_apply.resolve_checkpoint", return_value=status)
+    mocker.patch("hooks.post_apply.terraform_changes", return_value=False)
+
+    if exit_code is None:
+        main(mock_plan, ai_input, dry_run=False)
+    else:
+        with pytest.raises(SystemExit) as exc:
+            main(mock_plan, ai_input, dry_run=False)
+        assert exc.value.code == exit_code
+    assert (
+        mock_service_updates_manager.return_value.apply_service_update.called
+        is expected_apply_call
+    )
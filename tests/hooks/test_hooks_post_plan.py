@@ -1,8 +1,13 @@
 # ruff: noqa: SLF001
-from collections.abc import Generator
+import asyncio
+import threading
+from collections.abc import Callable, Generator
+from datetime import UTC, datetime
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from botocore.exceptions import ClientError
 from external_resources_io.terraform import (
     Action,
     Change,
@@ -11,8 +16,18 @@ from external_resources_io.terraform import (
     TerraformJsonPlanParser,
 )
 
+from benchmarks.fake_aws import FakeAWS, FaultConfig
 from er_aws_elasticache.app_interface_input import AppInterfaceInput
-from hooks.post_plan import ElasticachePlanValidator, EngineInfo
+from er_aws_elasticache.engine_catalog import EngineCatalog, EngineVersion
+from er_aws_elasticache.parameter_catalog import ParameterCatalog, ParameterSpec
+from hooks.post_plan import (
+    ElasticachePlanValidator,
+    EngineInfo,
+    ParameterChange,
+    main,
+)
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.existence_index import EXISTENCE_INDEXES
 
 
 @pytest.fixture
@@ -20,12 +35,6 @@ def mock_aws_client() -> MagicMock:
     """Mock AWS ElastiCache client"""
     client = MagicMock()
 
-    # Mock describe_replication_groups
-    client.exceptions.ReplicationGroupNotFoundFault = Exception
-
-    # Mock describe_cache_parameters
-    client.exceptions.CacheParameterGroupNotFoundFault = Exception
-
     # Mock describe_cache_engine_versions
     client.describe_cache_engine_versions.return_value = {
         "CacheEngineVersions": [
@@ -47,6 +56,10 @@ def mock_aws_api(mock_aws_client: MagicMock) -> Generator[MagicMock, None, None]
         aws_api = MagicMock()
         aws_api.client = mock_aws_client
 
+        # Mock the existence index listings
+        aws_api.iter_replication_group_ids.return_value = ["existing-cluster"]
+        aws_api.iter_cache_parameter_group_names.return_value = ["existing-pg"]
+
         # Mock get_cache_group_subnets
         aws_api.get_cache_group_subnets.return_value = [
             {
@@ -75,6 +88,12 @@ def mock_aws_api(mock_aws_client: MagicMock) -> Generator[MagicMock, None, None]
         yield aws_api
 
 
+@pytest.fixture(autouse=True)
+def existence_indexes() -> None:
+    """Start every test with empty existence indexes"""
+    EXISTENCE_INDEXES.clear()
+
+
 @pytest.fixture
 def terraform_plan() -> MagicMock:
     """Mock TerraformJsonPlanParser"""
@@ -179,11 +198,12 @@ def test_validator_elasticache_replication_group_updates_empty(
 
 
 def test_validator_elasticache_replication_group_updates_with_changes(
+    terraform_plan: MagicMock,
     validator: ElasticachePlanValidator,
     replication_group_change: ResourceChange,
 ) -> None:
     """ElasticachePlanValidator: Test replication group updates with changes"""
-    validator.plan.plan.resource_changes = [replication_group_change]
+    terraform_plan.plan.resource_changes = [replication_group_change]
 
     updates = validator.elasticache_replication_group_updates
     assert len(updates) == 1
@@ -198,11 +218,12 @@ def test_validator_elasticache_parameter_group_updates_empty(
 
 
 def test_validator_elasticache_parameter_group_updates_with_changes(
+    terraform_plan: MagicMock,
     validator: ElasticachePlanValidator,
     parameter_group_change: ResourceChange,
 ) -> None:
     """ElasticachePlanValidator: Test parameter group updates with changes"""
-    validator.plan.plan.resource_changes = [parameter_group_change]
+    terraform_plan.plan.resource_changes = [parameter_group_change]
 
     updates = validator.elasticache_parameter_group_updates
     assert len(updates) == 1
@@ -220,6 +241,7 @@ def test_validator_elasticache_parameter_group_updates_with_changes(
     ],
 )
 def test_validator_replication_group_filter_by_actions(
+    terraform_plan: MagicMock,
     validator: ElasticachePlanValidator,
     actions: list[Action],
     *,
@@ -240,36 +262,43 @@ def test_validator_replication_group_filter_by_actions(
         ),
     )
 
-    validator.plan.plan.resource_changes = [change]
+    terraform_plan.plan.resource_changes = [change]
     updates = validator.elasticache_replication_group_updates
     assert bool(len(updates)) == should_include
 
 
 def test_replication_group_validate_id_not_exists(
-    validator: ElasticachePlanValidator, mock_aws_client: MagicMock
+    validator: ElasticachePlanValidator,
 ) -> None:
     """ReplicationGroup: Test validation when replication group doesn't exist (valid case)"""
-    mock_aws_client.describe_replication_groups.side_effect = (
-        mock_aws_client.exceptions.ReplicationGroupNotFoundFault()
-    )
-
     validator._validate_replication_group_id("new-cluster")
     assert validator.errors == []
 
 
+@pytest.mark.parametrize(
+    "replication_group_id", ["existing-cluster", "Existing-Cluster"]
+)
 def test_replication_group_validate_id_exists(
-    validator: ElasticachePlanValidator, mock_aws_client: MagicMock
+    validator: ElasticachePlanValidator, replication_group_id: str
 ) -> None:
     """ReplicationGroup: Test validation when replication group exists (error case)"""
-    mock_aws_client.describe_replication_groups.return_value = {
-        "ReplicationGroups": [{"ReplicationGroupId": "existing-cluster"}]
-    }
-
-    validator._validate_replication_group_id("existing-cluster")
+    validator._validate_replication_group_id(replication_group_id)
     assert len(validator.errors) == 1
     assert "already exists" in validator.errors[0]
 
 
+def test_replication_group_validate_id_shared_index(
+    terraform_plan: MagicMock, ai_input: AppInterfaceInput, mock_aws_api: MagicMock
+) -> None:
+    """ReplicationGroup: Test validators of the same account and region share one listing"""
+    for replication_group_id in ("cluster-1", "cluster-2", "existing-cluster"):
+        validator = ElasticachePlanValidator(terraform_plan, ai_input)
+        validator._validate_replication_group_id(replication_group_id)
+
+    assert validator.errors == ["Replication group ID existing-cluster already exists!"]
+    mock_aws_api.iter_replication_group_ids.assert_called_once_with()
+
+
 def test_replication_group_validate_subnets_same_vpc(
     validator: ElasticachePlanValidator,
     mock_aws_api: MagicMock,  # noqa: ARG001
@@ -425,13 +454,9 @@ def test_replication_group_validate_apply_immediately_for_version_change_correct
 
 
 def test_replication_group_validate_create(
-    validator: ElasticachePlanValidator, mock_aws_client: MagicMock
+    validator: ElasticachePlanValidator,
 ) -> None:
     """ReplicationGroup: Test complete replication group validation for create action"""
-    mock_aws_client.describe_replication_groups.side_effect = (
-        mock_aws_client.exceptions.ReplicationGroupNotFoundFault()
-    )
-
     validator._validate_replication_group(
         replication_group_id="test-cluster",
         subnet_group_name="test-subnet-group",
@@ -459,23 +484,17 @@ def test_replication_group_validate_update(
 
 
 def test_parameter_group_validate_name_not_exists(
-    validator: ElasticachePlanValidator, mock_aws_client: MagicMock
+    validator: ElasticachePlanValidator,
 ) -> None:
     """ParameterGroup: Test parameter group name validation when group doesn't exist"""
-    mock_aws_client.describe_cache_parameters.side_effect = (
-        mock_aws_client.exceptions.CacheParameterGroupNotFoundFault()
-    )
-
     validator._validate_parameter_group_name("new-pg")
     assert validator.errors == []
 
 
 def test_parameter_group_validate_name_exists(
-    validator: ElasticachePlanValidator, mock_aws_client: MagicMock
+    validator: ElasticachePlanValidator,
 ) -> None:
     """ParameterGroup: Test parameter group name validation when group exists"""
-    mock_aws_client.describe_cache_parameters.return_value = {"Parameters": []}
-
     validator._validate_parameter_group_name("existing-pg")
     assert len(validator.errors) == 1
     assert "already exists" in validator.errors[0]
@@ -503,13 +522,9 @@ def test_parameter_group_validate_family_mismatch(
 
 
 def test_parameter_group_validate_create(
-    validator: ElasticachePlanValidator, mock_aws_client: MagicMock
+    validator: ElasticachePlanValidator,
 ) -> None:
     """ParameterGroup: Test complete parameter group validation for create action"""
-    mock_aws_client.describe_cache_parameters.side_effect = (
-        mock_aws_client.exceptions.CacheParameterGroupNotFoundFault()
-    )
-
     engine_info = EngineInfo(name="redis", family="redis7.x", version="7.0.7")
 
     validator._validate_parameter_group_name("test-pg")
@@ -528,6 +543,220 @@ def test_parameter_group_validate_update(
     assert validator.errors == []
 
 
+def test_parameter_group_validate_parameters(
+    terraform_plan: MagicMock,
+    validator: ElasticachePlanValidator,
+    parameter_group_change: ResourceChange,
+    mock_aws_api: MagicMock,
+) -> None:
+    """ParameterGroup: Test parameters are validated against the parameter catalog"""
+    assert parameter_group_change.change
+    assert parameter_group_change.change.after
+    parameter_group_change.change.after["parameter"] = [
+        {"name": "maxmemory-policy", "value": "lru"},
+        {"name": "timeout", "value": "300"},
+    ]
+    terraform_plan.plan.resource_changes = [parameter_group_change]
+    catalog = ParameterCatalog(
+        family="redis7.x",
+        parameters=[
+            ParameterSpec(name="maxmemory-policy", allowed_values="allkeys-lru"),
+            ParameterSpec(name="timeout", data_type="integer", allowed_values="0,20-"),
+        ],
+        generated_at=datetime.now(tz=UTC),
+    )
+    with patch(
+        "hooks.post_plan.default_parameter_catalog", return_value=catalog
+    ) as default_parameter_catalog:
+        assert validator.validate() is False
+    default_parameter_catalog.assert_called_once_with("redis7.x")
+    assert validator.errors == [
+        "Parameter maxmemory-policy must be one of allkeys-lru, got 'lru'"
+    ]
+    mock_aws_api.iter_engine_default_parameters.assert_not_called()
+
+    # without a current catalog, the parameters are looked up in AWS
+    mock_aws_api.iter_engine_default_parameters.return_value = [
+        {"ParameterName": "maxmemory-policy", "AllowedValues": "lru"},
+        {"ParameterName": "timeout", "DataType": "integer"},
+    ]
+    validator = ElasticachePlanValidator(terraform_plan, validator.input)
+    with patch("hooks.post_plan.default_parameter_catalog", return_value=None):
+        assert validator.validate() is True
+    mock_aws_api.iter_engine_default_parameters.assert_called_once_with("redis7.x")
+
+
+def test_parameter_group_parameter_catalog_saved(
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    parameter_group_change: ResourceChange,
+    mock_aws_api: MagicMock,
+    parameter_catalog_dir: Path,
+) -> None:
+    """ParameterGroup: Test a parameter catalog from AWS is fetched once and saved"""
+    assert parameter_group_change.change
+    assert parameter_group_change.change.after
+    parameter_group_change.change.after["parameter"] = [
+        {"name": "timeout", "value": "10"}
+    ]
+    terraform_plan.plan.resource_changes = [parameter_group_change]
+    mock_aws_api.iter_engine_default_parameters.return_value = [
+        {"ParameterName": "timeout", "DataType": "integer", "AllowedValues": "0,20-"}
+    ]
+
+    for _ in range(2):
+        validator = ElasticachePlanValidator(terraform_plan, ai_input)
+        assert validator.validate() is False
+        assert validator.errors == ["Parameter timeout must be in 0,20-, got '10'"]
+    # the second run uses the saved catalog
+    mock_aws_api.iter_engine_default_parameters.assert_called_once_with("redis7.x")
+    assert (parameter_catalog_dir / "redis7.x.json").is_file()
+
+
+def test_parameter_group_parameter_catalog_unavailable(
+    terraform_plan: MagicMock,
+    validator: ElasticachePlanValidator,
+    parameter_group_change: ResourceChange,
+    mock_aws_api: MagicMock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """ParameterGroup: Test the parameters are not validated without a parameter catalog"""
+    assert parameter_group_change.change
+    assert parameter_group_change.change.after
+    parameter_group_change.change.after["parameter"] = [
+        {"name": "timeout", "value": "10"}
+    ]
+    terraform_plan.plan.resource_changes = [parameter_group_change]
+    mock_aws_api.iter_engine_default_parameters.side_effect = ClientError(
+        {"Error": {"Code": "AccessDenied", "Message": "denied"}},
+        "DescribeEngineDefaultParameters",
+    )
+
+    assert validator.validate() is True
+    assert "Skipping the parameter validation of redis7.x" in caplog.messages
+
+
+@pytest.fixture
+def parameter_catalog() -> Generator[ParameterCatalog, None, None]:
+    """The parameter catalog of every family"""
+    catalog = ParameterCatalog(
+        family="redis7.x",
+        parameters=[
+            ParameterSpec(name="maxmemory-policy", change_type="immediate"),
+            ParameterSpec(name="databases", change_type="requires-reboot"),
+            ParameterSpec(name="cluster-enabled", change_type="requires-reboot"),
+        ],
+        generated_at=datetime.now(tz=UTC),
+    )
+    with patch("hooks.post_plan.default_parameter_catalog", return_value=catalog):
+        yield catalog
+
+
+def test_parameter_changes(
+    validator: ElasticachePlanValidator,
+    parameter_catalog: ParameterCatalog,  # noqa: ARG001
+) -> None:
+    """ParameterGroup: Test the parameter diff and its classification"""
+    assert validator.parameter_changes(
+        "redis7.x",
+        [
+            {"name": "maxmemory-policy", "value": "allkeys-lru"},
+            {"name": "databases", "value": "16"},
+            {"name": "timeout", "value": "300"},
+        ],
+        [
+            {"name": "timeout", "value": 300},
+            {"name": "maxmemory-policy", "value": "volatile-lru"},
+            {"name": "cluster-enabled", "value": "yes"},
+        ],
+    ) == [
+        ParameterChange("cluster-enabled", None, "yes", "requires-reboot"),
+        ParameterChange("databases", "16", None, "requires-reboot"),
+        ParameterChange("maxmemory-policy", "allkeys-lru", "volatile-lru", "immediate"),
+    ]
+    assert validator.parameter_changes("redis7.x", None, []) == []
+
+
+def test_parameter_group_update_fetches_catalog_once(  # noqa: PLR0913, PLR0917
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    parameter_group_change: ResourceChange,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+) -> None:
+    """ParameterGroup: Test the reboot and parameter checks share one catalog lookup"""
+    # e.g. a read-only image, the fetched catalog cannot be saved
+    (tmp_path / "read-only").touch()
+    monkeypatch.setenv("PARAMETER_CATALOG_DIR", str(tmp_path / "read-only"))
+    fake.faults = FaultConfig(page_size=2)
+    fake.engine_default_parameters["redis7.x"] = [
+        {"ParameterName": "databases", "DataType": "integer"},
+        {"ParameterName": "maxmemory-policy", "ChangeType": "immediate"},
+        {"ParameterName": "timeout", "DataType": "integer"},
+    ]
+    assert parameter_group_change.change
+    assert parameter_group_change.change.after
+    parameter_group_change.change.actions = [Action.ActionUpdate]
+    parameter_group_change.change.before = parameter_group_change.change.after | {
+        "parameter": [{"name": "timeout", "value": "0"}]
+    }
+    parameter_group_change.change.after["parameter"] = [
+        {"name": "timeout", "value": "300"}
+    ]
+    terraform_plan.plan.resource_changes = [parameter_group_change]
+    validator = ElasticachePlanValidator(
+        terraform_plan,
+        ai_input,
+        aws_api=fake_aws_api(response_cache=None),
+    )
+
+    assert validator.validate() is True
+    # one paginated scan of two pages
+    assert fake.calls["DescribeEngineDefaultParameters"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("policy", "valid", "warnings"),
+    [("allow", True, 0), ("warn", True, 1), ("block", False, 0)],
+)
+def test_parameter_group_validate_reboot_policy(  # noqa: PLR0913, PLR0917
+    terraform_plan: MagicMock,
+    validator: ElasticachePlanValidator,
+    parameter_group_change: ResourceChange,
+    parameter_catalog: ParameterCatalog,  # noqa: ARG001
+    caplog: pytest.LogCaptureFixture,
+    policy: str,
+    valid: bool,  # noqa: FBT001
+    warnings: int,
+) -> None:
+    """ParameterGroup: Test reboot-required parameter changes follow the reboot policy"""
+    assert parameter_group_change.change
+    assert parameter_group_change.change.after
+    parameter_group_change.change.actions = [Action.ActionUpdate]
+    parameter_group_change.change.before = parameter_group_change.change.after | {
+        "parameter": [{"name": "databases", "value": "16"}]
+    }
+    parameter_group_change.change.after["parameter"] = [
+        {"name": "databases", "value": "32"},
+        {"name": "maxmemory-policy", "value": "allkeys-lru"},
+    ]
+    terraform_plan.plan.resource_changes = [parameter_group_change]
+    validator.input.data.parameter_group_reboot_policy = policy  # type: ignore[assignment]
+
+    assert validator.validate() is valid
+    assert [r.message for r in caplog.records if r.levelname == "WARNING"] == [
+        "Parameter group test-pg: changing databases requires a reboot of the cache nodes to take effect"
+    ] * warnings
+    if not valid:
+        assert validator.errors == [
+            "Parameter group test-pg: changing databases requires a reboot of the "
+            "cache nodes to take effect. Reboot the nodes after the apply and set "
+            "parameter_group_reboot_policy to 'warn' or 'allow' to proceed."
+        ]
+
+
 def test_validate_no_changes(validator: ElasticachePlanValidator) -> None:
     """Validate: Test validation with no changes"""
     result = validator.validate()
@@ -536,20 +765,13 @@ def test_validate_no_changes(validator: ElasticachePlanValidator) -> None:
 
 
 def test_validate_with_valid_changes(
+    terraform_plan: MagicMock,
     validator: ElasticachePlanValidator,
     replication_group_change: ResourceChange,
     parameter_group_change: ResourceChange,
-    mock_aws_client: MagicMock,
 ) -> None:
     """Validate: Test validation with valid changes"""
-    mock_aws_client.describe_replication_groups.side_effect = (
-        mock_aws_client.exceptions.ReplicationGroupNotFoundFault()
-    )
-    mock_aws_client.describe_cache_parameters.side_effect = (
-        mock_aws_client.exceptions.CacheParameterGroupNotFoundFault()
-    )
-
-    validator.plan.plan.resource_changes = [
+    terraform_plan.plan.resource_changes = [
         replication_group_change,
         parameter_group_change,
     ]
@@ -560,21 +782,17 @@ def test_validate_with_valid_changes(
 
 
 def test_validate_with_errors(
+    terraform_plan: MagicMock,
     validator: ElasticachePlanValidator,
     replication_group_change: ResourceChange,
     parameter_group_change: ResourceChange,
-    mock_aws_client: MagicMock,
+    mock_aws_api: MagicMock,
 ) -> None:
     """Validate: Test validation with errors"""
     # Make replication group exist (error condition)
-    mock_aws_client.describe_replication_groups.return_value = {
-        "ReplicationGroups": [{"ReplicationGroupId": "test-cluster"}]
-    }
-    mock_aws_client.describe_cache_parameters.side_effect = (
-        mock_aws_client.exceptions.CacheParameterGroupNotFoundFault()
-    )
+    mock_aws_api.iter_replication_group_ids.return_value = ["test-cluster"]
 
-    validator.plan.plan.resource_changes = [
+    terraform_plan.plan.resource_changes = [
         replication_group_change,
         parameter_group_change,
     ]
@@ -585,13 +803,10 @@ def test_validate_with_errors(
 
 
 def test_validate_multiple_replication_groups(
-    validator: ElasticachePlanValidator, mock_aws_client: MagicMock
+    terraform_plan: MagicMock,
+    validator: ElasticachePlanValidator,
 ) -> None:
     """Validate: Test validation with multiple replication groups"""
-    mock_aws_client.describe_replication_groups.side_effect = (
-        mock_aws_client.exceptions.ReplicationGroupNotFoundFault()
-    )
-
     changes = []
     for i in range(3):
         change = ResourceChange(
@@ -616,7 +831,7 @@ def test_validate_multiple_replication_groups(
         )
         changes.append(change)
 
-    validator.plan.plan.resource_changes = changes
+    terraform_plan.plan.resource_changes = changes
 
     result = validator.validate()
     assert result is True
@@ -660,7 +875,8 @@ def test_engine_version_family_mapping(
         ([Action.ActionCreate], "aws_instance", 0, 0),
     ],
 )
-def test_resource_filtering(
+def test_resource_filtering(  # noqa: PLR0913, PLR0917
+    terraform_plan: MagicMock,
     validator: ElasticachePlanValidator,
     actions: list[Action],
     resource_type: str,
@@ -679,10 +895,262 @@ def test_resource_filtering(
         ),
     )
 
-    validator.plan.plan.resource_changes = [change]
+    terraform_plan.plan.resource_changes = [change]
 
     rg_updates = validator.elasticache_replication_group_updates
     pg_updates = validator.elasticache_parameter_group_updates
 
     assert len(rg_updates) == expected_rg_count
     assert len(pg_updates) == expected_pg_count
+
+
+def test_validate_concurrent_lookups(
+    terraform_plan: MagicMock,
+    validator: ElasticachePlanValidator,
+    replication_group_change: ResourceChange,
+    mock_aws_api: MagicMock,
+) -> None:
+    """Validate: Test independent lookups run concurrently"""
+    # both lookups only pass the barrier if they run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def iter_replication_group_ids() -> list[str]:
+        barrier.wait()
+        return []
+
+    def get_cache_group_subnets(_: str) -> list[dict]:
+        barrier.wait()
+        return [{"SubnetIdentifier": "subnet-123"}]
+
+    mock_aws_api.iter_replication_group_ids.side_effect = iter_replication_group_ids
+    mock_aws_api.get_cache_group_subnets.side_effect = get_cache_group_subnets
+    terraform_plan.plan.resource_changes = [replication_group_change]
+
+    assert validator.validate() is True
+
+
+def test_validate_errors_deterministic(
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    mock_aws_api: MagicMock,
+) -> None:
+    """Validate: Test errors are merged in the same order as a sequential run"""
+    mock_aws_api.iter_replication_group_ids.return_value = [
+        f"test-cluster-{i}" for i in range(10)
+    ]
+    mock_aws_api.get_subnets.return_value = [{"SubnetId": "subnet-123"}]
+    terraform_plan.plan.resource_changes = [
+        ResourceChange(
+            type="aws_elasticache_replication_group",
+            name=f"test_{i}",
+            change=Change(
+                actions=[Action.ActionCreate],
+                after={
+                    "replication_group_id": f"test-cluster-{i}",
+                    "engine": "redis",
+                    "engine_version": "7.0.7",
+                    "subnet_group_name": "test-subnet-group",
+                    "security_group_ids": ["sg-123"],
+                },
+                after_unknown=None,
+            ),
+        )
+        for i in range(10)
+    ]
+
+    errors = []
+    for max_workers in (1, 8):
+        validator = ElasticachePlanValidator(
+            terraform_plan, ai_input, max_workers=max_workers
+        )
+        assert validator.validate() is False
+        errors.append(validator.errors)
+
+    assert errors[0] == errors[1]
+    assert errors[0][:2] == [
+        "Replication group ID test-cluster-0 already exists!",
+        "VpcId not found for subnet subnet-123",
+    ]
+
+    validator = ElasticachePlanValidator(terraform_plan, ai_input)
+    assert asyncio.run(validator.validate_async()) is False
+    assert validator.errors == errors[0]
+
+
+def test_validate_async(
+    terraform_plan: MagicMock,
+    validator: ElasticachePlanValidator,
+    replication_group_change: ResourceChange,
+    parameter_group_change: ResourceChange,
+    mock_aws_client: MagicMock,
+) -> None:
+    """Validate: Test the asyncio validation and its exceptions"""
+    terraform_plan.plan.resource_changes = [
+        replication_group_change,
+        parameter_group_change,
+    ]
+    assert asyncio.run(validator.validate_async()) is True
+    assert validator.errors == []
+
+    mock_aws_client.describe_cache_engine_versions.return_value = {
+        "CacheEngineVersions": []
+    }
+    validator.engine_catalog = EngineCatalog(
+        engine_versions=[], generated_at=datetime.now(tz=UTC)
+    )
+    with pytest.raises(ValueError, match="not available"):
+        asyncio.run(validator.validate_async())
+
+
+def test_validate_check_exception(
+    terraform_plan: MagicMock,
+    validator: ElasticachePlanValidator,
+    replication_group_change: ResourceChange,
+    mock_aws_client: MagicMock,
+) -> None:
+    """Validate: Test exceptions of concurrent checks are raised"""
+    mock_aws_client.describe_cache_engine_versions.return_value = {
+        "CacheEngineVersions": []
+    }
+    terraform_plan.plan.resource_changes = [replication_group_change]
+
+    with pytest.raises(ValueError, match="not available"):
+        validator.validate()
+
+
+@pytest.fixture
+def engine_catalog() -> EngineCatalog:
+    """Engine catalog with a single engine version"""
+    return EngineCatalog(
+        engine_versions=[
+            EngineVersion(engine="valkey", version="8.0", family="valkey8")
+        ],
+        generated_at=datetime.now(tz=UTC),
+    )
+
+
+def test_engine_version_from_catalog(
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    mock_aws_client: MagicMock,
+    engine_catalog: EngineCatalog,
+    mock_aws_api: MagicMock,  # noqa: ARG001
+) -> None:
+    """EngineVersion: Test engine versions are resolved from the engine catalog"""
+    validator = ElasticachePlanValidator(
+        terraform_plan, ai_input, engine_catalog=engine_catalog
+    )
+
+    engine_info = validator.get_engine_version("valkey", "8.0")
+    assert engine_info == EngineInfo(name="valkey", family="valkey8", version="8.0")
+    mock_aws_client.describe_cache_engine_versions.assert_not_called()
+
+    # catalog miss
+    engine_info = validator.get_engine_version("redis", "7.0.7")
+    assert engine_info.family == "redis7.x"
+    mock_aws_client.describe_cache_engine_versions.assert_called_once_with(
+        Engine="redis", EngineVersion="7.0.7"
+    )
+
+
+def test_engine_version_expired_catalog(
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    mock_aws_client: MagicMock,
+    engine_catalog: EngineCatalog,
+    mock_aws_api: MagicMock,  # noqa: ARG001
+) -> None:
+    """EngineVersion: Test an expired engine catalog is not used"""
+    engine_catalog.generated_at -= engine_catalog.ttl * 2
+    validator = ElasticachePlanValidator(
+        terraform_plan, ai_input, engine_catalog=engine_catalog
+    )
+
+    validator.get_engine_version("valkey", "8.0")
+    mock_aws_client.describe_cache_engine_versions.assert_called_once_with(
+        Engine="valkey", EngineVersion="8.0"
+    )
+
+
+def test_engine_version_missing_catalog(
+    validator: ElasticachePlanValidator,
+    mock_aws_client: MagicMock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """EngineVersion: Test a missing engine catalog is reported as missing"""
+    with patch("hooks.post_plan.default_engine_catalog", return_value=None):
+        engine_info = validator.get_engine_version("redis", "7.0.7")
+    assert engine_info.family == "redis7.x"
+    mock_aws_client.describe_cache_engine_versions.assert_called_once()
+    assert caplog.messages == [
+        "No engine catalog is installed (make engine-catalog). Using the AWS API instead."
+    ]
+
+
+@pytest.mark.parametrize("valid", [True, False])
+def test_main(
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    mock_aws_api: MagicMock,
+    replication_group_change: ResourceChange,
+    *,
+    valid: bool,
+) -> None:
+    """Main: Test exit code and the shared AWS API"""
+    terraform_plan.plan.resource_changes = [replication_group_change]
+    with (
+        patch.object(ElasticachePlanValidator, "validate", return_value=valid),
+        patch("hooks.post_plan.AWSApi") as aws_api_class,
+        patch("sys.exit") as sys_exit,
+    ):
+        main(terraform_plan, ai_input, aws_api=mock_aws_api)
+
+    aws_api_class.assert_not_called()
+    if valid:
+        sys_exit.assert_not_called()
+    else:
+        sys_exit.assert_called_once_with(1)
+
+
+@pytest.mark.parametrize(
+    "actions", [[Action.ActionNoop], [Action.ActionDelete], [Action.ActionRead]]
+)
+def test_main_no_elasticache_changes(
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    replication_group_change: ResourceChange,
+    actions: list[Action],
+) -> None:
+    """Main: Test plans without ElastiCache creates or updates never touch AWS"""
+    assert replication_group_change.change
+    replication_group_change.change.actions = actions
+    terraform_plan.plan.resource_changes = [replication_group_change]
+    with (
+        patch.object(ElasticachePlanValidator, "validate") as validate,
+        patch("hooks.post_plan.AWSApi") as aws_api_class,
+        patch("sys.exit") as sys_exit,
+    ):
+        main(terraform_plan, ai_input)
+
+    validate.assert_not_called()
+    aws_api_class.assert_not_called()
+    sys_exit.assert_not_called()
+
+
+def test_validator_lazy_aws_api(
+    terraform_plan: MagicMock,
+    ai_input: AppInterfaceInput,
+    parameter_group_change: ResourceChange,
+) -> None:
+    """ElasticachePlanValidator: Test AWS is only set up when a check needs it"""
+    assert parameter_group_change.change
+    parameter_group_change.change.actions = [Action.ActionUpdate]
+    terraform_plan.plan.resource_changes = [parameter_group_change]
+    with patch("hooks.post_plan.AWSApi") as aws_api_class:
+        validator = ElasticachePlanValidator(terraform_plan, ai_input)
+        assert validator.validate() is True
+        assert asyncio.run(validator.validate_async()) is True
+        aws_api_class.assert_not_called()
+
+        assert validator.aws_api is aws_api_class.return_value
+    aws_api_class.assert_called_once_with(config_options={"region_name": "us-east-1"})
@@ -3,6 +3,7 @@ from pytest_mock import MockerFixture
 
 from er_aws_elasticache.app_interface_input import AppInterfaceInput
 from hooks.pre_run import main
+from hooks_lib.checkpoint import CheckpointStatus
 from hooks_lib.service_updates import ServiceUpdatesManager
 
 
@@ -24,3 +25,34 @@ def test_main(
         sys_exit_mock.assert_called_once_with(1)
     else:
         sys_exit_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("status", "exit_code"),
+    [
+        (None, None),
+        (CheckpointStatus.COMPLETED, None),
+        (CheckpointStatus.IN_PROGRESS, 1),
+        (CheckpointStatus.FAILED, 1),
+    ],
+)
+def test_main_checkpoint(
+    mocker: MockerFixture,
+    ai_input: AppInterfaceInput,
+    status: CheckpointStatus | None,
+    exit_code: int | None,
+) -> None:
+    mocker.patch("hooks.pre_run.resolve_checkpoint", return_value=status)
+    mocker.patch.object(
+        ServiceUpdatesManager,
+        "update_in_progress",
+        new_callable=mocker.PropertyMock,
+        return_value=False,
+    )
+
+    if exit_code is None:
+        main(ai_input)
+    else:
+        with pytest.raises(SystemExit) as exc:
+            main(ai_input)
+        assert exc.value.code == exit_code
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+import pytest
+
+from benchmarks.fake_aws import FakeAWS
+from hooks_lib.async_aws_api import AsyncAWSApi
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.service_updates import AsyncServiceUpdatesManager, ServiceUpdate
+from hooks_lib.waiter import WaiterConfig
+
+
+def _update_action(replication_group_id: str) -> dict:
+    return {
+        "ReplicationGroupId": replication_group_id,
+        "ServiceUpdateName": "update-1",
+        "ServiceUpdateReleaseDate": datetime(2024, 1, 1, tzinfo=UTC),
+        "ServiceUpdateSeverity": "critical",
+        "ServiceUpdateType": "security-update",
+        "UpdateActionStatus": "not-applied",
+    }
+
+
+@pytest.fixture
+def fake(fake: FakeAWS) -> FakeAWS:
+    fake.update_actions = [_update_action(f"rg-{i}") for i in range(5)]
+    fake.cache_subnet_groups["default"] = {
+        "CacheSubnetGroupName": "default",
+        "VpcId": "vpc-1",
+        "Subnets": [{"SubnetIdentifier": "subnet-1"}],
+    }
+    fake.subnets = [{"SubnetId": "subnet-1", "VpcId": "vpc-1"}]
+    fake.security_groups = [{"GroupId": "sg-1", "GroupName": "sg", "VpcId": "vpc-1"}]
+    return fake
+
+
+@pytest.fixture
+def aws_api(fake_aws_api: Callable[..., AWSApi]) -> AsyncAWSApi:
+    return AsyncAWSApi(fake_aws_api(), concurrency=2)
+
+
+def test_methods(aws_api: AsyncAWSApi) -> None:
+    async def lookups() -> tuple:
+        return await asyncio.gather(
+            aws_api.get_cache_group_subnets("default"),
+            aws_api.get_subnets(["subnet-1"]),
+            aws_api.get_security_groups(["sg-1"]),
+            aws_api.get_service_updates("rg-1"),
+            aws_api.batch_apply_service_updates("rg-2", "update-1"),
+        )
+
+    cache_group_subnets, subnets, security_groups, updates, processed = asyncio.run(
+        lookups()
+    )
+    assert cache_group_subnets == [{"SubnetIdentifier": "subnet-1"}]
+    assert subnets[0]["VpcId"] == "vpc-1"
+    assert security_groups[0]["GroupId"] == "sg-1"
+    assert [u["ServiceUpdateName"] for u in updates] == ["update-1"]
+    assert processed["UpdateActionStatus"] == "in-progress"
+    assert aws_api.region == "us-east-1"
+
+
+def test_concurrency_limit(aws_api: AsyncAWSApi) -> None:
+    lock = threading.Lock()
+    running = peak = 0
+
+    def call() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    async def calls() -> None:
+        await asyncio.gather(*(aws_api.run(call) for _ in range(10)))
+
+    asyncio.run(calls())
+    assert peak == aws_api.concurrency
+
+
+def test_invalid_concurrency() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        AsyncAWSApi(concurrency=0)
+
+
+def test_manager(fake: FakeAWS, aws_api: AsyncAWSApi) -> None:
+    managers = [
+        AsyncServiceUpdatesManager(f"rg-{i}", "us-east-1", aws_api=aws_api)
+        for i in range(5)
+    ]
+
+    async def updates() -> list[list[ServiceUpdate]]:
+        return await asyncio.gather(
+            *(
+                m.service_updates(
+                    ["security-update"], ["critical"], datetime.now(tz=UTC), limit=1
+                )
+                for m in managers
+            )
+        )
+
+    assert [[u.name for u in us] for us in asyncio.run(updates())] == [["update-1"]] * 5
+
+    async def complete_later() -> None:
+        await asyncio.sleep(0.05)
+        fake.update_actions[0]["UpdateActionStatus"] = "complete"
+
+    async def apply() -> None:
+        update = (
+            await managers[0].service_updates(
+                ["security-update"], ["critical"], datetime.now(tz=UTC)
+            )
+        )[0]
+        await asyncio.gather(
+            managers[0].apply_service_update(
+                update,
+                wait_for_completion=True,
+                waiter_config=WaiterConfig(initial_delay=0.01, jitter=0),
+            ),
+            complete_later(),
+        )
+
+    asyncio.run(apply())
+    assert asyncio.run(managers[0].update_action_status("update-1")) == "complete"
+    assert asyncio.run(managers[0].update_in_progress()) is False
@@ -1,3 +1,7 @@
+from collections.abc import Iterator
+from datetime import UTC
+from datetime import datetime as dt
+
 import pytest
 from pytest_mock import MockerFixture
 
@@ -70,23 +74,99 @@ def test_get_service_updates(mocker: MockerFixture, aws_api: AWSApi) -> None:
     mock_client = mocker.PropertyMock()
     mocker.patch.object(type(aws_api), "client", new=mock_client)
 
-    mock_client_instance = mock_client.return_value
-    expected_updates = [
-        {"ServiceUpdateName": "update-1", "ServiceUpdateReleaseDate": "2025-01-01"}
-    ]
-    mock_client_instance.describe_update_actions.return_value = {
-        "UpdateActions": expected_updates
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    update_1 = {
+        "ServiceUpdateName": "update-1",
+        "ServiceUpdateReleaseDate": "2025-01-01",
     }
+    update_2 = {
+        "ServiceUpdateName": "update-2",
+        "ServiceUpdateReleaseDate": "2025-02-01",
+    }
+    update_3 = {
+        "ServiceUpdateName": "update-3",
+        "ServiceUpdateReleaseDate": "2024-12-01",
+    }
+    mock_paginator.paginate.return_value = [
+        {"UpdateActions": [update_1, update_2]},
+        {"UpdateActions": [update_3]},
+    ]
 
     result = aws_api.get_service_updates("replication-group-id")
-    assert result == expected_updates
+    assert result == [update_2, update_1, update_3]
+
+    mock_client.return_value.get_paginator.assert_called_once_with(
+        "describe_update_actions"
+    )
+    mock_paginator.paginate.assert_called_once_with(
+        ReplicationGroupIds=["replication-group-id"],
+        ServiceUpdateStatus=["available"],
+    )
+
+
+def test_get_service_updates_limit(mocker: MockerFixture, aws_api: AWSApi) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    mock_paginator.paginate.return_value = [
+        {
+            "UpdateActions": [
+                {"ServiceUpdateName": f"update-{i}", "ServiceUpdateReleaseDate": i}
+                for i in range(100)
+            ]
+        }
+    ]
+
+    result = aws_api.get_service_updates("replication-group-id", limit=2)
+    assert [u["ServiceUpdateName"] for u in result] == ["update-99", "update-98"]
+
+
+def test_iter_service_updates_status_filter(
+    mocker: MockerFixture, aws_api: AWSApi
+) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
 
-    mock_client_instance.describe_update_actions.assert_called_once_with(
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    mock_paginator.paginate.return_value = [
+        {"UpdateActions": [{"ServiceUpdateName": "update-1"}]}
+    ]
+
+    result = list(
+        aws_api.iter_service_updates("replication-group-id", status=["in-progress"])
+    )
+    assert result == [{"ServiceUpdateName": "update-1"}]
+
+    mock_paginator.paginate.assert_called_once_with(
         ReplicationGroupIds=["replication-group-id"],
         ServiceUpdateStatus=["available"],
+        UpdateActionStatus=["in-progress"],
     )
 
 
+def test_iter_service_updates_early_exit(
+    mocker: MockerFixture, aws_api: AWSApi
+) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    pages_fetched = []
+
+    def pages() -> Iterator[dict]:
+        for i in range(3):
+            pages_fetched.append(i)
+            yield {"UpdateActions": [{"ServiceUpdateName": f"update-{i}"}]}
+
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    mock_paginator.paginate.return_value = pages()
+
+    assert next(aws_api.iter_service_updates("replication-group-id")) == {
+        "ServiceUpdateName": "update-0"
+    }
+    assert pages_fetched == [0]
+
+
 def test_batch_apply_service_updates(mocker: MockerFixture, aws_api: AWSApi) -> None:
     mock_client = mocker.PropertyMock()
     mocker.patch.object(type(aws_api), "client", new=mock_client)
@@ -104,3 +184,129 @@ def test_batch_apply_service_updates(mocker: MockerFixture, aws_api: AWSApi) ->
     mock_client_instance.batch_apply_update_action.assert_called_once_with(
         ReplicationGroupIds=["rg-1"], ServiceUpdateName="update-1"
     )
+
+
+def test_iter_events(mocker: MockerFixture, aws_api: AWSApi) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    mock_paginator.paginate.return_value = [
+        {"Events": [{"Message": "event-3"}, {"Message": "event-2"}]},
+        {"Events": [{"Message": "event-1"}]},
+    ]
+
+    result = list(aws_api.iter_events("rg-1", start_time=dt(2025, 1, 1, tzinfo=UTC)))
+    assert [e["Message"] for e in result] == ["event-1", "event-2", "event-3"]
+    mock_client.return_value.get_paginator.assert_called_once_with("describe_events")
+    mock_paginator.paginate.assert_called_once_with(
+        SourceIdentifier="rg-1",
+        SourceType="replication-group",
+        StartTime=dt(2025, 1, 1, tzinfo=UTC),
+    )
+
+
+def test_iter_update_actions_chunks(mocker: MockerFixture, aws_api: AWSApi) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    mock_paginator.paginate.side_effect = lambda **kwargs: [
+        {
+            "UpdateActions": [
+                {"ReplicationGroupId": rg} for rg in kwargs["ReplicationGroupIds"]
+            ]
+        }
+    ]
+    replication_group_ids = [f"rg-{i}" for i in range(45)]
+
+    result = list(aws_api.iter_update_actions(replication_group_ids))
+    assert [u["ReplicationGroupId"] for u in result] == replication_group_ids
+    assert [
+        len(c.kwargs["ReplicationGroupIds"])
+        for c in mock_paginator.paginate.call_args_list
+    ] == [20, 20, 5]
+
+
+def test_batch_apply_update_action_chunks(
+    mocker: MockerFixture, aws_api: AWSApi
+) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    mock_client_instance = mock_client.return_value
+    mock_client_instance.batch_apply_update_action.side_effect = lambda **kwargs: {
+        "ProcessedUpdateActions": [
+            {"ReplicationGroupId": rg} for rg in kwargs["ReplicationGroupIds"][1:]
+        ],
+        "UnprocessedUpdateActions": [
+            {"ReplicationGroupId": kwargs["ReplicationGroupIds"][0]}
+        ],
+    }
+    replication_group_ids = [f"rg-{i}" for i in range(25)]
+
+    processed, unprocessed = aws_api.batch_apply_update_action(
+        replication_group_ids, "update-1"
+    )
+    assert len(processed) == 23  # noqa: PLR2004
+    assert unprocessed == [
+        {"ReplicationGroupId": "rg-0"},
+        {"ReplicationGroupId": "rg-20"},
+    ]
+    assert mock_client_instance.batch_apply_update_action.call_count == 2  # noqa: PLR2004
+
+
+def test_batch_apply_service_updates_unprocessed(
+    mocker: MockerFixture, aws_api: AWSApi
+) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    mock_client.return_value.batch_apply_update_action.return_value = {
+        "ProcessedUpdateActions": [],
+        "UnprocessedUpdateActions": [{"ReplicationGroupId": "rg-1"}],
+    }
+
+    with pytest.raises(ValueError, match="Failed to apply service update"):
+        aws_api.batch_apply_service_updates("rg-1", "update-1")
+
+
+def test_iter_replication_group_ids(mocker: MockerFixture, aws_api: AWSApi) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    mock_paginator.paginate.return_value = [
+        {"ReplicationGroups": [{"ReplicationGroupId": "rg-1"}]},
+        {"ReplicationGroups": [{"ReplicationGroupId": "rg-2"}]},
+    ]
+
+    assert list(aws_api.iter_replication_group_ids()) == ["rg-1", "rg-2"]
+    mock_client.return_value.get_paginator.assert_called_once_with(
+        "describe_replication_groups"
+    )
+
+
+def test_iter_cache_parameter_group_names(
+    mocker: MockerFixture, aws_api: AWSApi
+) -> None:
+    mock_client = mocker.PropertyMock()
+    mocker.patch.object(type(aws_api), "client", new=mock_client)
+
+    mock_paginator = mock_client.return_value.get_paginator.return_value
+    mock_paginator.paginate.return_value = [
+        {"CacheParameterGroups": [{"CacheParameterGroupName": "pg-1"}]},
+    ]
+
+    assert list(aws_api.iter_cache_parameter_group_names()) == ["pg-1"]
+    mock_client.return_value.get_paginator.assert_called_once_with(
+        "describe_cache_parameter_groups"
+    )
+
+
+def test_account_key(mocker: MockerFixture, aws_api: AWSApi) -> None:
+    account_id = mocker.patch.object(
+        type(aws_api.client_pool), "account_id", return_value="123456789012"
+    )
+    assert aws_api.account_key == "123456789012"
+    account_id.assert_called_once_with("us-east-1")
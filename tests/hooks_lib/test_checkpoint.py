@@ -0,0 +1,78 @@
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_aws import FakeAWS
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.checkpoint import (
+    Checkpoint,
+    CheckpointStatus,
+    CheckpointStore,
+    resolve_checkpoint,
+)
+from hooks_lib.service_updates import ServiceUpdatesManager
+
+CHECKPOINT = Checkpoint(
+    replication_group_id="rg-1",
+    region="us-east-1",
+    service_update="update-1",
+    started_at=datetime(2025, 1, 1, tzinfo=UTC),
+)
+
+
+def test_store(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path / "checkpoints")
+    assert store.load("us-east-1", "rg-1") is None
+    store.save(CHECKPOINT)
+    assert store.load("us-east-1", "rg-1") == CHECKPOINT
+    assert store.load("eu-west-1", "rg-1") is None
+    store.delete("us-east-1", "rg-1")
+    assert store.load("us-east-1", "rg-1") is None
+    store.delete("us-east-1", "rg-1")
+
+
+def test_store_from_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SERVICE_UPDATE_CHECKPOINT_DIR", str(tmp_path))
+    assert CheckpointStore.from_env().directory == tmp_path
+
+
+@pytest.mark.parametrize(
+    ("action_status", "expected"),
+    [
+        ("in-progress", CheckpointStatus.IN_PROGRESS),
+        ("complete", CheckpointStatus.COMPLETED),
+        ("not-applicable", CheckpointStatus.COMPLETED),
+        ("stopped", CheckpointStatus.FAILED),
+        (None, CheckpointStatus.FAILED),
+    ],
+)
+def test_resolve_checkpoint(
+    tmp_path: Path,
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+    action_status: str | None,
+    expected: CheckpointStatus,
+) -> None:
+    if action_status:
+        fake.update_actions = [
+            {
+                "ReplicationGroupId": "rg-1",
+                "ServiceUpdateName": "update-1",
+                "ServiceUpdateReleaseDate": datetime(2024, 12, 1, tzinfo=UTC),
+                "ServiceUpdateSeverity": "critical",
+                "ServiceUpdateType": "security-update",
+                "UpdateActionStatus": action_status,
+            }
+        ]
+    manager = ServiceUpdatesManager("rg-1", "us-east-1", aws_api=fake_aws_api())
+    store = CheckpointStore(tmp_path)
+    assert resolve_checkpoint(manager, store) is None
+
+    store.save(CHECKPOINT)
+    assert resolve_checkpoint(manager, store) == expected
+    # only a finished update removes the checkpoint
+    assert (store.load("us-east-1", "rg-1") is None) == (
+        expected != CheckpointStatus.IN_PROGRESS
+    )
@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from boto3 import Session
+from pytest_mock import MockerFixture
+
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.client_pool import ClientPool
+
+
+@pytest.fixture
+def client_pool() -> ClientPool:
+    return ClientPool()
+
+
+def test_client_pool_reuses_clients(client_pool: ClientPool) -> None:
+    client = client_pool.client("elasticache", {"region_name": "us-east-1"})
+    assert client is client_pool.client("elasticache", {"region_name": "us-east-1"})
+    assert len(client_pool) == 1
+
+
+@pytest.mark.parametrize(
+    ("service_name", "config_options"),
+    [
+        ("ec2", {"region_name": "us-east-1"}),
+        ("elasticache", {"region_name": "eu-west-1"}),
+        ("elasticache", {"region_name": "us-east-1", "retries": {"max_attempts": 3}}),
+    ],
+)
+def test_client_pool_keys(
+    client_pool: ClientPool, service_name: str, config_options: dict
+) -> None:
+    client = client_pool.client("elasticache", {"region_name": "us-east-1"})
+    assert client is not client_pool.client(service_name, config_options)
+    assert len(client_pool) == 2  # noqa: PLR2004
+
+
+def test_client_pool_keeps_config_options(client_pool: ClientPool) -> None:
+    options = {"region_name": "us-east-1", "retries": {"mode": "adaptive"}}
+    client = client_pool.client("elasticache", options)
+    assert options == {"region_name": "us-east-1", "retries": {"mode": "adaptive"}}
+    assert client is client_pool.client("elasticache", options)
+
+
+def test_client_pool_shares_session(client_pool: ClientPool) -> None:
+    elasticache = client_pool.client("elasticache", {"region_name": "us-east-1"})
+    ec2 = client_pool.client("ec2", {"region_name": "us-east-1"})
+    assert elasticache.meta.region_name == ec2.meta.region_name == "us-east-1"
+    assert client_pool.session is client_pool.session
+
+
+def test_client_pool_thread_safe(client_pool: ClientPool) -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(
+            executor.map(
+                lambda _: client_pool.client(
+                    "elasticache", {"region_name": "us-east-1"}
+                ),
+                range(32),
+            )
+        )
+    assert all(c is clients[0] for c in clients)
+    assert len(client_pool) == 1
+
+
+def test_client_pool_clear(client_pool: ClientPool) -> None:
+    client = client_pool.client("elasticache", {"region_name": "us-east-1"})
+    client_pool.clear()
+    assert len(client_pool) == 0
+    assert client is not client_pool.client("elasticache", {"region_name": "us-east-1"})
+
+
+def test_aws_api_uses_client_pool(client_pool: ClientPool) -> None:
+    aws_api = AWSApi(
+        config_options={"region_name": "us-east-1"}, client_pool=client_pool
+    )
+    other = AWSApi(config_options={"region_name": "us-east-1"}, client_pool=client_pool)
+    assert aws_api.client is other.client
+    assert aws_api.ec2_client is other.ec2_client
+    assert len(client_pool) == 2  # noqa: PLR2004
+
+
+def test_client_pool_instrumentation(client_pool: ClientPool) -> None:
+    instrumented: list[object] = []
+    client = client_pool.client(
+        "elasticache",
+        {"region_name": "us-east-1"},
+        instrumentation="a",
+        setup=instrumented.append,
+    )
+    assert client is client_pool.client(
+        "elasticache",
+        {"region_name": "us-east-1"},
+        instrumentation="a",
+        setup=instrumented.append,
+    )
+    assert instrumented == [client]
+    assert client is not client_pool.client(
+        "elasticache", {"region_name": "us-east-1"}, instrumentation="b"
+    )
+
+
+def test_client_pool_account_id_static_credentials(mocker: MockerFixture) -> None:
+    session = Session(
+        aws_access_key_id="AKIAEXAMPLE",
+        aws_secret_access_key="secret",  # noqa: S106
+        aws_account_id="123456789012",
+    )
+    client = mocker.patch.object(session, "client")
+    assert ClientPool(session).account_id() == "123456789012"
+    client.assert_not_called()
+
+
+def test_client_pool_account_id_role_arn(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    (tmp_path / "config").write_text(
+        "[profile base]\n"
+        "aws_access_key_id = AKIAEXAMPLE\n"
+        "aws_secret_access_key = secret\n"
+        "[profile role]\n"
+        "role_arn = arn:aws:iam::123456789012:role/er-elasticache\n"
+        "source_profile = base\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("AWS_CONFIG_FILE", str(tmp_path / "config"))
+    session = Session(profile_name="role", region_name="us-east-1")
+    # neither assumes the role nor asks STS
+    client = mocker.patch.object(session, "client")
+    assert ClientPool(session).account_id() == "123456789012"
+    client.assert_not_called()
+
+
+def test_client_pool_account_id_sts(mocker: MockerFixture) -> None:
+    session = Session(
+        aws_access_key_id="AKIAEXAMPLE",
+        aws_secret_access_key="secret",  # noqa: S106
+    )
+    client = mocker.patch.object(session, "client")
+    client.return_value.get_caller_identity.return_value = {"Account": "210987654321"}
+    pool = ClientPool(session)
+    assert pool.account_id("eu-west-1") == "210987654321"
+    assert pool.account_id("eu-west-1") == "210987654321"
+    client.assert_called_once_with("sts", region_name="eu-west-1")
+
+
+def test_client_pool_account_id_anonymous(mocker: MockerFixture) -> None:
+    session = Session()
+    mocker.patch.object(session, "get_credentials", return_value=None)
+    assert ClientPool(session).account_id() == "anonymous"
@@ -0,0 +1,29 @@
+from pytest_mock import MockerFixture
+
+from er_aws_elasticache.engine_catalog import EngineVersion
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.engine_catalog import build_engine_catalog
+
+
+def test_build_engine_catalog(mocker: MockerFixture) -> None:
+    aws_api = mocker.create_autospec(spec=AWSApi, spec_set=True, instance=True)
+    aws_api.iter_cache_engine_versions.return_value = [
+        {
+            "Engine": "valkey",
+            "EngineVersion": "8.0",
+            "CacheParameterGroupFamily": "valkey8",
+            "CacheEngineDescription": "Valkey",
+        },
+        {
+            "Engine": "redis",
+            "EngineVersion": "6.2",
+            "CacheParameterGroupFamily": "redis6.x",
+        },
+    ]
+
+    catalog = build_engine_catalog(aws_api)
+    assert catalog.engine_versions == [
+        EngineVersion(engine="redis", version="6.2", family="redis6.x"),
+        EngineVersion(engine="valkey", version="8.0", family="valkey8"),
+    ]
+    assert not catalog.expired
@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.existence_index import ExistenceIndex, ExistenceIndexRegistry
+
+
+@pytest.fixture
+def aws_api(mocker: MockerFixture) -> MagicMock:
+    aws_api = mocker.create_autospec(spec=AWSApi, instance=True)
+    aws_api.region = "us-east-1"
+    aws_api.account_key = "123456789012"
+    aws_api.iter_replication_group_ids.return_value = ["rg-1", "rg-2"]
+    aws_api.iter_cache_parameter_group_names.return_value = ["default.redis7", "pg-1"]
+    return aws_api
+
+
+def test_existence_index_replication_groups(aws_api: MagicMock) -> None:
+    index = ExistenceIndex(aws_api)
+    assert index.replication_group_exists("rg-1")
+    assert index.replication_group_exists("RG-2")
+    assert not index.replication_group_exists("rg-3")
+    aws_api.iter_replication_group_ids.assert_called_once_with()
+    aws_api.iter_cache_parameter_group_names.assert_not_called()
+
+
+def test_existence_index_parameter_groups(aws_api: MagicMock) -> None:
+    index = ExistenceIndex(aws_api)
+    assert index.parameter_group_exists("pg-1")
+    assert not index.parameter_group_exists("pg-2")
+    assert index.parameter_group_names == {"default.redis7", "pg-1"}
+    aws_api.iter_cache_parameter_group_names.assert_called_once_with()
+    aws_api.iter_replication_group_ids.assert_not_called()
+
+
+def test_existence_index_registry(aws_api: MagicMock, mocker: MockerFixture) -> None:
+    registry = ExistenceIndexRegistry()
+    index = registry.get(aws_api)
+    assert registry.get(aws_api) is index
+
+    other_region = mocker.create_autospec(spec=AWSApi, instance=True)
+    other_region.region = "eu-west-1"
+    other_region.account_key = aws_api.account_key
+    assert registry.get(other_region) is not index
+
+    other_account = mocker.create_autospec(spec=AWSApi, instance=True)
+    other_account.region = aws_api.region
+    other_account.account_key = "210987654321"
+    assert registry.get(other_account) is not index
+
+    registry.clear()
+    assert registry.get(aws_api) is not index
@@ -0,0 +1,237 @@
+import json
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from benchmarks.fake_aws import FakeAWS
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.fleet import (
+    FleetConfig,
+    FleetOrchestrator,
+    FleetStateStore,
+    FleetTarget,
+    TargetState,
+    TargetStatus,
+    main,
+)
+from hooks_lib.response_cache import RESPONSE_CACHE
+
+
+def _target(
+    replication_group_id: str,
+    region: str = "us-east-1",
+    environment: str = "production",
+    *,
+    service_updates_enabled: bool = True,
+) -> FleetTarget:
+    return FleetTarget(
+        replication_group_id=replication_group_id,
+        region=region,
+        environment=environment,
+        service_updates_types=("security-update",),
+        severities=("critical",),
+        service_updates_enabled=service_updates_enabled,
+    )
+
+
+def _update_action(
+    replication_group_id: str, name: str, status: str = "not-applied"
+) -> dict:
+    return {
+        "ReplicationGroupId": replication_group_id,
+        "ServiceUpdateName": name,
+        "ServiceUpdateReleaseDate": datetime(2024, 1, 1, tzinfo=UTC),
+        "ServiceUpdateSeverity": "critical",
+        "ServiceUpdateType": "security-update",
+        "ServiceUpdateStatus": "available",
+        "UpdateActionStatus": status,
+    }
+
+
+@pytest.fixture
+def fake(fake: FakeAWS) -> FakeAWS:
+    fake.update_actions = [
+        _update_action("rg-1", "update-1"),
+        _update_action("rg-2", "update-1", status="in-progress"),
+    ]
+    return fake
+
+
+@pytest.fixture
+def orchestrator(
+    fake_aws_api: Callable[..., AWSApi],
+) -> Callable[..., FleetOrchestrator]:
+    def _orchestrator(
+        config: FleetConfig, state: FleetStateStore | None = None
+    ) -> FleetOrchestrator:
+        return FleetOrchestrator(config, state, aws_api_factory=fake_aws_api)
+
+    return _orchestrator
+
+
+def test_from_input(ai_input: AppInterfaceInput) -> None:
+    target = FleetTarget.from_input(ai_input)
+    assert target.key == "us-east-1/elasticache-example-01"
+    assert target.environment == "production"
+    assert target.severities == ("critical", "important")
+    assert target.service_updates_enabled
+
+    ai_input.data.service_updates_enabled = False
+    assert not FleetTarget.from_input(ai_input).service_updates_enabled
+
+
+def test_dry_run(fake: FakeAWS, orchestrator: Callable[..., FleetOrchestrator]) -> None:
+    states = orchestrator(FleetConfig()).run([
+        _target("rg-1"),
+        _target("rg-2"),
+        _target("rg-3"),
+    ])
+    assert {k: (s.status, s.service_update) for k, s in states.items()} == {
+        "us-east-1/rg-1": (TargetStatus.AVAILABLE, "update-1"),
+        "us-east-1/rg-2": (TargetStatus.APPLYING, None),
+        "us-east-1/rg-3": (TargetStatus.UP_TO_DATE, None),
+    }
+    assert fake.calls["BatchApplyUpdateAction"] == 0
+
+
+def test_apply(fake: FakeAWS, orchestrator: Callable[..., FleetOrchestrator]) -> None:
+    states = orchestrator(FleetConfig(apply=True, wait_for_completion=False)).run([
+        _target("rg-1")
+    ])
+    assert states["us-east-1/rg-1"].status == TargetStatus.APPLYING
+    assert fake.update_actions[0]["UpdateActionStatus"] == "in-progress"
+
+
+def test_service_updates_disabled(
+    fake: FakeAWS, orchestrator: Callable[..., FleetOrchestrator]
+) -> None:
+    states = orchestrator(FleetConfig(apply=True)).run([
+        _target("rg-1", service_updates_enabled=False)
+    ])
+    assert states["us-east-1/rg-1"].status == TargetStatus.DISABLED
+    assert states["us-east-1/rg-1"].service_update is None
+    assert fake.update_actions[0]["UpdateActionStatus"] == "not-applied"
+    assert fake.calls.total() == 0
+
+
+def test_failures_are_recorded(fake_aws_api: Callable[..., AWSApi]) -> None:
+    def _aws_api(region: str) -> AWSApi:
+        if region == "eu-west-1":
+            raise RuntimeError("boom")
+        return fake_aws_api(region)
+
+    orchestrator = FleetOrchestrator(FleetConfig(), aws_api_factory=_aws_api)
+    states = orchestrator.run([_target("rg-1", region="eu-west-1"), _target("rg-3")])
+    assert states["eu-west-1/rg-1"].status == TargetStatus.FAILED
+    assert states["eu-west-1/rg-1"].error == "boom"
+    assert states["us-east-1/rg-3"].status == TargetStatus.UP_TO_DATE
+
+
+def test_state_store_resume(
+    tmp_path: Path, fake: FakeAWS, orchestrator: Callable[..., FleetOrchestrator]
+) -> None:
+    path = tmp_path / "state.json"
+    orchestrator(FleetConfig(), FleetStateStore(path)).run([
+        _target("rg-1"),
+        _target("rg-3"),
+    ])
+    assert (
+        json.loads(path.read_text())["targets"]["us-east-1/rg-3"]["status"]
+        == "up-to-date"
+    )
+
+    fake.calls.clear()
+    # a new run starts without cached responses
+    RESPONSE_CACHE.reset()
+    store = FleetStateStore(path)
+    states = orchestrator(FleetConfig(), store).run([
+        _target("rg-1"),
+        _target("rg-3"),
+    ])
+    # rg-3 is done and not looked at again
+    assert states["us-east-1/rg-3"].status == TargetStatus.UP_TO_DATE
+    assert states["us-east-1/rg-1"].attempts == 2  # noqa: PLR2004
+    assert fake.calls["DescribeUpdateActions"] == 2  # noqa: PLR2004
+
+
+def test_state_store_schema_version(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"schema_version": 0, "targets": {}}))
+    with pytest.raises(ValueError, match="Unsupported fleet state schema"):
+        FleetStateStore(path)
+
+
+def test_config_validation() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        FleetConfig(environment_concurrency={"production": 0})
+
+
+class RecordingOrchestrator(FleetOrchestrator):
+    """Records the concurrency instead of talking to AWS"""
+
+    def __init__(self, config: FleetConfig) -> None:
+        super().__init__(config)
+        self.running: Counter[str] = Counter()
+        self.peak: Counter[str] = Counter()
+        self._counter_lock = threading.Lock()
+
+    def process(self, target: FleetTarget) -> TargetState:
+        """Pretend to apply an update"""
+        keys = [f"region:{target.region}", f"environment:{target.environment}"]
+        with self._counter_lock:
+            for key in keys:
+                self.running[key] += 1
+                self.peak[key] = max(self.peak[key], self.running[key])
+        time.sleep(0.01)
+        with self._counter_lock:
+            for key in keys:
+                self.running[key] -= 1
+        return self.state.update(target.key, status=TargetStatus.COMPLETED)
+
+
+def test_concurrency_limits() -> None:
+    orchestrator = RecordingOrchestrator(
+        FleetConfig(
+            region_concurrency=3,
+            environment_concurrency={"production": 1},
+            default_environment_concurrency=10,
+        )
+    )
+    targets = [
+        _target(f"rg-{i}", region=region, environment=environment)
+        for i in range(6)
+        for region in ("us-east-1", "eu-west-1")
+        for environment in ("production", "stage")
+    ]
+    states = orchestrator.run(targets)
+    assert all(s.status == TargetStatus.COMPLETED for s in states.values())
+    assert orchestrator.peak["environment:production"] == 1
+    assert orchestrator.peak["region:us-east-1"] <= 3  # noqa: PLR2004
+    assert orchestrator.peak["environment:stage"] > 1
+
+
+def test_main(tmp_path: Path, raw_input_data: dict, mocker: MockerFixture) -> None:
+    (tmp_path / "input.json").write_text(json.dumps(raw_input_data))
+    run = mocker.patch.object(
+        FleetOrchestrator,
+        "run",
+        return_value={"us-east-1/x": TargetState(status=TargetStatus.FAILED)},
+    )
+    with pytest.raises(SystemExit) as exc:
+        main([
+            "--state",
+            str(tmp_path / "state.json"),
+            "--environment-concurrency",
+            "Production=2",
+            str(tmp_path / "input.json"),
+        ])
+    assert exc.value.code == 1
+    [targets] = run.call_args.args
+    assert [t.replication_group_id for t in targets] == ["elasticache-example-01"]
@@ -0,0 +1,118 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+
+from benchmarks.fake_aws import FakeAWS, FaultConfig
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.metrics import ApiMetrics, OperationMetrics, emit_at_exit
+
+
+@pytest.fixture
+def metrics() -> ApiMetrics:
+    return ApiMetrics()
+
+
+@pytest.fixture
+def fake(fake: FakeAWS) -> FakeAWS:
+    fake.faults = FaultConfig(page_size=2)
+    fake.replication_groups = [{"ReplicationGroupId": f"rg-{i}"} for i in range(5)]
+    return fake
+
+
+def test_operation_metrics_observe() -> None:
+    m = OperationMetrics()
+    m.observe(0.001)
+    m.observe(0.3)
+    m.observe(60)
+    assert m.calls == 3  # noqa: PLR2004
+    assert m.buckets[0] == 1
+    assert m.buckets[6] == 1  # 0.5
+    assert m.buckets[-1] == 1
+
+
+def test_calls(fake_aws_api: Callable[..., AWSApi], metrics: ApiMetrics) -> None:
+    aws_api = fake_aws_api(metrics=metrics)
+    list(aws_api.iter_replication_group_ids())
+    # instrumenting the same client again must not double count, the pages are
+    # answered from the response cache now
+    list(aws_api.iter_replication_group_ids())
+
+    report = metrics.report()
+    assert report["calls"] == 3  # noqa: PLR2004
+    [operation] = report["operations"]
+    assert operation["service"] == "elasticache"
+    assert operation["operation"] == "DescribeReplicationGroups"
+    assert operation["cache_hits"] == 3  # noqa: PLR2004
+    assert operation["errors"] == operation["retries"] == operation["throttles"] == 0
+    assert sum(operation["latency_buckets"].values()) == 3  # noqa: PLR2004
+
+
+def test_retries_and_throttles(
+    mocker: MockerFixture,
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+    metrics: ApiMetrics,
+) -> None:
+    mocker.patch("botocore.endpoint.time.sleep")
+    fake.faults = FaultConfig(throttle_rate=1.0)
+    aws_api = fake_aws_api(
+        config_options={"retries": {"max_attempts": 2}}, metrics=metrics
+    )
+    with pytest.raises(ClientError):
+        aws_api.get_subnets(["subnet-1"])
+
+    [operation] = metrics.report()["operations"]
+    assert operation["service"] == "ec2"
+    assert operation["calls"] == operation["errors"] == 1
+    assert operation["retries"] == 2  # noqa: PLR2004
+    assert operation["throttles"] == 3  # noqa: PLR2004
+
+
+def test_prometheus(metrics: ApiMetrics) -> None:
+    metrics.operations["elasticache", "DescribeEvents"] = m = OperationMetrics()
+    m.observe(0.02)
+    m.observe(0.2)
+    text = metrics.prometheus({"hook": "post_apply"})
+    labels = 'hook="post_apply",service="elasticache",operation="DescribeEvents"'
+    assert f"er_aws_elasticache_aws_api_calls_total{{{labels}}} 2" in text
+    assert (
+        f'er_aws_elasticache_aws_api_call_duration_seconds_bucket{{{labels},le="0.025"}} 1'
+        in text
+    )
+    assert (
+        f'er_aws_elasticache_aws_api_call_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+        in text
+    )
+    assert "# TYPE er_aws_elasticache_aws_api_call_duration_seconds histogram" in text
+
+
+def test_write(tmp_path: Path, metrics: ApiMetrics) -> None:
+    metrics.operations["ec2", "DescribeSubnets"] = OperationMetrics(calls=1)
+    metrics.write(tmp_path / "metrics", "post_plan")
+    report = json.loads((tmp_path / "metrics" / "post_plan.json").read_text())
+    assert report["calls"] == 1
+    assert (tmp_path / "metrics" / "post_plan.prom").read_text().startswith("# HELP")
+    assert sorted(p.name for p in (tmp_path / "metrics").iterdir()) == [
+        "post_plan.json",
+        "post_plan.prom",
+    ]
+
+
+def test_emit_at_exit(
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    metrics: ApiMetrics,
+) -> None:
+    register = mocker.patch("hooks_lib.metrics.atexit.register")
+    monkeypatch.delenv("METRICS_DIR", raising=False)
+    emit_at_exit("pre_run", metrics)
+    register.assert_not_called()
+
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path))
+    emit_at_exit("pre_run", metrics)
+    register.assert_called_once_with(metrics.write, tmp_path, "pre_run")
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import NoCredentialsError
+from pytest_mock import MockerFixture
+
+from er_aws_elasticache.parameter_catalog import ParameterCatalog, ParameterSpec
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.parameter_catalog import build_parameter_catalog, load_parameter_catalog
+
+
+def test_build_parameter_catalog(mocker: MockerFixture) -> None:
+    aws_api = mocker.create_autospec(spec=AWSApi, spec_set=True, instance=True)
+    aws_api.iter_engine_default_parameters.return_value = [
+        {
+            "ParameterName": "timeout",
+            "ParameterValue": "0",
+            "DataType": "integer",
+            "AllowedValues": "0,20-",
+            "IsModifiable": True,
+            "MinimumEngineVersion": "2.6.13",
+            "ChangeType": "immediate",
+        },
+        {
+            "ParameterName": "reserved-memory",
+            "DataType": "integer",
+            "AllowedValues": "",
+            "IsModifiable": True,
+            "ChangeType": "immediate",
+            "CacheNodeTypeSpecificValues": [
+                {"CacheNodeType": "cache.t4g.micro", "Value": "0"}
+            ],
+        },
+    ]
+
+    catalog = build_parameter_catalog(aws_api, "redis7")
+    aws_api.iter_engine_default_parameters.assert_called_once_with("redis7")
+    assert catalog.family == "redis7"
+    assert catalog.parameters == [
+        ParameterSpec(
+            name="reserved-memory", data_type="integer", change_type="immediate"
+        ),
+        ParameterSpec(
+            name="timeout",
+            data_type="integer",
+            allowed_values="0,20-",
+            change_type="immediate",
+            minimum_engine_version="2.6.13",
+        ),
+    ]
+    assert not catalog.expired
+
+
+def test_load_parameter_catalog(
+    mocker: MockerFixture, parameter_catalog_dir: Path
+) -> None:
+    aws_api = mocker.create_autospec(spec=AWSApi, spec_set=True, instance=True)
+    aws_api.iter_engine_default_parameters.return_value = [
+        {"ParameterName": "timeout", "DataType": "integer"}
+    ]
+
+    catalog = load_parameter_catalog(aws_api, "redis7")
+    assert catalog
+    assert catalog.lookup("timeout")
+    assert (parameter_catalog_dir / "redis7.json").is_file()
+    # saved for the next run
+    assert load_parameter_catalog(aws_api, "redis7")
+    aws_api.iter_engine_default_parameters.assert_called_once_with("redis7")
+
+    # an expired catalog is fetched again
+    catalog.generated_at -= catalog.ttl + timedelta(days=1)
+    catalog.dump(parameter_catalog_dir)
+    assert load_parameter_catalog(aws_api, "redis7")
+    assert aws_api.iter_engine_default_parameters.call_count == 2  # noqa: PLR2004
+
+
+def test_load_parameter_catalog_unavailable(
+    mocker: MockerFixture, caplog: pytest.LogCaptureFixture
+) -> None:
+    aws_api = mocker.create_autospec(spec=AWSApi, spec_set=True, instance=True)
+    aws_api.iter_engine_default_parameters.side_effect = NoCredentialsError()
+
+    assert load_parameter_catalog(aws_api, "redis7") is None
+    assert any(
+        m.startswith("Cannot fetch the parameter catalog of redis7")
+        for m in caplog.messages
+    )
+
+
+def test_load_parameter_catalog_read_only(
+    mocker: MockerFixture, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    aws_api = mocker.create_autospec(spec=AWSApi, spec_set=True, instance=True)
+    aws_api.iter_engine_default_parameters.return_value = []
+    (tmp_path / "file").touch()
+
+    # still usable for this run
+    assert isinstance(
+        load_parameter_catalog(aws_api, "redis7", tmp_path / "file"), ParameterCatalog
+    )
+    assert any(
+        m.startswith("Cannot save the parameter catalog of redis7")
+        for m in caplog.messages
+    )
@@ -0,0 +1,181 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from external_resources_io.terraform import Action, Change, ResourceChange
+
+from hooks_lib.plan_index import (
+    PlanClass,
+    PlanIndex,
+    get_plan_index,
+    iter_resource_changes,
+)
+
+
+def resource_change(
+    resource_type: str, name: str, actions: list[str], after: dict | None = None
+) -> dict[str, Any]:
+    return {
+        "address": f"{resource_type}.{name}",
+        "type": resource_type,
+        "name": name,
+        "change": {
+            "actions": actions,
+            "before": None,
+            "after": after or {},
+            "after_unknown": None,
+        },
+    }
+
+
+RESOURCE_CHANGES = [
+    resource_change("aws_elasticache_replication_group", "rg", ["create"], {"a": 1}),
+    resource_change("aws_elasticache_parameter_group", "pg", ["update"]),
+    resource_change("aws_elasticache_parameter_group", "old", ["delete", "create"]),
+    resource_change("random_password", "token", ["no-op"]),
+]
+
+
+@pytest.fixture
+def index() -> PlanIndex:
+    return PlanIndex(ResourceChange.model_validate(c) for c in RESOURCE_CHANGES)
+
+
+def write_plan(tmp_path: Path, resource_changes: list[dict[str, Any]]) -> Path:
+    plan = {
+        "format_version": "1.2",
+        "planned_values": {
+            "root_module": {
+                "resources": [
+                    {"values": {"s": 'tricky "resource_changes": [{,}] \\" \\\\'}}
+                ]
+            }
+        },
+        "resource_changes": resource_changes,
+        "output_changes": {"x": {"actions": ["create"]}},
+        "errored": False,
+    }
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps(plan, indent=2), encoding="utf-8")
+    return path
+
+
+def test_plan_index_changes(index: PlanIndex) -> None:
+    assert [c.name for c in index.changes("aws_elasticache_parameter_group")] == [
+        "pg",
+        "old",
+    ]
+    assert [
+        c.name
+        for c in index.changes("aws_elasticache_parameter_group", Action.ActionCreate)
+    ] == ["old"]
+    assert [
+        c.name
+        for c in index.changes(
+            "aws_elasticache_parameter_group", Action.ActionCreate, Action.ActionUpdate
+        )
+    ] == ["pg", "old"]
+    assert index.changes("aws_instance") == []
+    assert index.has_changes
+
+
+def test_plan_index_noop_only() -> None:
+    index = PlanIndex([
+        ResourceChange.model_validate(
+            resource_change("random_password", "t", ["no-op"])
+        )
+    ])
+    assert not index.has_changes
+
+
+def test_get_plan_index_is_shared(index: PlanIndex) -> None:
+    assert get_plan_index(index) is index
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024 * 1024])
+def test_iter_resource_changes(tmp_path: Path, chunk_size: int) -> None:
+    path = write_plan(tmp_path, RESOURCE_CHANGES)
+    assert list(iter_resource_changes(path, chunk_size=chunk_size)) == RESOURCE_CHANGES
+
+
+@pytest.mark.parametrize("document", ["{}", '{"format_version": "1.2"}'])
+def test_iter_resource_changes_without_changes(tmp_path: Path, document: str) -> None:
+    path = tmp_path / "plan.json"
+    path.write_text(document, encoding="utf-8")
+    assert list(iter_resource_changes(path)) == []
+
+
+def test_iter_resource_changes_truncated(tmp_path: Path) -> None:
+    path = tmp_path / "plan.json"
+    path.write_text('{"planned_values": {"a": "b', encoding="utf-8")
+    with pytest.raises(ValueError, match="Unexpected end"):
+        list(iter_resource_changes(path))
+
+
+def test_plan_index_from_file(tmp_path: Path) -> None:
+    index = PlanIndex.from_file(write_plan(tmp_path, RESOURCE_CHANGES), chunk_size=16)
+    # only elasticache resources are materialized
+    assert index.changes("random_password") == []
+    assert index.changes("aws_elasticache_replication_group", Action.ActionCreate) == [
+        ResourceChange.model_validate(RESOURCE_CHANGES[0])
+    ]
+    assert index.has_changes
+
+
+def test_plan_index_from_file_non_elasticache_changes(tmp_path: Path) -> None:
+    path = write_plan(
+        tmp_path,
+        [
+            resource_change("aws_elasticache_replication_group", "rg", ["no-op"]),
+            resource_change("random_password", "token", ["update"]),
+        ],
+    )
+    assert PlanIndex.from_file(path).has_changes
+
+
+def test_plan_index_from_file_noop(tmp_path: Path) -> None:
+    path = write_plan(
+        tmp_path,
+        [resource_change("aws_elasticache_replication_group", "rg", ["no-op"])],
+    )
+    index = PlanIndex.from_file(path)
+    assert not index.has_changes
+    assert index.changes("aws_elasticache_replication_group") == [
+        ResourceChange(
+            address="aws_elasticache_replication_group.rg",
+            type="aws_elasticache_replication_group",
+            name="rg",
+            change=Change(actions=["no-op"], before=None, after={}, after_unknown=None),
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    ("resource_changes", "expected"),
+    [
+        ([], PlanClass.NO_CHANGES),
+        (
+            [resource_change("random_password", "token", ["no-op"])],
+            PlanClass.NO_CHANGES,
+        ),
+        (
+            [resource_change("random_password", "token", ["create"])],
+            PlanClass.OTHER_CHANGES,
+        ),
+        (
+            [resource_change("aws_elasticache_replication_group", "rg", ["delete"])],
+            PlanClass.OTHER_CHANGES,
+        ),
+        (RESOURCE_CHANGES, PlanClass.ELASTICACHE_CHANGES),
+    ],
+)
+def test_plan_index_classification(
+    tmp_path: Path, resource_changes: list[dict[str, Any]], expected: PlanClass
+) -> None:
+    index = PlanIndex(ResourceChange.model_validate(c) for c in resource_changes)
+    assert index.classification == expected
+    assert (
+        PlanIndex.from_file(write_plan(tmp_path, resource_changes)).classification
+        == expected
+    )
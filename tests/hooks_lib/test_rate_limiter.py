@@ -0,0 +1,156 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+
+from benchmarks.fake_aws import FakeAWS, FaultConfig
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.rate_limiter import RateLimiter, RateLimiterConfig
+from tests.conftest import FakeClock
+
+
+def _limiter(clock: FakeClock, **kwargs: object) -> RateLimiter:
+    return RateLimiter(
+        RateLimiterConfig(**{"rate": 2.0, "burst": 2.0, **kwargs}),  # type: ignore[arg-type]
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+def test_burst_then_rate(clock: FakeClock) -> None:
+    limiter = _limiter(clock)
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == 0
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == 0
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == pytest.approx(0.5)
+    # buckets are per operation
+    assert limiter.acquire("acc/us-east-1", "DescribeSubnets") == 0
+
+
+def test_operation_rates(clock: FakeClock) -> None:
+    limiter = _limiter(clock, burst=1.0, operation_rates={"DescribeEvents": 0.5})
+    limiter.acquire("acc/us-east-1", "DescribeEvents")
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == pytest.approx(2.0)
+
+
+def test_throttled_backoff_and_recovery(clock: FakeClock) -> None:
+    limiter = _limiter(clock, rate=8.0, burst=1.0, recovery=1000.0)
+    limiter.throttled("acc/us-east-1", "DescribeEvents")
+    # rate halved and bucket drained
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == pytest.approx(0.25)
+    limiter.throttled("acc/us-east-1", "DescribeEvents")
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == pytest.approx(
+        0.5, rel=0.01
+    )
+
+    clock.now += 1000
+    limiter.acquire("acc/us-east-1", "DescribeEvents")
+    # fully recovered
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == pytest.approx(0.125)
+
+
+def test_min_rate(clock: FakeClock) -> None:
+    limiter = _limiter(clock, burst=1.0, min_rate=1.0)
+    for _ in range(5):
+        limiter.throttled("acc/us-east-1", "DescribeEvents")
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == pytest.approx(1.0)
+
+
+def test_shared_state(tmp_path: Path, clock: FakeClock) -> None:
+    first = _limiter(clock, state_dir=tmp_path)
+    second = _limiter(clock, state_dir=tmp_path)
+    assert first.acquire("acc/us-east-1", "DescribeEvents") == 0
+    assert second.acquire("acc/us-east-1", "DescribeEvents") == 0
+    assert first.acquire("acc/us-east-1", "DescribeEvents") == pytest.approx(0.5)
+    # the account is not part of the file name
+    assert all("acc" not in p.name for p in tmp_path.iterdir())
+
+
+def test_corrupt_state_file(tmp_path: Path, clock: FakeClock) -> None:
+    limiter = _limiter(clock, state_dir=tmp_path)
+    limiter.acquire("acc/us-east-1", "DescribeEvents")
+    for path in tmp_path.iterdir():
+        path.write_text("garbage")
+    assert limiter.acquire("acc/us-east-1", "DescribeEvents") == 0
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("AWS_RATE_LIMIT", "0")
+    monkeypatch.setenv("AWS_RATE_LIMIT_DIR", str(tmp_path))
+    limiter = RateLimiter()
+    assert not limiter.enabled
+    assert limiter.config.state_dir == tmp_path
+
+
+def test_instrument(
+    mocker: MockerFixture,
+    clock: FakeClock,
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+) -> None:
+    mocker.patch("botocore.endpoint.time.sleep")
+    fake.faults = FaultConfig(throttle_rate=1.0)
+    limiter = _limiter(clock)
+    acquire = mocker.spy(limiter, "acquire")
+    throttled = mocker.spy(limiter, "throttled")
+    aws_api = fake_aws_api(
+        config_options={"retries": {"max_attempts": 2}}, rate_limiter=limiter
+    )
+    with pytest.raises(ClientError):
+        aws_api.get_subnets(["subnet-1"])
+
+    key = f"{aws_api.account_key}/us-east-1"
+    assert acquire.call_args_list == [mocker.call(key, "DescribeSubnets")] * 3
+    assert throttled.call_args_list == [mocker.call(key, "DescribeSubnets")] * 3
+
+    # a client is instrumented once
+    acquire.reset_mock()
+    fake.faults = FaultConfig()
+    fake.subnets = [{"SubnetId": "subnet-1", "VpcId": "vpc-1"}]
+    limiter.instrument(aws_api.ec2_client, key)
+    aws_api.get_subnets(["subnet-1"])
+    assert acquire.call_count == 1
+
+
+def test_instrument_disabled(
+    clock: FakeClock, fake: FakeAWS, fake_aws_api: Callable[..., AWSApi]
+) -> None:
+    fake.subnets = [{"SubnetId": "subnet-1", "VpcId": "vpc-1"}]
+    aws_api = fake_aws_api(rate_limiter=_limiter(clock, rate=0.0))
+    for _ in range(5):
+        aws_api.get_subnets(["subnet-1"])
+    assert clock.sleeps == []
+
+
+def test_aws_api_adaptive_retries() -> None:
+    assert AWSApi({"region_name": "us-east-1"}).config_options["retries"] == {
+        "mode": "adaptive",
+        "max_attempts": 10,
+    }
+    options = {"region_name": "us-east-1", "retries": {"mode": "standard"}}
+    assert AWSApi(options).config_options == options
+
+
+def test_instrument_opt_out(
+    mocker: MockerFixture,
+    clock: FakeClock,
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+) -> None:
+    fake.subnets = [{"SubnetId": "subnet-1", "VpcId": "vpc-1"}]
+    limiter = _limiter(clock)
+    acquire = mocker.spy(limiter, "acquire")
+    limited = fake_aws_api(rate_limiter=limiter, response_cache=None)
+    unlimited = fake_aws_api(
+        client_pool=limited.client_pool, rate_limiter=None, response_cache=None
+    )
+    limited.get_subnets(["subnet-1"])
+    assert acquire.call_count == 1
+
+    # the pooled client of the limited instance is not shared
+    assert unlimited.ec2_client is not limited.ec2_client
+    for _ in range(5):
+        unlimited.get_subnets(["subnet-1"])
+    assert acquire.call_count == 1
+    assert fake.calls["DescribeSubnets"] == 6  # noqa: PLR2004
@@ -0,0 +1,174 @@
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+import pytest
+from botocore.exceptions import ClientError
+
+from benchmarks.fake_aws import FakeAWS
+from hooks_lib.async_aws_api import AsyncAWSApi
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.response_cache import ResponseCache, fresh
+from hooks_lib.service_updates import (
+    AsyncServiceUpdatesManager,
+    ServiceUpdatesBatchManager,
+    ServiceUpdatesManager,
+)
+from hooks_lib.waiter import WaiterConfig
+from tests.conftest import FakeClock
+
+
+@pytest.fixture
+def fake(fake: FakeAWS) -> FakeAWS:
+    fake.subnets = [
+        {"SubnetId": "subnet-1", "VpcId": "vpc-1"},
+        {"SubnetId": "subnet-2", "VpcId": "vpc-1"},
+    ]
+    fake.update_actions = [
+        {
+            "ReplicationGroupId": "rg-1",
+            "ServiceUpdateName": "update-1",
+            "ServiceUpdateReleaseDate": datetime(2024, 1, 1, tzinfo=UTC),
+            "ServiceUpdateSeverity": "critical",
+            "ServiceUpdateType": "security-update",
+            "UpdateActionStatus": "not-applied",
+        }
+    ]
+    return fake
+
+
+@pytest.fixture
+def cache(clock: FakeClock) -> ResponseCache:
+    return ResponseCache(enabled=True, clock=clock)
+
+
+@pytest.fixture
+def aws_api(fake_aws_api: Callable[..., AWSApi], cache: ResponseCache) -> AWSApi:
+    return fake_aws_api(response_cache=cache)
+
+
+def test_hits_and_ttl(
+    fake: FakeAWS, cache: ResponseCache, aws_api: AWSApi, clock: FakeClock
+) -> None:
+    assert aws_api.get_subnets(["subnet-1"]) == aws_api.get_subnets(["subnet-1"])
+    aws_api.get_subnets(["subnet-2"])
+    assert fake.calls["DescribeSubnets"] == 2  # noqa: PLR2004
+
+    clock.now += cache.ttl("DescribeSubnets") + 1
+    aws_api.get_subnets(["subnet-1"])
+    assert fake.calls["DescribeSubnets"] == 3  # noqa: PLR2004
+    assert cache.report() == {
+        "DescribeSubnets": {"hits": 1, "misses": 3, "bypasses": 0}
+    }
+
+
+def test_opt_out(
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+    cache: ResponseCache,
+    aws_api: AWSApi,
+) -> None:
+    aws_api.get_subnets(["subnet-1"])
+    uncached = fake_aws_api(client_pool=aws_api.client_pool, response_cache=None)
+    assert uncached.ec2_client is not aws_api.ec2_client
+    uncached.get_subnets(["subnet-1"])
+    uncached.get_subnets(["subnet-1"])
+    assert fake.calls["DescribeSubnets"] == 3  # noqa: PLR2004
+    assert cache.report() == {
+        "DescribeSubnets": {"hits": 0, "misses": 1, "bypasses": 0}
+    }
+
+
+def test_responses_are_copies(aws_api: AWSApi) -> None:
+    aws_api.get_subnets(["subnet-1"])[0]["VpcId"] = "changed"
+    assert aws_api.get_subnets(["subnet-1"])[0]["VpcId"] == "vpc-1"
+
+
+def test_fresh(fake: FakeAWS, cache: ResponseCache, aws_api: AWSApi) -> None:
+    aws_api.get_subnets(["subnet-1"])
+    fake.subnets[0]["VpcId"] = "vpc-2"
+    with fresh():
+        assert aws_api.get_subnets(["subnet-1"])[0]["VpcId"] == "vpc-2"
+    # the fresh response replaced the cached one
+    assert aws_api.get_subnets(["subnet-1"])[0]["VpcId"] == "vpc-2"
+    assert fake.calls["DescribeSubnets"] == 2  # noqa: PLR2004
+    assert cache.stats["DescribeSubnets"].bypasses == 1
+
+
+def test_writes_invalidate(fake: FakeAWS, aws_api: AWSApi) -> None:
+    manager = ServiceUpdatesManager("rg-1", "us-east-1", aws_api=aws_api)
+    assert manager.update_action_status("update-1") == "not-applied"
+    aws_api.batch_apply_service_updates("rg-1", "update-1")
+    assert manager.update_action_status("update-1") == "in-progress"
+    assert fake.calls["DescribeUpdateActions"] == 2  # noqa: PLR2004
+
+
+def test_wait_is_fresh(fake: FakeAWS, aws_api: AWSApi) -> None:
+    manager = ServiceUpdatesManager("rg-1", "us-east-1", aws_api=aws_api)
+    aws_api.batch_apply_service_updates("rg-1", "update-1")
+    assert manager.update_in_progress
+
+    def _complete(_: float) -> None:
+        fake.update_actions[0]["UpdateActionStatus"] = "complete"
+
+    config = WaiterConfig(initial_delay=0, jitter=0)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("hooks_lib.waiter.time.sleep", _complete)
+        assert manager.wait_for_completion(config) == 1
+
+
+def test_apply_guard_is_fresh(fake: FakeAWS, aws_api: AWSApi) -> None:
+    manager = ServiceUpdatesManager("rg-1", "us-east-1", aws_api=aws_api)
+    assert not manager.update_in_progress
+    (update,) = manager.service_updates(
+        service_updates_types=["security-update"],
+        severities=["critical"],
+        released_before=datetime(2025, 1, 1, tzinfo=UTC),
+    )
+    # started by someone else within the TTL of the cached response
+    fake.update_actions[0]["UpdateActionStatus"] = "in-progress"
+    assert not manager.update_in_progress
+
+    with pytest.raises(RuntimeError, match="already in progress"):
+        manager.apply_service_update(update)
+    with pytest.raises(RuntimeError, match="already in progress"):
+        asyncio.run(
+            AsyncServiceUpdatesManager(
+                "rg-1", "us-east-1", AsyncAWSApi(aws_api)
+            ).apply_service_update(update)
+        )
+    assert fake.calls["BatchApplyUpdateAction"] == 0
+
+
+def test_batch_apply_guard_is_fresh(fake: FakeAWS, aws_api: AWSApi) -> None:
+    manager = ServiceUpdatesBatchManager(["rg-1"], "us-east-1")
+    manager.aws_api = aws_api
+    assert not manager.updates_in_progress
+    # started by someone else within the TTL of the cached response
+    fake.update_actions[0]["UpdateActionStatus"] = "in-progress"
+    assert not manager.updates_in_progress
+
+    result = manager.apply_service_update("update-1")
+    assert result.unprocessed == {"rg-1": "An update is already in progress."}
+    assert fake.calls["BatchApplyUpdateAction"] == 0
+
+
+def test_not_cached(fake: FakeAWS, aws_api: AWSApi) -> None:
+    for _ in range(2):
+        list(aws_api.iter_events("rg-1", datetime(2024, 1, 1, tzinfo=UTC)))
+        with pytest.raises(ClientError):
+            aws_api.get_cache_group_subnets("missing")
+    assert fake.calls["DescribeEvents"] == 2  # noqa: PLR2004
+    assert fake.calls["DescribeCacheSubnetGroups"] == 2  # noqa: PLR2004
+
+
+def test_disabled(
+    monkeypatch: pytest.MonkeyPatch,
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+) -> None:
+    monkeypatch.setenv("AWS_RESPONSE_CACHE", "false")
+    aws_api = fake_aws_api(response_cache=ResponseCache())
+    aws_api.get_subnets(["subnet-1"])
+    aws_api.get_subnets(["subnet-1"])
+    assert fake.calls["DescribeSubnets"] == 2  # noqa: PLR2004
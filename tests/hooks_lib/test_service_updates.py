@@ -2,12 +2,20 @@
 from collections.abc import Sequence
 from datetime import datetime as dt
 from datetime import timedelta
+from unittest.mock import MagicMock
 
 import pytest
 from pytest_mock import MockerFixture
 
 from hooks_lib.aws_api import AWSApi
-from hooks_lib.service_updates import ServiceUpdate, ServiceUpdatesManager
+from hooks_lib.service_updates import (
+    BatchApplyResult,
+    ServiceUpdate,
+    ServiceUpdatesBatchManager,
+    ServiceUpdatesManager,
+    released_before,
+)
+from hooks_lib.waiter import WaiterConfig
 
 SERVICE_UPDATE_ITEM = ServiceUpdate(
     name="test-service-update",
@@ -36,7 +44,7 @@ def test_service_updates_update_in_progress(
     mocker: MockerFixture, service_updates: list, *, expected: bool
 ) -> None:
     aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
-    aws_api_class.return_value.get_service_updates.return_value = service_updates
+    aws_api_class.return_value.iter_service_updates.return_value = service_updates
     sumgr = ServiceUpdatesManager(
         "test-replication-group-id", "us-west-2", aws_api_class=aws_api_class
     )
@@ -86,7 +94,7 @@ def test_service_updates_list_service_updates(  # noqa: PLR0913
     expected: bool,
 ) -> None:
     aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
-    aws_api_class.return_value.get_service_updates.return_value = service_updates
+    aws_api_class.return_value.iter_service_updates.return_value = service_updates
     sumgr = ServiceUpdatesManager(
         "test-replication-group-id", "us-west-2", aws_api_class=aws_api_class
     )
@@ -96,6 +104,38 @@ def test_service_updates_list_service_updates(  # noqa: PLR0913
     )
 
 
+def test_service_updates_list_service_updates_ordered(mocker: MockerFixture) -> None:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    aws_api_class.return_value.iter_service_updates.return_value = [
+        RAW_SERVICE_UPDATE_ITEM
+        | {
+            "ServiceUpdateName": f"update-{i}",
+            "ServiceUpdateReleaseDate": dt(2024, 1, 1) + timedelta(days=i),
+        }
+        for i in (3, 1, 4, 2)
+    ]
+    sumgr = ServiceUpdatesManager(
+        "test-replication-group-id", "us-west-2", aws_api_class=aws_api_class
+    )
+    service_updates = sumgr.service_updates(
+        [SERVICE_UPDATE_ITEM.type], [SERVICE_UPDATE_ITEM.severity], dt(2025, 1, 1)
+    )
+    assert [su.name for su in service_updates] == [
+        "update-4",
+        "update-3",
+        "update-2",
+        "update-1",
+    ]
+
+    service_updates = sumgr.service_updates(
+        [SERVICE_UPDATE_ITEM.type],
+        [SERVICE_UPDATE_ITEM.severity],
+        dt(2025, 1, 1),
+        limit=1,
+    )
+    assert [su.name for su in service_updates] == ["update-4"]
+
+
 @pytest.mark.parametrize("update_in_progress", [True, False])
 def test_service_updates_apply_service_update(
     mocker: MockerFixture, *, update_in_progress: bool
@@ -119,3 +159,235 @@ def test_service_updates_apply_service_update(
             replication_group_id="test-replication-group-id",
             service_update_name="test-service-update",
         )
+
+
+def test_service_updates_apply_service_update_wait_for_completion(
+    mocker: MockerFixture,
+) -> None:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    sumgr = ServiceUpdatesManager(
+        "test-replication-group-id", "us-west-2", aws_api_class=aws_api_class
+    )
+    mocker.patch.object(
+        type(sumgr),
+        "update_in_progress",
+        new_callable=mocker.PropertyMock,
+        side_effect=[False, True, True, False],
+    )
+    sleep = mocker.patch("hooks_lib.waiter.time.sleep")
+    aws_api_class.return_value.iter_events.return_value = []
+
+    sumgr.apply_service_update(
+        SERVICE_UPDATE_ITEM,
+        wait_for_completion=True,
+        waiter_config=WaiterConfig(initial_delay=1, backoff=2, jitter=0),
+    )
+    assert [c.args[0] for c in sleep.call_args_list] == [1, 2]
+
+
+def test_service_updates_batch_updates_in_progress(mocker: MockerFixture) -> None:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    aws_api_class.return_value.iter_update_actions.return_value = [
+        RAW_SERVICE_UPDATE_ITEM | {"ReplicationGroupId": "rg-1"}
+    ]
+    sumgr = ServiceUpdatesBatchManager(
+        ["rg-1", "rg-2", "rg-1"], "us-west-2", aws_api_class=aws_api_class
+    )
+    assert sumgr.replication_group_ids == ["rg-1", "rg-2"]
+    assert sumgr.updates_in_progress == {"rg-1"}
+    aws_api_class.return_value.iter_update_actions.assert_called_once_with(
+        ["rg-1", "rg-2"],
+        status=["waiting-to-start", "in-progress", "scheduling", "stopping"],
+    )
+
+
+def test_service_updates_batch_list_service_updates(mocker: MockerFixture) -> None:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    aws_api_class.return_value.iter_update_actions.return_value = [
+        RAW_SERVICE_UPDATE_ITEM | {"ReplicationGroupId": "rg-1"},
+        RAW_SERVICE_UPDATE_ITEM
+        | {
+            "ReplicationGroupId": "rg-1",
+            "ServiceUpdateName": "newer-update",
+            "ServiceUpdateReleaseDate": dt(2025, 2, 1),
+        },
+        RAW_SERVICE_UPDATE_ITEM
+        | {"ReplicationGroupId": "rg-2", "ServiceUpdateSeverity": "low"},
+    ]
+    sumgr = ServiceUpdatesBatchManager(
+        ["rg-1", "rg-2"], "us-west-2", aws_api_class=aws_api_class
+    )
+    service_updates = sumgr.service_updates(
+        [SERVICE_UPDATE_ITEM.type], [SERVICE_UPDATE_ITEM.severity], dt(2025, 3, 1)
+    )
+    assert list(service_updates) == ["rg-1"]
+    assert [su.name for su in service_updates["rg-1"]] == [
+        "newer-update",
+        SERVICE_UPDATE_ITEM.name,
+    ]
+
+
+def test_service_updates_batch_apply_service_update(mocker: MockerFixture) -> None:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    aws_api = aws_api_class.return_value
+    aws_api.iter_update_actions.return_value = [
+        RAW_SERVICE_UPDATE_ITEM | {"ReplicationGroupId": "rg-busy"}
+    ]
+    aws_api.batch_apply_update_action.return_value = (
+        [{"ReplicationGroupId": "rg-1", "UpdateActionStatus": "waiting-to-start"}],
+        [
+            {
+                "ReplicationGroupId": "rg-2",
+                "ErrorType": "InvalidParameterValue",
+                "ErrorMessage": "not applicable",
+            }
+        ],
+    )
+    sumgr = ServiceUpdatesBatchManager(
+        ["rg-1", "rg-2", "rg-busy"], "us-west-2", aws_api_class=aws_api_class
+    )
+
+    result = sumgr.apply_service_update("update-1")
+    assert result == BatchApplyResult(
+        service_update_name="update-1",
+        processed={"rg-1": "waiting-to-start"},
+        unprocessed={
+            "rg-busy": "An update is already in progress.",
+            "rg-2": "InvalidParameterValue: not applicable",
+        },
+    )
+    aws_api.batch_apply_update_action.assert_called_once_with(
+        replication_group_ids=["rg-1", "rg-2"], service_update_name="update-1"
+    )
+
+
+def test_service_updates_batch_apply_service_update_all_busy(
+    mocker: MockerFixture,
+) -> None:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    aws_api = aws_api_class.return_value
+    aws_api.iter_update_actions.return_value = [
+        RAW_SERVICE_UPDATE_ITEM | {"ReplicationGroupId": "rg-1"}
+    ]
+    sumgr = ServiceUpdatesBatchManager(
+        ["rg-1", "rg-2"], "us-west-2", aws_api_class=aws_api_class
+    )
+
+    result = sumgr.apply_service_update("update-1", replication_group_ids=["rg-1"])
+    assert result.processed == {}
+    assert list(result.unprocessed) == ["rg-1"]
+    aws_api.batch_apply_update_action.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("cooldown_days", "environment", "expected"),
+    [
+        (None, "production", dt(2025, 1, 1)),
+        (None, "stage", dt(2025, 1, 8)),
+        (None, "integration", dt(2025, 1, 10)),
+        (0, "production", dt(2025, 1, 15)),
+    ],
+)
+def test_released_before(
+    cooldown_days: int | None, environment: str, expected: dt
+) -> None:
+    assert released_before(cooldown_days, environment, now=dt(2025, 1, 15)) == expected
+
+
+def _update(name: str, day: int) -> ServiceUpdate:
+    return ServiceUpdate(
+        name=name,
+        release_date=dt(2025, 1, day),
+        severity="critical",
+        status="not-applied",
+        type="security-update",
+    )
+
+
+@pytest.fixture
+def converging_manager(mocker: MockerFixture) -> ServiceUpdatesManager:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    aws_api_class.return_value.iter_events.return_value = []
+    sumgr = ServiceUpdatesManager("rg-1", "us-west-2", aws_api_class=aws_api_class)
+    mocker.patch.object(
+        type(sumgr),
+        "update_in_progress",
+        new_callable=mocker.PropertyMock,
+        return_value=False,
+    )
+    mocker.patch.object(sumgr, "apply_service_update")
+    return sumgr
+
+
+def test_service_updates_converge(converging_manager: ServiceUpdatesManager) -> None:
+    old, older, newest = _update("old", 2), _update("older", 1), _update("new", 3)
+    # applying "older" also completed "old"
+    converging_manager.service_updates = mock = MagicMock(  # type: ignore[method-assign]
+        side_effect=[[newest, old, older], [newest], []]
+    )
+    results = converging_manager.converge(
+        ["security-update"], ["critical"], dt(2025, 2, 1)
+    )
+    assert [(r.name, r.status) for r in results] == [
+        ("older", "completed"),
+        ("new", "completed"),
+    ]
+    assert [
+        c.args[0].name
+        for c in converging_manager.apply_service_update.call_args_list  # type: ignore[attr-defined]
+    ] == ["older", "new"]
+    assert mock.call_count == 3  # noqa: PLR2004
+
+
+def test_service_updates_converge_update_still_listed(
+    converging_manager: ServiceUpdatesManager,
+) -> None:
+    converging_manager.service_updates = MagicMock(  # type: ignore[method-assign]
+        return_value=[_update("stuck", 1)]
+    )
+    results = converging_manager.converge(
+        ["security-update"], ["critical"], dt(2025, 2, 1)
+    )
+    assert [r.name for r in results] == ["stuck"]
+
+
+def test_service_updates_converge_stops_at_failure(
+    converging_manager: ServiceUpdatesManager,
+) -> None:
+    converging_manager.service_updates = MagicMock(  # type: ignore[method-assign]
+        return_value=[_update("b", 2), _update("a", 1)]
+    )
+    converging_manager.apply_service_update.side_effect = RuntimeError("boom")  # type: ignore[attr-defined]
+    results = converging_manager.converge(
+        ["security-update"], ["critical"], dt(2025, 2, 1)
+    )
+    assert [(r.name, r.status, r.error) for r in results] == [("a", "failed", "boom")]
+
+
+def test_service_updates_converge_timeout(
+    mocker: MockerFixture, converging_manager: ServiceUpdatesManager
+) -> None:
+    mocker.patch.object(
+        type(converging_manager),
+        "update_in_progress",
+        new_callable=mocker.PropertyMock,
+        return_value=True,
+    )
+    converging_manager.service_updates = MagicMock(  # type: ignore[method-assign]
+        return_value=[_update("a", 1)]
+    )
+    results = converging_manager.converge(
+        ["security-update"], ["critical"], dt(2025, 2, 1), WaiterConfig(timeout=0)
+    )
+    assert [(r.name, r.status) for r in results] == [("a", "timed-out")]
+
+
+def test_service_updates_manager_lazy_aws_api(mocker: MockerFixture) -> None:
+    aws_api_class = mocker.create_autospec(spec=AWSApi, spec_set=True)
+    sumgr = ServiceUpdatesManager(
+        "test-replication-group-id", "us-west-2", aws_api_class=aws_api_class
+    )
+    aws_api_class.assert_not_called()
+    assert sumgr.aws_api is aws_api_class.return_value
+    assert sumgr.aws_api is aws_api_class.return_value
+    aws_api_class.assert_called_once_with(config_options={"region_name": "us-west-2"})
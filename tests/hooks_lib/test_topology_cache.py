@@ -0,0 +1,253 @@
+# ruff: noqa: SLF001
+import asyncio
+import os
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.fake_aws import FakeAWS
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from hooks.post_plan import ElasticachePlanValidator
+from hooks_lib.async_aws_api import AsyncAWSApi
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.topology_cache import (
+    SubnetGroupTopology,
+    SubnetTopology,
+    TopologyCache,
+)
+from tests.conftest import FakeClock
+
+KEY = "123456789012/us-east-1"
+GROUP = SubnetGroupTopology(
+    name="group-1",
+    subnets=(
+        SubnetTopology("subnet-1", "vpc-1", "us-east-1a"),
+        SubnetTopology("subnet-2", "vpc-1", "us-east-1b"),
+    ),
+)
+
+
+@pytest.fixture
+def cache(tmp_path: Path, clock: FakeClock) -> TopologyCache:
+    return TopologyCache(tmp_path / "topology", ttl=60, clock=clock)
+
+
+def test_subnet_group_topology() -> None:
+    topology = SubnetGroupTopology.from_describe(
+        "group-1",
+        [
+            {
+                "SubnetIdentifier": "subnet-1",
+                "SubnetAvailabilityZone": {"Name": "us-east-1a"},
+            },
+            {"SubnetIdentifier": "subnet-2"},
+        ],
+        [{"SubnetId": "subnet-1", "VpcId": "vpc-1"}],
+    )
+    assert topology.subnet_ids == ["subnet-1", "subnet-2"]
+    assert topology.vpc_ids == {"vpc-1"}
+    assert topology.availability_zones == {"us-east-1a"}
+
+
+def test_subnet_group(cache: TopologyCache, clock: FakeClock) -> None:
+    assert cache.subnet_group(KEY, "group-1") is None
+    cache.put_subnet_group(KEY, GROUP)
+
+    cached = cache.subnet_group(KEY, "group-1")
+    assert cached is not None
+    assert cached.subnets == GROUP.subnets
+    assert cached.cached_at == clock.now
+    assert cache.subnet_group("other/us-east-1", "group-1") is None
+
+    clock.now += 61
+    assert cache.subnet_group(KEY, "group-1") is None
+
+
+def test_security_groups(cache: TopologyCache, clock: FakeClock) -> None:
+    cache.put_security_groups(
+        KEY, [{"GroupId": "sg-1", "VpcId": "vpc-1"}, {"GroupId": "sg-2"}]
+    )
+    assert cache.security_groups(KEY, ["sg-1", "sg-2", "sg-3"]) == {
+        "sg-1": "vpc-1",
+        "sg-2": None,
+    }
+
+    clock.now += 61
+    assert cache.security_groups(KEY, ["sg-1"]) == {}
+
+
+def test_persistence(tmp_path: Path, cache: TopologyCache, clock: FakeClock) -> None:
+    cache.put_subnet_group(KEY, GROUP)
+    cache.put_security_groups(KEY, [{"GroupId": "sg-1", "VpcId": "vpc-1"}])
+
+    # e.g. the next hook run
+    other = TopologyCache(tmp_path / "topology", ttl=60, clock=clock)
+    cached = other.subnet_group(KEY, "group-1")
+    assert cached is not None
+    assert cached.subnets == GROUP.subnets
+    assert other.security_groups(KEY, ["sg-1"]) == {"sg-1": "vpc-1"}
+    # the account is not part of the file names
+    assert all("123456789012" not in p.name for p in (tmp_path / "topology").iterdir())
+
+    other.reset()
+    assert cache.subnet_group(KEY, "group-1") is None
+
+
+def test_lookup_does_not_write(tmp_path: Path, cache: TopologyCache) -> None:
+    assert cache.subnet_group(KEY, "group-1") is None
+    assert not (tmp_path / "topology").exists()
+
+    cache.put_subnet_group(KEY, GROUP)
+    cache.put_security_groups(KEY, [{"GroupId": "sg-1", "VpcId": "vpc-1"}])
+    (path,) = (tmp_path / "topology").glob("topology-*.json")
+    os.utime(path, ns=(0, 0))
+    content = path.read_text(encoding="utf-8")
+
+    assert cache.subnet_group(KEY, "group-1") is not None
+    assert cache.security_groups(KEY, ["sg-1"]) == {"sg-1": "vpc-1"}
+    assert path.stat().st_mtime_ns == 0
+    assert path.read_text(encoding="utf-8") == content
+
+
+@pytest.mark.parametrize("content", ["", "{broken", '{"schema_version": 0}'])
+def test_unreadable_file(tmp_path: Path, content: str) -> None:
+    cache = TopologyCache(tmp_path, ttl=60)
+    cache.put_subnet_group(KEY, GROUP)
+    (path,) = tmp_path.glob("topology-*.json")
+    path.write_text(content, encoding="utf-8")
+
+    assert cache.subnet_group(KEY, "group-1") is None
+    cache.put_subnet_group(KEY, GROUP)
+    assert cache.subnet_group(KEY, "group-1") is not None
+
+
+def test_invalidate(cache: TopologyCache) -> None:
+    cache.put_subnet_group(KEY, GROUP)
+    cache.put_subnet_group(KEY, SubnetGroupTopology(name="group-2", subnets=()))
+    cache.put_security_groups(
+        KEY, [{"GroupId": "sg-1", "VpcId": "vpc-1"}, {"GroupId": "sg-2"}]
+    )
+
+    cache.invalidate(KEY, subnet_group="group-1", security_groups=["sg-1"])
+    assert cache.subnet_group(KEY, "group-1") is None
+    assert cache.subnet_group(KEY, "group-2") is not None
+    assert cache.security_groups(KEY, ["sg-1", "sg-2"]) == {"sg-2": None}
+
+    cache.invalidate(KEY)
+    assert cache.subnet_group(KEY, "group-2") is None
+    assert cache.security_groups(KEY, ["sg-2"]) == {}
+
+
+def test_in_memory() -> None:
+    cache = TopologyCache(ttl=60)
+    cache.directory = None
+    cache.put_subnet_group(KEY, GROUP)
+    assert cache.subnet_group(KEY, "group-1") is not None
+
+
+@pytest.fixture
+def fake(fake: FakeAWS) -> FakeAWS:
+    fake.cache_subnet_groups = {
+        "group-1": {
+            "CacheSubnetGroupName": "group-1",
+            "Subnets": [
+                {
+                    "SubnetIdentifier": "subnet-1",
+                    "SubnetAvailabilityZone": {"Name": "us-east-1a"},
+                },
+                {
+                    "SubnetIdentifier": "subnet-2",
+                    "SubnetAvailabilityZone": {"Name": "us-east-1b"},
+                },
+            ],
+        }
+    }
+    fake.subnets = [
+        {"SubnetId": "subnet-1", "VpcId": "vpc-1"},
+        {"SubnetId": "subnet-2", "VpcId": "vpc-1"},
+    ]
+    fake.security_groups = [
+        {"GroupId": "sg-1", "VpcId": "vpc-1"},
+        {"GroupId": "sg-2", "VpcId": "vpc-1"},
+    ]
+    return fake
+
+
+def _validator(
+    fake_aws_api: Callable[..., AWSApi],
+    ai_input: AppInterfaceInput,
+    cache: TopologyCache,
+) -> ElasticachePlanValidator:
+    return ElasticachePlanValidator(
+        MagicMock(),
+        ai_input,
+        aws_api=fake_aws_api(response_cache=None),
+        topology_cache=cache,
+    )
+
+
+NETWORK_CALLS = (
+    "DescribeCacheSubnetGroups",
+    "DescribeSubnets",
+    "DescribeSecurityGroups",
+)
+
+
+def test_validator_cached_network(
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+    ai_input: AppInterfaceInput,
+    cache: TopologyCache,
+) -> None:
+    validator = _validator(fake_aws_api, ai_input, cache)
+    validator._validate_network("group-1", ["sg-1", "sg-2"], ["us-east-1a"])
+    assert validator.errors == []
+    assert [fake.calls[c] for c in NETWORK_CALLS] == [1, 1, 1]
+
+    # a new cluster in the same subnet group needs no AWS calls
+    validator = _validator(fake_aws_api, ai_input, cache)
+    validator._validate_network("group-1", ["sg-1"], ["us-east-1b"])
+    assert validator.errors == []
+    asyncio.run(
+        validator._validate_network_async(
+            AsyncAWSApi(validator.aws_api), "group-1", ["sg-2"], []
+        )
+    )
+    assert validator.errors == []
+    assert [fake.calls[c] for c in NETWORK_CALLS] == [1, 1, 1]
+
+    # only unknown security groups are described
+    fake.security_groups.append({"GroupId": "sg-3", "VpcId": "vpc-1"})
+    validator._validate_network("group-1", ["sg-1", "sg-3"], [])
+    assert validator.errors == []
+    assert [fake.calls[c] for c in NETWORK_CALLS] == [1, 1, 2]
+
+
+def test_validator_outdated_topology(
+    fake: FakeAWS,
+    fake_aws_api: Callable[..., AWSApi],
+    ai_input: AppInterfaceInput,
+    cache: TopologyCache,
+) -> None:
+    fake.security_groups[0]["VpcId"] = "vpc-2"
+    validator = _validator(fake_aws_api, ai_input, cache)
+    validator._validate_network("group-1", ["sg-1"], [])
+    assert validator.errors == [
+        "Security group sg-1 does not belong to the same VPC as the subnets"
+    ]
+
+    # a subnet was added in a new availability zone, the security group was recreated
+    fake.cache_subnet_groups["group-1"]["Subnets"].append({
+        "SubnetIdentifier": "subnet-3",
+        "SubnetAvailabilityZone": {"Name": "us-east-1c"},
+    })
+    fake.subnets.append({"SubnetId": "subnet-3", "VpcId": "vpc-1"})
+    fake.security_groups[0]["VpcId"] = "vpc-1"
+
+    # failing checks against the cache are repeated against AWS
+    validator = _validator(fake_aws_api, ai_input, cache)
+    validator._validate_network("group-1", ["sg-1"], ["us-east-1c"])
+    assert validator.errors == []
+    assert [fake.calls[c] for c in NETWORK_CALLS] == [2, 2, 2]
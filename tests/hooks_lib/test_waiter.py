@@ -0,0 +1,110 @@
+from collections.abc import Callable
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from hooks_lib.aws_api import AWSApi
+from hooks_lib.waiter import ServiceUpdateWaiter, WaiterConfig
+from tests.conftest import FakeClock
+
+START = dt(2025, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def aws_api(mocker: MockerFixture) -> MagicMock:
+    aws_api = mocker.create_autospec(spec=AWSApi, spec_set=True, instance=True)
+    aws_api.iter_events.return_value = []
+    return aws_api
+
+
+def done_after(polls: int) -> Callable[[], bool]:
+    results = iter([False] * polls + [True])
+    return lambda: next(results)
+
+
+def make_waiter(
+    aws_api: MagicMock, clock: FakeClock, config: WaiterConfig
+) -> ServiceUpdateWaiter:
+    return ServiceUpdateWaiter(
+        aws_api, "rg-1", config, sleep=clock.sleep, clock=clock, rng=lambda: 0.5
+    )
+
+
+def test_waiter_done_immediately(aws_api: MagicMock, clock: FakeClock) -> None:
+    waiter = make_waiter(aws_api, clock, WaiterConfig())
+    waiter.wait(lambda: True, since=START)
+    assert clock.sleeps == []
+    assert waiter.polls == 0
+    aws_api.iter_events.assert_not_called()
+
+
+def test_waiter_backoff(aws_api: MagicMock, clock: FakeClock) -> None:
+    waiter = make_waiter(
+        aws_api,
+        clock,
+        WaiterConfig(initial_delay=10, max_delay=60, backoff=2, jitter=0),
+    )
+    waiter.wait(done_after(5), since=START)
+    assert clock.sleeps == [10, 20, 40, 60, 60]
+    assert waiter.polls == 5  # noqa: PLR2004
+
+
+def test_waiter_jitter(mocker: MockerFixture, aws_api: MagicMock) -> None:
+    sleep = mocker.Mock()
+    waiter = ServiceUpdateWaiter(
+        aws_api,
+        "rg-1",
+        WaiterConfig(initial_delay=10, jitter=0.5),
+        sleep=sleep,
+        rng=lambda: 1.0,
+    )
+    waiter.wait(done_after(1), since=START)
+    sleep.assert_called_once_with(15.0)
+
+
+def test_waiter_new_events_reset_backoff(aws_api: MagicMock, clock: FakeClock) -> None:
+    event = {"Date": START + timedelta(minutes=5), "Message": "Update started"}
+    aws_api.iter_events.side_effect = [[], [], [event], [event], [event]]
+    waiter = make_waiter(
+        aws_api,
+        clock,
+        WaiterConfig(initial_delay=10, max_delay=600, backoff=3, jitter=0),
+    )
+    waiter.wait(done_after(5), since=START)
+    assert clock.sleeps == [10, 30, 90, 10, 30]
+    # the cursor moves forward with the events seen
+    assert [c.args[1] for c in aws_api.iter_events.call_args_list] == [
+        START,
+        START,
+        START,
+        event["Date"],
+        event["Date"],
+    ]
+
+
+def test_waiter_timeout(aws_api: MagicMock, clock: FakeClock) -> None:
+    waiter = make_waiter(
+        aws_api,
+        clock,
+        WaiterConfig(initial_delay=10, max_delay=10, jitter=0, timeout=25),
+    )
+    with pytest.raises(TimeoutError, match="rg-1"):
+        waiter.wait(lambda: False, since=START)
+    # the last sleep is cut to the deadline
+    assert clock.sleeps == [10, 10, 5]
+
+
+def test_waiter_shared_deadline(aws_api: MagicMock, clock: FakeClock) -> None:
+    waiter = make_waiter(
+        aws_api, clock, WaiterConfig(initial_delay=10, backoff=1, timeout=25)
+    )
+    start = clock.now
+    deadline = waiter.deadline()
+    waiter.wait(done_after(2), since=START, deadline=deadline)
+    # the second wait only gets what is left of the shared deadline
+    with pytest.raises(TimeoutError):
+        waiter.wait(done_after(5), since=START, deadline=deadline)
+    assert clock.now - start == 25  # noqa: PLR2004
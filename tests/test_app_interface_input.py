@@ -0,0 +1,92 @@
+from datetime import UTC, datetime
+
+import pytest
+from external_resources_io.input import parse_model
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from er_aws_elasticache.engine_catalog import EngineCatalog, EngineVersion
+
+
+@pytest.mark.parametrize(
+    ("engine", "engine_version", "family"),
+    [
+        ("redis", "6.2", "redis6.x"),
+        ("redis", "6.x", "redis6.x"),
+        ("valkey", "8.0", "valkey8"),
+        # not in the engine catalog
+        ("redis", "6.9", "redis6.x"),
+    ],
+)
+def test_parameter_group_family(
+    raw_input_data: dict, engine: str, engine_version: str, family: str
+) -> None:
+    raw_input_data["data"] |= {"engine": engine, "engine_version": engine_version}
+    raw_input_data["data"]["parameter_group"]["family"] = family
+    ai_input = parse_model(AppInterfaceInput, raw_input_data)
+    assert ai_input.data.parameter_group
+    assert ai_input.data.parameter_group.family == family
+
+
+@pytest.mark.parametrize(
+    ("engine", "engine_version", "family"),
+    [
+        ("redis", "6.2", "redis5.0"),
+        ("valkey", "8.0", "valkey7"),
+        # not in the engine catalog
+        ("redis", "6.9", "redis5.0"),
+    ],
+)
+def test_parameter_group_family_mismatch(
+    raw_input_data: dict, engine: str, engine_version: str, family: str
+) -> None:
+    raw_input_data["data"] |= {"engine": engine, "engine_version": engine_version}
+    raw_input_data["data"]["parameter_group"]["family"] = family
+    with pytest.raises(ValidationError, match="Parameter group family must match"):
+        parse_model(AppInterfaceInput, raw_input_data)
+
+
+def test_parameter_group_family_no_engine_catalog(
+    raw_input_data: dict, mocker: MockerFixture
+) -> None:
+    mocker.patch("er_aws_elasticache.rules.default_engine_catalog", return_value=None)
+    raw_input_data["data"] |= {"engine": "valkey", "engine_version": "8.0"}
+    raw_input_data["data"]["parameter_group"]["family"] = "valkey8"
+    assert parse_model(AppInterfaceInput, raw_input_data).data.parameter_group
+
+
+@pytest.mark.parametrize("expired", [False, True])
+def test_parameter_group_family_engine_catalog(
+    raw_input_data: dict, mocker: MockerFixture, *, expired: bool
+) -> None:
+    catalog = EngineCatalog(
+        engine_versions=[
+            EngineVersion(engine="valkey", version="8.0", family="valkey8")
+        ],
+        generated_at=datetime.now(tz=UTC),
+    )
+    if expired:
+        catalog.generated_at -= catalog.ttl * 2
+    mocker.patch(
+        "er_aws_elasticache.rules.default_engine_catalog", return_value=catalog
+    )
+    raw_input_data["data"] |= {"engine": "valkey", "engine_version": "8.0"}
+    # matches the engine version prefix, but not the catalog family
+    raw_input_data["data"]["parameter_group"]["family"] = "valkey8.x"
+    if expired:
+        ai_input = parse_model(AppInterfaceInput, raw_input_data)
+        assert ai_input.data.parameter_group
+        assert ai_input.data.parameter_group.family == "valkey8.x"
+    else:
+        with pytest.raises(ValidationError, match="Expected valkey8"):
+            parse_model(AppInterfaceInput, raw_input_data)
+
+
+def test_parameter_group_reboot_policy(raw_input_data: dict) -> None:
+    ai_input = parse_model(AppInterfaceInput, raw_input_data)
+    assert ai_input.data.parameter_group_reboot_policy == "warn"
+
+    raw_input_data["data"]["parameter_group_reboot_policy"] = "reboot"
+    with pytest.raises(ValidationError, match="parameter_group_reboot_policy"):
+        parse_model(AppInterfaceInput, raw_input_data)
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from benchmarks.stubs import StubAWSApi
+from benchmarks.suite import (
+    Benchmark,
+    benchmarks,
+    dump_results,
+    load_baseline,
+    main,
+    measure,
+    plan_changes,
+    regressions,
+)
+from hooks_lib.topology_cache import TOPOLOGY_CACHE
+
+
+def test_regressions() -> None:
+    baseline = {"a": 1.0, "b": 1.0}
+    results = {"a": 1.2, "b": 1.6, "new": 100.0}
+    assert regressions(results, baseline, threshold=0.5) == ["b"]
+    assert regressions(results, baseline, threshold=0.1) == ["a", "b"]
+
+
+def test_baseline_roundtrip(tmp_path: Path) -> None:
+    path = tmp_path / "baseline.json"
+    assert load_baseline(path) == {}
+    dump_results(path, {"a": 1.23456789})
+    assert load_baseline(path) == {"a": 1.2346}
+
+
+def test_baseline_schema_version(tmp_path: Path) -> None:
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"schema_version": 0, "results_ms": {}}))
+    with pytest.raises(ValueError, match="Unsupported benchmark baseline schema"):
+        load_baseline(path)
+
+
+def test_measure() -> None:
+    calls = []
+    benchmark = Benchmark("x", lambda: lambda: calls.append(1), number=3)
+    assert measure(benchmark, rounds=2) >= 0
+    # warm up + rounds * number
+    assert len(calls) == 7  # noqa: PLR2004
+
+
+def test_plan_changes() -> None:
+    changes = plan_changes(20)
+    assert [c.type for c in changes].count("aws_elasticache_replication_group") == 2  # noqa: PLR2004
+
+
+def test_validate_plan_topology_lookups(mocker: MockerFixture) -> None:
+    lookup = mocker.spy(StubAWSApi, "get_cache_group_subnets")
+    put = mocker.spy(TOPOLOGY_CACHE, "put_subnet_group")
+    benchmark = next(b for b in benchmarks() if b.name == "validate_plan[10]")
+    run = benchmark.setup()
+    run()
+    lookups = lookup.call_count
+    assert lookups
+    # every run starts without a cached topology
+    run()
+    assert lookup.call_count == 2 * lookups
+    put.assert_not_called()
+
+
+def test_main_regression(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    dump_results(baseline, {"parse_model": 0.0})
+    with pytest.raises(SystemExit) as exc:
+        main(["--filter", "parse_model", "--rounds", "1", "--baseline", str(baseline)])
+    assert exc.value.code == 1
+
+
+def test_main_update_baseline(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    dump_results(baseline, {"other": 1.0})
+    main([
+        "--filter",
+        "validate_plan[10]",
+        "--rounds",
+        "1",
+        "--baseline",
+        str(baseline),
+        "--update-baseline",
+    ])
+    assert set(load_baseline(baseline)) == {"other", "validate_plan[10]"}
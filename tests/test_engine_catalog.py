@@ -0,0 +1,100 @@
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from pathlib import Path
+
+import pytest
+
+from er_aws_elasticache.engine_catalog import (
+    EngineCatalog,
+    EngineVersion,
+    default_engine_catalog,
+)
+
+
+@pytest.fixture
+def catalog() -> EngineCatalog:
+    return EngineCatalog(
+        engine_versions=[
+            EngineVersion(engine="redis", version="6.0", family="redis6.x"),
+            EngineVersion(engine="redis", version="6.2", family="redis6.x"),
+            EngineVersion(engine="redis", version="7.1", family="redis7"),
+            EngineVersion(engine="memcached", version="1.5.16", family="memcached1.5"),
+            EngineVersion(engine="memcached", version="1.6.22", family="memcached1.6"),
+        ],
+        generated_at=dt.now(tz=UTC),
+    )
+
+
+@pytest.mark.parametrize(
+    ("engine", "version", "expected_family"),
+    [
+        ("redis", "6.2", "redis6.x"),
+        ("redis", "6.x", "redis6.x"),
+        ("redis", "7.1", "redis7"),
+        ("memcached", "1.6.22", "memcached1.6"),
+        # minor versions with different families
+        ("memcached", "1.x", None),
+        ("redis", "7.0.7", None),
+        ("valkey", "8.0", None),
+    ],
+)
+def test_engine_catalog_lookup(
+    catalog: EngineCatalog, engine: str, version: str, expected_family: str | None
+) -> None:
+    entry = catalog.lookup(engine, version)
+    assert (entry.family if entry else None) == expected_family
+
+
+def test_engine_catalog_families(catalog: EngineCatalog) -> None:
+    assert catalog.families("redis") == {"redis6.x", "redis7"}
+
+
+def test_engine_catalog_expired(catalog: EngineCatalog) -> None:
+    assert not catalog.expired
+    catalog.generated_at -= catalog.ttl + timedelta(days=1)
+    assert catalog.expired
+
+
+def test_engine_catalog_dump_load(catalog: EngineCatalog, tmp_path: Path) -> None:
+    catalog.dump(tmp_path / "data" / "catalog.json")
+    loaded = EngineCatalog.load(tmp_path / "data" / "catalog.json")
+    assert loaded.engine_versions == catalog.engine_versions
+    assert loaded.generated_at == catalog.generated_at
+
+
+def test_engine_catalog_load_schema_version(tmp_path: Path) -> None:
+    (tmp_path / "catalog.json").write_text(
+        '{"schema_version": 0, "generated_at": "2025-01-01T00:00:00+00:00", "engine_versions": []}'
+    )
+    with pytest.raises(ValueError, match="Unsupported engine catalog schema"):
+        EngineCatalog.load(tmp_path / "catalog.json")
+
+
+def test_default_engine_catalog(
+    catalog: EngineCatalog, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    catalog.dump(tmp_path / "catalog.json")
+    monkeypatch.setattr(
+        "er_aws_elasticache.engine_catalog.CATALOG_FILE", tmp_path / "catalog.json"
+    )
+    default_engine_catalog.cache_clear()
+    try:
+        loaded = default_engine_catalog()
+        assert loaded is default_engine_catalog()
+        assert loaded
+        assert loaded.engine_versions == catalog.engine_versions
+    finally:
+        default_engine_catalog.cache_clear()
+
+
+def test_default_engine_catalog_missing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        "er_aws_elasticache.engine_catalog.CATALOG_FILE", tmp_path / "missing.json"
+    )
+    default_engine_catalog.cache_clear()
+    try:
+        assert default_engine_catalog() is None
+    finally:
+        default_engine_catalog.cache_clear()
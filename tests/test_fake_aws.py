@@ -0,0 +1,129 @@
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+import pytest
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+
+from benchmarks.fake_aws import FakeAWS, FaultConfig
+from hooks_lib.aws_api import AWSApi
+
+
+def _update_action(replication_group_id: str, i: int) -> dict:
+    return {
+        "ReplicationGroupId": replication_group_id,
+        "ServiceUpdateName": f"update-{i}",
+        "ServiceUpdateReleaseDate": datetime(2024, 1, i + 1, tzinfo=UTC),
+        "ServiceUpdateSeverity": "critical",
+        "ServiceUpdateType": "security-update",
+        "ServiceUpdateStatus": "available",
+        "UpdateActionStatus": "not-applied",
+    }
+
+
+@pytest.fixture
+def fake(fake: FakeAWS) -> FakeAWS:
+    fake.faults = FaultConfig(page_size=2)
+    fake.replication_groups = [{"ReplicationGroupId": f"rg-{i}"} for i in range(5)]
+    fake.update_actions = [_update_action("rg-1", i) for i in range(5)]
+    fake.cache_subnet_groups["default"] = {
+        "CacheSubnetGroupName": "default",
+        "VpcId": "vpc-1",
+        "Subnets": [
+            {
+                "SubnetIdentifier": "subnet-1",
+                "SubnetAvailabilityZone": {"Name": "us-east-1a"},
+            }
+        ],
+    }
+    fake.subnets = [{"SubnetId": "subnet-1", "VpcId": "vpc-1"}]
+    fake.security_groups = [{"GroupId": "sg-1", "GroupName": "sg", "VpcId": "vpc-1"}]
+    return fake
+
+
+@pytest.fixture
+def aws_api(fake_aws_api: Callable[..., AWSApi]) -> AWSApi:
+    return fake_aws_api()
+
+
+def test_pagination(fake: FakeAWS, aws_api: AWSApi) -> None:
+    assert list(aws_api.iter_replication_group_ids()) == [f"rg-{i}" for i in range(5)]
+    assert fake.calls["DescribeReplicationGroups"] == 3  # noqa: PLR2004
+
+
+def test_service_updates(aws_api: AWSApi) -> None:
+    updates = aws_api.get_service_updates("rg-1", limit=2)
+    assert [u["ServiceUpdateName"] for u in updates] == ["update-4", "update-3"]
+    assert updates[0]["ServiceUpdateReleaseDate"] == datetime(2024, 1, 5, tzinfo=UTC)
+
+
+def test_subnets_and_security_groups(aws_api: AWSApi) -> None:
+    subnets = aws_api.get_cache_group_subnets("default")
+    assert [s["SubnetIdentifier"] for s in subnets] == ["subnet-1"]
+    assert aws_api.get_subnets(["subnet-1"]) == [
+        {"SubnetId": "subnet-1", "VpcId": "vpc-1"}
+    ]
+    assert [g["GroupId"] for g in aws_api.get_security_groups(["sg-1"])] == ["sg-1"]
+
+
+@pytest.mark.parametrize(
+    ("call", "code"),
+    [
+        (lambda api: api.get_subnets(["subnet-x"]), "InvalidSubnetID.NotFound"),
+        (
+            lambda api: api.get_cache_group_subnets("missing"),
+            "CacheSubnetGroupNotFoundFault",
+        ),
+    ],
+)
+def test_errors(aws_api: AWSApi, call: object, code: str) -> None:
+    with pytest.raises(ClientError) as exc:
+        call(aws_api)  # type: ignore[operator]
+    assert exc.value.response["Error"]["Code"] == code
+
+
+def test_batch_apply_update_action(fake: FakeAWS, aws_api: AWSApi) -> None:
+    processed, unprocessed = aws_api.batch_apply_update_action(
+        ["rg-1", "rg-9"], "update-1"
+    )
+    assert [a["ReplicationGroupId"] for a in processed] == ["rg-1"]
+    assert [a["ReplicationGroupId"] for a in unprocessed] == ["rg-9"]
+    assert fake.update_actions[1]["UpdateActionStatus"] == "in-progress"
+
+
+def test_events(fake: FakeAWS, aws_api: AWSApi) -> None:
+    fake.events = [
+        {
+            "SourceIdentifier": "rg-1",
+            "SourceType": "replication-group",
+            "Message": f"event {day}",
+            "Date": datetime(2024, 1, day, tzinfo=UTC),
+        }
+        for day in (1, 2, 3)
+    ]
+    events = aws_api.iter_events("rg-1", datetime(2024, 1, 2, tzinfo=UTC))
+    assert [e["Message"] for e in events] == ["event 2", "event 3"]
+
+
+def test_throttling_is_retried(
+    mocker: MockerFixture, fake: FakeAWS, fake_aws_api: Callable[..., AWSApi]
+) -> None:
+    sleep = mocker.patch("botocore.endpoint.time.sleep")
+    fake.faults = FaultConfig(throttle_rate=1.0)
+    aws_api = fake_aws_api(
+        config_options={"retries": {"mode": "standard", "max_attempts": 3}}
+    )
+    with pytest.raises(ClientError, match="Throttling"):
+        list(aws_api.iter_replication_group_ids())
+    # max_attempts counts the retries, not the initial call
+    assert fake.calls["DescribeReplicationGroups"] == 4  # noqa: PLR2004
+    assert fake.throttled["DescribeReplicationGroups"] == 4  # noqa: PLR2004
+    assert sleep.call_count == 3  # noqa: PLR2004
+
+
+def test_latency(fake: FakeAWS, aws_api: AWSApi) -> None:
+    fake.faults = FaultConfig(latency=0.05)
+    start = time.perf_counter()
+    aws_api.get_subnets(["subnet-1"])
+    assert time.perf_counter() - start >= 0.05  # noqa: PLR2004
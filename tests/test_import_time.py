@@ -0,0 +1,64 @@
+import subprocess  # noqa: S404
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+# cumulative import time budgets (python -X importtime) of the entry points in ms:
+# the fastest of 7 runs plus ~100ms headroom. boto3 alone would add ~270ms.
+IMPORT_TIME_BUDGETS_MS = {
+    "hooks.pre_run": 425,  # measured 318ms
+    "hooks.post_plan": 500,  # measured 400ms
+    "hooks.post_apply": 425,  # measured 328ms
+    "hooks.post_output": 375,  # measured 271ms
+    "hooks.driver": 475,  # measured 373ms
+    "er_aws_elasticache.app_interface_input": 375,  # measured 273ms
+}
+# the best of a few runs, slow outliers are noise of the machine, not the imports
+RUNS = 3
+AWS_MODULES = {"boto3", "botocore"}
+PROJECT_DIR = Path(__file__).parent.parent
+
+
+@dataclass
+class ImportTimes:
+    """Result of python -X importtime"""
+
+    cumulative_ms: float
+    modules: set[str]
+
+
+def import_times(module: str) -> ImportTimes:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_DIR,
+    )
+    cumulative_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        modules.add(name.strip())
+        # nested imports are indented and already part of the cumulative time
+        if not name.startswith("  "):
+            cumulative_us += int(cumulative)
+    return ImportTimes(cumulative_ms=cumulative_us / 1000, modules=modules)
+
+
+@pytest.mark.parametrize(("module", "budget_ms"), IMPORT_TIME_BUDGETS_MS.items())
+def test_import_time_budget(module: str, budget_ms: int) -> None:
+    times = min(
+        (import_times(module) for _ in range(RUNS)), key=lambda t: t.cumulative_ms
+    )
+    assert module in times.modules
+    # AWS SDKs are imported on the first AWS call only
+    assert not AWS_MODULES & times.modules
+    assert times.cumulative_ms <= budget_ms
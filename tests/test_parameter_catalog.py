@@ -0,0 +1,128 @@
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from pathlib import Path
+
+import pytest
+
+from er_aws_elasticache.parameter_catalog import (
+    ParameterCatalog,
+    ParameterSpec,
+    default_parameter_catalog,
+)
+
+MAXMEMORY_POLICY = ParameterSpec(
+    name="maxmemory-policy",
+    allowed_values="volatile-lru,allkeys-lru,volatile-lfu,allkeys-lfu,volatile-random,allkeys-random,volatile-ttl,noeviction",
+    change_type="immediate",
+)
+TIMEOUT = ParameterSpec(
+    name="timeout", data_type="integer", allowed_values="0,20-", change_type="immediate"
+)
+DATABASES = ParameterSpec(
+    name="databases",
+    data_type="integer",
+    allowed_values="1-1200000",
+    change_type="requires-reboot",
+)
+APPENDONLY = ParameterSpec(
+    name="appendonly", allowed_values="yes,no", is_modifiable=False
+)
+
+
+@pytest.fixture
+def catalog() -> ParameterCatalog:
+    return ParameterCatalog(
+        family="redis7",
+        parameters=[TIMEOUT, MAXMEMORY_POLICY, DATABASES, APPENDONLY],
+        generated_at=dt.now(tz=UTC),
+    )
+
+
+@pytest.mark.parametrize(
+    ("spec", "value", "error"),
+    [
+        (MAXMEMORY_POLICY, "allkeys-lru", None),
+        (MAXMEMORY_POLICY, "lru", "must be one of volatile-lru"),
+        (TIMEOUT, "0", None),
+        (TIMEOUT, "300", None),
+        (TIMEOUT, "10", "must be in 0,20-"),
+        (TIMEOUT, "5m", "must be of type integer"),
+        (DATABASES, "16", None),
+        (DATABASES, "0", "must be in 1-1200000"),
+        (DATABASES, "1200001", "must be in 1-1200000"),
+        (APPENDONLY, "yes", "is not modifiable"),
+        (ParameterSpec(name="notify-keyspace-events"), "AKE", None),
+    ],
+)
+def test_parameter_spec_check(
+    spec: ParameterSpec, value: str, error: str | None
+) -> None:
+    result = spec.check(value)
+    if error is None:
+        assert result is None
+    else:
+        assert result
+        assert error in result
+
+
+def test_parameter_catalog_check(catalog: ParameterCatalog) -> None:
+    assert catalog.lookup("timeout") == TIMEOUT
+    assert catalog.check([("timeout", "300"), ("databases", "16")]) == []
+    assert catalog.check([("timeot", "300"), ("timeout", "True")]) == [
+        "Parameter timeot does not exist in parameter group family redis7",
+        "Parameter timeout must be of type integer, got 'True'",
+    ]
+
+
+def test_parameter_catalog_expired(catalog: ParameterCatalog) -> None:
+    assert not catalog.expired
+    catalog.generated_at -= catalog.ttl + timedelta(days=1)
+    assert catalog.expired
+
+
+def test_parameter_catalog_dump_load(catalog: ParameterCatalog, tmp_path: Path) -> None:
+    path = catalog.dump(tmp_path / "parameters")
+    assert path == tmp_path / "parameters" / "redis7.json"
+    loaded = ParameterCatalog.load(path)
+    assert loaded.family == "redis7"
+    assert loaded.parameters == catalog.parameters
+    assert loaded.generated_at == catalog.generated_at
+
+
+def test_parameter_catalog_schema_version(tmp_path: Path) -> None:
+    path = tmp_path / "redis7.json"
+    path.write_text('{"schema_version": 0}', encoding="utf-8")
+    with pytest.raises(ValueError, match="schema version"):
+        ParameterCatalog.load(path)
+
+
+def test_default_parameter_catalog_missing() -> None:
+    assert default_parameter_catalog("no-such-family") is None
+
+
+def test_default_parameter_catalog(
+    catalog: ParameterCatalog,
+    tmp_path: Path,
+    parameter_catalog_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "er_aws_elasticache.parameter_catalog.CATALOG_DIR", tmp_path / "shipped"
+    )
+    catalog.dump(tmp_path / "shipped")
+    assert (current := default_parameter_catalog("redis7"))
+    assert current.generated_at == catalog.generated_at
+
+    # the newer catalog saved by post_plan wins
+    catalog.generated_at += timedelta(days=1)
+    catalog.dump(parameter_catalog_dir)
+    default_parameter_catalog.cache_clear()
+    assert (current := default_parameter_catalog("redis7"))
+    assert current.generated_at == catalog.generated_at
+
+    # expired catalogs are not used
+    catalog.generated_at -= catalog.ttl + timedelta(days=2)
+    catalog.dump(tmp_path / "shipped")
+    catalog.dump(parameter_catalog_dir)
+    default_parameter_catalog.cache_clear()
+    assert default_parameter_catalog("redis7") is None
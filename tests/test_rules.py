@@ -0,0 +1,139 @@
+from datetime import UTC, datetime
+
+import pytest
+from external_resources_io.input import parse_model
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from er_aws_elasticache.app_interface_input import AppInterfaceInput
+from er_aws_elasticache.parameter_catalog import ParameterCatalog, ParameterSpec
+from er_aws_elasticache.rules import (
+    ELASTICACHE_RULES,
+    RuleViolation,
+    RuleViolationsError,
+    parse_version,
+)
+
+
+def violations(raw_input_data: dict) -> list[RuleViolation]:
+    with pytest.raises(ValidationError) as exc:
+        parse_model(AppInterfaceInput, raw_input_data)
+    error = exc.value.errors()[0]["ctx"]["error"]
+    assert isinstance(error, RuleViolationsError)
+    return error.violations
+
+
+@pytest.mark.parametrize(
+    ("version", "expected"),
+    [
+        ("7.0.7", (7, 0, 7)),
+        ("6.x", (6,)),
+        ("5.0.6", (5, 0, 6)),
+        ("latest", ()),
+    ],
+)
+def test_parse_version(version: str, expected: tuple[int, ...]) -> None:
+    assert parse_version(version) == expected
+
+
+@pytest.mark.parametrize(
+    ("data", "rule"),
+    [
+        ({"number_cache_clusters": 1}, "automatic_failover"),
+        (
+            {
+                "engine_version": "5.0.6",
+                "auto_minor_version_upgrade": True,
+                "parameter_group": None,
+            },
+            "no_auto_minor_version_upgrade_for_redis_five",
+        ),
+        ({"engine_version": "7.1", "parameter_group": None}, "no_redis_seven"),
+        (
+            {"multi_az_enabled": True, "automatic_failover_enabled": False},
+            "multi_az_needs_automatic_failover",
+        ),
+        ({"num_node_groups": 2}, "number_cache_clusters_vs_num_node_groups"),
+        (
+            {
+                "num_node_groups": 2,
+                "number_cache_clusters": None,
+                "availability_zones": ["us-east-1a"],
+            },
+            "no_availability_zones_for_num_node_groups",
+        ),
+        (
+            {"node_type": "cache.t1.micro"},
+            "no_snapshot_retention_limit_for_cache_t1_micro",
+        ),
+        (
+            {"engine": "valkey", "engine_version": "6.2", "parameter_group": None},
+            "no_older_versions_for_valkey",
+        ),
+        ({"replication_group_id": "x" * 41}, "check_replication_group_id_length"),
+    ],
+)
+def test_rule(raw_input_data: dict, data: dict, rule: str) -> None:
+    raw_input_data["data"] |= data
+    assert [v.rule for v in violations(raw_input_data)] == [rule]
+
+
+def test_rules_collect_all_violations(raw_input_data: dict) -> None:
+    raw_input_data["data"] |= {
+        "number_cache_clusters": 1,
+        "engine_version": "7.1",
+        "replication_group_id": "x" * 41,
+    }
+    assert [v.rule for v in violations(raw_input_data)] == [
+        "automatic_failover",
+        "no_redis_seven",
+        "check_parameter_group_family",
+        "check_replication_group_id_length",
+    ]
+
+
+def test_rules_error_message(raw_input_data: dict) -> None:
+    raw_input_data["data"] |= {"engine_version": "7.1", "parameter_group": None}
+    with pytest.raises(
+        ValidationError,
+        match="Please use the Valkey engine instead",
+    ):
+        parse_model(AppInterfaceInput, raw_input_data)
+
+
+def test_rules_registry_order() -> None:
+    assert ELASTICACHE_RULES.names[0] == "automatic_failover"
+    assert ELASTICACHE_RULES.names[-1] == "check_replication_group_id_length"
+
+
+def test_rules_parameter_catalog(raw_input_data: dict, mocker: MockerFixture) -> None:
+    catalog = ParameterCatalog(
+        family="redis6.x",
+        parameters=[
+            ParameterSpec(
+                name="tcp-keepalive", data_type="integer", allowed_values="0-"
+            )
+        ],
+        generated_at=datetime.now(tz=UTC),
+    )
+    default_parameter_catalog = mocker.patch(
+        "er_aws_elasticache.rules.default_parameter_catalog", return_value=catalog
+    )
+    parse_model(AppInterfaceInput, raw_input_data)
+    default_parameter_catalog.assert_called_once_with("redis6.x")
+
+    raw_input_data["data"]["parameter_group"]["parameters"] = [
+        {"name": "tcp-keepalive", "value": -1},
+        {"name": "tcp_keepalive", "value": 300},
+    ]
+    assert violations(raw_input_data) == [
+        RuleViolation(
+            rule="check_parameter_group_parameters",
+            message="Parameter tcp-keepalive must be in 0-, got '-1'; "
+            "Parameter tcp_keepalive does not exist in parameter group family redis6.x",
+        )
+    ]
+
+    # families without a catalog are not checked
+    default_parameter_catalog.return_value = None
+    parse_model(AppInterfaceInput, raw_input_data)
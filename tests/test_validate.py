@@ -0,0 +1,109 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from er_aws_elasticache.validate import (
+    InputSource,
+    iter_inputs,
+    main,
+    validate_input,
+    validate_inputs,
+)
+
+
+@pytest.fixture
+def invalid_input_data(raw_input_data: dict) -> dict:
+    data = json.loads(json.dumps(raw_input_data))
+    data["data"] |= {"number_cache_clusters": 1, "replication_group_id": "x" * 41}
+    return data
+
+
+@pytest.fixture
+def inputs_dir(tmp_path: Path, raw_input_data: dict, invalid_input_data: dict) -> Path:
+    (tmp_path / "a.json").write_text(json.dumps(raw_input_data))
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.jsonl").write_text(
+        json.dumps(raw_input_data) + "\n\n" + json.dumps(invalid_input_data) + "\n"
+    )
+    (tmp_path / "README.md").write_text("ignored")
+    return tmp_path
+
+
+def test_validate_input_valid(raw_input_data: dict) -> None:
+    result = validate_input(InputSource("x", json.dumps(raw_input_data)))
+    assert result.valid
+    assert result.errors == []
+    assert result.seconds >= 0
+
+
+def test_validate_input_rule_violations(invalid_input_data: dict) -> None:
+    result = validate_input(InputSource("x", json.dumps(invalid_input_data)))
+    assert not result.valid
+    assert [e.get("rule") for e in result.errors] == [
+        "automatic_failover",
+        "check_replication_group_id_length",
+    ]
+    assert {e["loc"] for e in result.errors} == {"data"}
+
+
+@pytest.mark.parametrize(
+    ("text", "msg"),
+    [("{", "Invalid JSON"), ("{}", "Field required")],
+)
+def test_validate_input_invalid_documents(text: str, msg: str) -> None:
+    result = validate_input(InputSource("x", text))
+    assert not result.valid
+    assert msg in result.errors[0]["msg"]
+
+
+def test_validate_input_missing_file(tmp_path: Path) -> None:
+    result = validate_input(InputSource(str(tmp_path / "missing.json")))
+    assert not result.valid
+
+
+def test_iter_inputs(inputs_dir: Path) -> None:
+    sources = [s.source for s in iter_inputs([str(inputs_dir)], io.StringIO())]
+    assert sources == [
+        str(inputs_dir / "a.json"),
+        f"{inputs_dir / 'sub' / 'b.jsonl'}:1",
+        f"{inputs_dir / 'sub' / 'b.jsonl'}:3",
+    ]
+
+
+def test_iter_inputs_stdin(raw_input_data: dict) -> None:
+    stdin = io.StringIO(json.dumps(raw_input_data) + "\n")
+    assert [s.source for s in iter_inputs([], stdin)] == ["<stdin>:1"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_inputs_order(
+    raw_input_data: dict, invalid_input_data: dict, jobs: int
+) -> None:
+    inputs = [
+        InputSource(str(i), json.dumps(invalid_input_data if i % 3 else raw_input_data))
+        for i in range(20)
+    ]
+    results = list(validate_inputs(inputs, jobs=jobs))
+    assert [r.source for r in results] == [str(i) for i in range(20)]
+    assert [r.valid for r in results] == [i % 3 == 0 for i in range(20)]
+
+
+def test_main(inputs_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(["--jobs", "1", str(inputs_dir)])
+    assert exc.value.code == 1
+
+    out, err = capsys.readouterr()
+    results = [json.loads(line) for line in out.splitlines()]
+    assert [r["valid"] for r in results] == [True, True, False]
+    assert "3 inputs validated, 1 invalid" in err
+
+
+def test_main_all_valid(
+    tmp_path: Path, raw_input_data: dict, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "a.json").write_text(json.dumps(raw_input_data))
+    main(["-j", "1", str(tmp_path / "a.json")])
+    assert json.loads(capsys.readouterr().out)["valid"] is True